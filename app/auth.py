@@ -1,34 +1,107 @@
+import asyncio
+import secrets
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import jwt
 from jwt import InvalidTokenError
-from passlib.context import CryptContext
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.cache import ExpiringSet, TTLCache
 from app.config import settings
 from app.models import TokenData, User
-from app.database import supabase
+from app.database import supabase, execute
+from app.log import get_logger
+
+logger = get_logger(__name__)
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib/bcrypt import와 CryptContext 생성은 첫 비밀번호 작업 때 수행 (콜드 스타트 시간 단축)
+_pwd_context = None
+_pwd_context_lock = threading.Lock()
+
+def get_pwd_context():
+    """
+    비밀번호 해시 CryptContext (처음 호출될 때 생성)
+
+    비용을 min/max로 고정하여 BCRYPT_ROUNDS가 바뀌면 기존 해시가 재해시 대상이 되도록 함
+    """
+    global _pwd_context
+    if _pwd_context is None:
+        with _pwd_context_lock:
+            if _pwd_context is None:
+                from passlib.context import CryptContext
+                _pwd_context = CryptContext(
+                    schemes=["bcrypt"],
+                    deprecated="auto",
+                    bcrypt__default_rounds=settings.bcrypt_rounds,
+                    bcrypt__min_rounds=settings.bcrypt_rounds,
+                    bcrypt__max_rounds=settings.bcrypt_rounds
+                )
+    return _pwd_context
+
+# bcrypt는 해시 계산 중 GIL을 해제하므로 전용 스레드 풀에서 코어 수만큼 병렬로 실행됩니다.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="bcrypt"
+)
+_hash_in_flight = 0
 
 # JWT settings
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
+# 토큰에 담아 두는 사용자 클레임 (JWT_STATELESS 모드에서 DB 조회 없이 사용)
+USER_CLAIMS = ("name", "phone", "boat_name", "boat_number", "created_at")
+
+# 검증된 토큰 → 사용자 캐시 (각 토큰의 남은 유효 시간 이내)
+_verified_tokens = TTLCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl_seconds=settings.token_cache_ttl_seconds
+)
+# 폐기된 토큰 jti 목록 - 항목 수 제한으로 먼저 제거되면 폐기한 토큰이 다시 유효해지므로 토큰 만료 시각에만 삭제
+_revoked_tokens = ExpiringSet()
+
 # Security scheme
 security = HTTPBearer()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """비밀번호 해시화"""
     # bcrypt는 72바이트 제한이 있으므로 길이 체크
     if len(password.encode('utf-8')) > 72:
         password = password[:72]
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+async def _run_password_hashing(func, *args):
+    """비밀번호 해시 작업을 스레드 풀에서 실행 (대기열이 가득 차면 503)"""
+    global _hash_in_flight
+    if _hash_in_flight >= settings.password_hash_workers + settings.password_hash_queue_size:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많습니다. 잠시 후 다시 시도해주세요"
+        )
+
+    _hash_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_in_flight -= 1
+
+async def hash_password(password: str) -> str:
+    """비밀번호 해시화 (스레드 풀에서 실행)"""
+    return await _run_password_hashing(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """비밀번호 검증 (스레드 풀에서 실행) - 비용이 바뀐 해시면 새 해시도 함께 반환"""
+    return await _run_password_hashing(get_pwd_context().verify_and_update, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """JWT 액세스 토큰 생성"""
@@ -38,22 +111,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> TokenData:
-    """JWT 토큰 검증"""
+def user_claims(user: dict) -> dict:
+    """토큰에 담을 사용자 클레임"""
+    claims = {"sub": str(user["id"])}
+    for claim in USER_CLAIMS:
+        value = user.get(claim)
+        claims[claim] = value.isoformat() if isinstance(value, datetime) else value
+    return claims
+
+def decode_token(token: str) -> dict:
+    """JWT 토큰 검증 후 payload 반환"""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="토큰이 유효하지 않습니다",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return TokenData(user_id=user_id)
+        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]})
     except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -61,34 +134,57 @@ def verify_token(token: str) -> TokenData:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="토큰이 유효하지 않습니다",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+def verify_token(token: str) -> TokenData:
+    """JWT 토큰 검증"""
+    payload = decode_token(token)
+    return TokenData(user_id=payload["sub"])
+
+def revoke_token(token: str):
+    """토큰 폐기 - 만료 시각까지 폐기 목록에 보관"""
+    payload = decode_token(token)
+    _verified_tokens.delete(token)
+    if payload.get("jti"):
+        _revoked_tokens.add(payload["jti"], payload["exp"])
+
+def _is_revoked(payload: dict) -> bool:
+    return payload.get("jti") is not None and payload["jti"] in _revoked_tokens
+
 async def get_user_by_phone(phone: str) -> Optional[dict]:
     """전화번호로 사용자 조회"""
-    if supabase is None:
-        print("⚠️  Supabase 연결이 필요합니다")
+    if not supabase:
+        logger.warning("⚠️  Supabase 연결이 필요합니다")
         return None
 
     try:
-        response = supabase.table("users").select("*").eq("phone", phone).execute()
+        response = await execute(supabase.table("users").select("*").eq("phone", phone))
         if response.data:
             return response.data[0]
         return None
-    except Exception as e:
-        print(f"Error fetching user by phone: {e}")
+    except Exception:
+        logger.exception("Error fetching user by phone")
         return None
 
 async def get_user_by_id(user_id: str) -> Optional[dict]:
     """사용자 ID로 사용자 조회"""
-    if supabase is None:
-        print("⚠️  Supabase 연결이 필요합니다")
+    if not supabase:
+        logger.warning("⚠️  Supabase 연결이 필요합니다")
         return None
 
     try:
-        response = supabase.table("users").select("*").eq("id", user_id).execute()
+        response = await execute(supabase.table("users").select("*").eq("id", user_id))
         if response.data:
             return response.data[0]
         return None
-    except Exception as e:
-        print(f"Error fetching user by id: {e}")
+    except Exception:
+        logger.exception("Error fetching user by id", extra={"user_id": user_id})
         return None
 
 async def authenticate_user(phone: str, password: str) -> Optional[dict]:
@@ -96,26 +192,74 @@ async def authenticate_user(phone: str, password: str) -> Optional[dict]:
     user = await get_user_by_phone(phone)
     if not user:
         return None
-    if not verify_password(password, user["password_hash"]):
+
+    is_valid, new_hash = await verify_and_update_password(password, user["password_hash"])
+    if not is_valid:
         return None
+
+    # BCRYPT_ROUNDS가 바뀐 경우 새 비용으로 재해시한 값 저장 (실패해도 로그인은 진행)
+    if new_hash:
+        try:
+            await execute(supabase.table("users").update({"password_hash": new_hash}).eq("id", user["id"]))
+            user["password_hash"] = new_hash
+        except Exception:
+            logger.exception("Error rehashing password")
     return user
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    """현재 사용자 조회 (의존성 주입)"""
+    """
+    현재 사용자 조회 (의존성 주입)
+
+    검증된 토큰은 짧은 시간(TOKEN_CACHE_TTL_SECONDS) 캐시하고, JWT_STATELESS 모드에서는
+    토큰에 담긴 사용자 클레임을 그대로 사용하므로 대부분의 요청이 DB를 조회하지 않습니다.
+    """
     token = credentials.credentials
-    token_data = verify_token(token)
-    user = await get_user_by_id(token_data.user_id)
-    if user is None:
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        payload, user = cached
+        if payload["exp"] > time.time() and not _is_revoked(payload):
+            return user
+        _verified_tokens.delete(token)
+
+    payload = decode_token(token)
+    if _is_revoked(payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="사용자를 찾을 수 없습니다",
+            detail="폐기된 토큰입니다",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if settings.jwt_stateless and all(claim in payload for claim in USER_CLAIMS):
+        user = {"id": payload["sub"], **{claim: payload[claim] for claim in USER_CLAIMS}}
+    else:
+        user = await get_user_by_id(payload["sub"])
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="사용자를 찾을 수 없습니다",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    remaining = payload["exp"] - time.time()
+    _verified_tokens.set(token, (payload, user), ttl_seconds=min(settings.token_cache_ttl_seconds, remaining))
     return user
 
+def require_admin_key(x_admin_key: Optional[str] = Header(default=None, alias="X-Admin-Key")):
+    """관리용 API 인증 (의존성 주입) - X-Admin-Key 헤더가 ADMIN_API_KEY와 같아야 함"""
+    if not settings.admin_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="관리용 API가 설정되지 않았습니다 (ADMIN_API_KEY)"
+        )
+    if not x_admin_key or not secrets.compare_digest(x_admin_key.encode(), settings.admin_api_key.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="관리용 API 키가 올바르지 않습니다"
+        )
+
 async def create_user(user_data: dict) -> dict:
     """새 사용자 생성"""
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다. Supabase 설정을 확인해주세요."
@@ -123,7 +267,7 @@ async def create_user(user_data: dict) -> dict:
 
     try:
         # 비밀번호 해시화
-        hashed_password = get_password_hash(user_data["password"])
+        hashed_password = await hash_password(user_data["password"])
 
         # 사용자 데이터 준비
         user_insert_data = {
@@ -136,7 +280,7 @@ async def create_user(user_data: dict) -> dict:
         }
 
         # 데이터베이스에 사용자 생성
-        response = supabase.table("users").insert(user_insert_data).execute()
+        response = await execute(supabase.table("users").insert(user_insert_data))
         if response.data:
             return response.data[0]
         else:
@@ -144,8 +288,10 @@ async def create_user(user_data: dict) -> dict:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="사용자 생성에 실패했습니다"
             )
-    except Exception as e:
-        print(f"Error creating user: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error creating user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="사용자 생성 중 오류가 발생했습니다"
@@ -0,0 +1,106 @@
+import heapq
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+class TTLCache:
+    """
+    TTL 만료와 LRU 제거를 지원하는 인메모리 캐시
+
+    max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 제거하여
+    메모리 사용량의 상한을 유지합니다. 이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """만료되지 않은 값 조회 (없으면 default)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """값 저장 (ttl_seconds를 생략하면 기본 TTL 사용)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        """항목 삭제"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """모든 항목 삭제"""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """캐시 메트릭 조회"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class ExpiringSet:
+    """
+    항목마다 만료 시각(epoch 초)이 있는 집합
+
+    TTLCache와 달리 항목 수 제한으로 먼저 제거하지 않으므로, 만료 전에 사라지면 안 되는
+    목록(폐기된 토큰 등)에 사용합니다. 크기는 만료되지 않은 항목 수로 제한됩니다.
+    """
+
+    def __init__(self):
+        self._expires: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, Hashable]] = []
+
+    def add(self, key: Hashable, expires_at: float):
+        """expires_at까지 유지되는 항목 추가 (이미 있으면 더 늦은 만료 시각 사용)"""
+        self._purge()
+        if expires_at <= time.time():
+            return
+        if expires_at > self._expires.get(key, 0.0):
+            self._expires[key] = expires_at
+            heapq.heappush(self._heap, (expires_at, key))
+
+    def _purge(self):
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            if self._expires.get(key) == expires_at:
+                del self._expires[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires_at = self._expires.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self) -> int:
+        self._purge()
+        return len(self._expires)
@@ -8,6 +8,76 @@ class Settings(BaseSettings):
     secret_key: str = os.getenv("SECRET_KEY", "")
     algorithm: str = os.getenv("ALGORITHM", "HS256")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    admin_api_key: str = os.getenv("ADMIN_API_KEY", "")  # 관리용 API(X-Admin-Key) 키 (비우면 관리용 API 사용 불가)
+    jwt_stateless: bool = os.getenv("JWT_STATELESS", "false").lower() == "true"  # 토큰 클레임을 신뢰하여 사용자 조회 생략
+    token_cache_ttl_seconds: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))  # 검증된 토큰 캐시 유효 시간
+    token_cache_max_entries: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))  # 검증된 토큰 캐시 최대 항목 수
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")  # 로그 레벨
+    log_format: str = os.getenv("LOG_FORMAT", "json")  # 로그 형식 (json/text)
+    trace_exporter: str = os.getenv("TRACE_EXPORTER", "none")  # span 내보내기 (none/memory/file)
+    trace_file: str = os.getenv("TRACE_FILE", "data/traces.jsonl")  # TRACE_EXPORTER=file일 때 span 파일
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))  # DB 쿼리 스레드 풀 크기 (Supabase HTTP 연결 수도 같음)
+    db_warmup_connections: int = int(os.getenv("DB_WARMUP_CONNECTIONS", "4"))  # 시작 시 미리 열어 둘 DB 연결 수
+    http_timeout_seconds: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))  # 외부 HTTP/DB 요청 timeout
+    http_connect_timeout_seconds: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))  # 연결 수립 timeout
+    http_keepalive_expiry_seconds: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))  # 유휴 연결 유지 시간
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))  # 공유 HTTP 클라이언트 최대 연결 수
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))  # 유지할 유휴 연결 수
+    http2: bool = os.getenv("HTTP2", "true").lower() == "true"  # HTTP/2 사용 (h2 패키지 필요)
+    self_ping_url: str = os.getenv(
+        "SELF_PING_URL",
+        f"{os.getenv('RENDER_EXTERNAL_URL')}/keep-alive" if os.getenv("RENDER_EXTERNAL_URL") else ""
+    )  # 유휴 슬립 방지 ping 대상 (비우면 끔, Render에서는 서비스 URL 자동 사용)
+    self_ping_interval_seconds: int = int(os.getenv("SELF_PING_INTERVAL_SECONDS", "840"))  # ping 주기 (14분)
+    location_batch_size: int = int(os.getenv("LOCATION_BATCH_SIZE", "200"))  # 위치 bulk insert 최대 행 수
+    location_flush_interval_ms: int = int(os.getenv("LOCATION_FLUSH_INTERVAL_MS", "50"))  # 위치 버퍼 flush 주기
+    location_cache_ttl_seconds: int = int(os.getenv("LOCATION_CACHE_TTL_SECONDS", "300"))  # 최신 위치 캐시 유효 시간
+    location_cache_max_entries: int = int(os.getenv("LOCATION_CACHE_MAX_ENTRIES", "10000"))  # 최신 위치 캐시 최대 기기 수
+    device_cache_ttl_seconds: int = int(os.getenv("DEVICE_CACHE_TTL_SECONDS", "600"))  # device_id → user_id 캐시 유효 시간
+    device_negative_cache_ttl_seconds: int = int(os.getenv("DEVICE_NEGATIVE_CACHE_TTL_SECONDS", "30"))  # 미등록 기기 캐시 유효 시간
+    device_cache_max_entries: int = int(os.getenv("DEVICE_CACHE_MAX_ENTRIES", "10000"))  # device_id 캐시 최대 항목 수
+    profile_cache_ttl_seconds: int = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", "600"))  # 사용자 프로필 캐시 유효 시간
+    profile_cache_max_entries: int = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "10000"))  # 사용자 프로필 캐시 최대 기기 수
+    export_chunk_size: int = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))  # 위치 내보내기 시 한 번에 읽는 행 수
+    track_simplify_max_source_points: int = int(os.getenv("TRACK_SIMPLIFY_MAX_SOURCE_POINTS", "200000"))  # 단순화 대상 최대 위치 수
+    nearby_max_age_minutes: int = int(os.getenv("NEARBY_MAX_AGE_MINUTES", "60"))  # 주변 선박 검색에 포함할 최대 위치 경과 시간
+    sse_keepalive_seconds: int = int(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))  # 신고 상태 스트림 keep-alive 주기
+    report_idempotency_ttl_seconds: int = int(os.getenv("REPORT_IDEMPOTENCY_TTL_SECONDS", "86400"))  # 재시도 신고 응답 보관 시간
+    report_idempotency_max_entries: int = int(os.getenv("REPORT_IDEMPOTENCY_MAX_ENTRIES", "50000"))  # 재시도 신고 응답 최대 보관 수
+    report_dedup_window_seconds: int = int(os.getenv("REPORT_DEDUP_WINDOW_SECONDS", "60"))  # 같은 신고로 간주할 시간 구간
+    report_dedup_position_decimals: int = int(os.getenv("REPORT_DEDUP_POSITION_DECIMALS", "3"))  # 같은 신고로 간주할 위치 정밀도 (소수점 자리)
+    # 재시작/재배포 후에도 남는 영구 디스크여야 함 - 임시 파일시스템이면 DB에 저장되기 전의 접수된 신고가 사라짐
+    report_wal_dir: str = os.getenv("REPORT_WAL_DIR", "data/report-wal")  # 신고 write-ahead log 디렉터리
+    report_wal_segment_max_bytes: int = int(os.getenv("REPORT_WAL_SEGMENT_MAX_BYTES", str(4 * 1024 * 1024)))  # 세그먼트 파일 최대 크기
+    report_wal_fsync_interval_ms: int = int(os.getenv("REPORT_WAL_FSYNC_INTERVAL_MS", "5"))  # 신고 기록을 모아서 fsync하는 주기
+    report_insert_timeout_seconds: float = float(os.getenv("REPORT_INSERT_TIMEOUT_SECONDS", "5"))  # 신고 DB 저장 대기 시간 (초과 시 백그라운드 재전송)
+    report_replay_initial_backoff_seconds: float = float(os.getenv("REPORT_REPLAY_INITIAL_BACKOFF_SECONDS", "1"))  # 재전송 실패 시 첫 대기 시간
+    report_replay_max_backoff_seconds: float = float(os.getenv("REPORT_REPLAY_MAX_BACKOFF_SECONDS", "60"))  # 재전송 실패 시 최대 대기 시간
+    report_realtime_enabled: bool = os.getenv("REPORT_REALTIME_ENABLED", "true").lower() == "true"  # DB의 신고 변경을 Supabase Realtime으로 받아 SSE로 전달
+    notification_workers: int = int(os.getenv("NOTIFICATION_WORKERS", "4"))  # 비상연락처 알림 전송 워커 수
+    notification_queue_size: int = int(os.getenv("NOTIFICATION_QUEUE_SIZE", "1000"))  # 대기 중인 알림 최대 수
+    notification_max_attempts: int = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))  # 알림 전송 최대 시도 횟수
+    notification_initial_backoff_seconds: float = float(os.getenv("NOTIFICATION_INITIAL_BACKOFF_SECONDS", "1"))  # 알림 재시도 첫 대기 시간
+    notification_rate_per_second: float = float(os.getenv("NOTIFICATION_RATE_PER_SECOND", "10"))  # channel별 초당 최대 전송 수
+    notification_burst: int = int(os.getenv("NOTIFICATION_BURST", "20"))  # channel별 순간 최대 전송 수
+    notification_webhook_url: str = os.getenv("NOTIFICATION_WEBHOOK_URL", "")  # 알림 발송 webhook (없으면 로그만 남김)
+    detection_max_windows: int = int(os.getenv("DETECTION_MAX_WINDOWS", "500"))  # 한 번에 평가할 최대 센서 구간 수
+    detection_max_samples: int = int(os.getenv("DETECTION_MAX_SAMPLES", "6000"))  # 센서 구간당 최대 샘플 수
+    detection_rescore_batch_size: int = int(os.getenv("DETECTION_RESCORE_BATCH_SIZE", "200"))  # 재평가 시 한 번에 읽는 신고 수
+    health_cache_seconds: float = float(os.getenv("HEALTH_CACHE_SECONDS", "2"))  # 준비 상태 점검 결과를 재사용하는 시간
+    health_db_timeout_seconds: float = float(os.getenv("HEALTH_DB_TIMEOUT_SECONDS", "2"))  # 준비 상태 점검의 DB 응답 대기 시간
+    health_max_loop_lag_ms: float = float(os.getenv("HEALTH_MAX_LOOP_LAG_MS", "250"))  # 이 이상 이벤트 루프가 밀리면 degraded
+    health_max_location_queue: int = int(os.getenv("HEALTH_MAX_LOCATION_QUEUE", "5000"))  # 이 이상 위치 저장이 밀리면 degraded
+    health_max_report_wal_pending: int = int(os.getenv("HEALTH_MAX_REPORT_WAL_PENDING", "100"))  # 이 이상 신고 저장이 밀리면 degraded
+    health_max_notification_queue: int = int(os.getenv("HEALTH_MAX_NOTIFICATION_QUEUE", "800"))  # 이 이상 알림 전송이 밀리면 degraded
+    health_degraded_status_code: int = int(os.getenv("HEALTH_DEGRADED_STATUS_CODE", "200"))  # degraded일 때 /ready 응답 코드
+    loop_monitor_interval_ms: float = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))  # 이벤트 루프 지연 측정 주기
+    loop_monitor_window: int = int(os.getenv("LOOP_MONITOR_WINDOW", "600"))  # 지연 percentile 계산에 쓰는 최근 측정 수
+    loop_block_threshold_ms: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))  # 이 이상 루프를 붙잡으면 blocking 호출로 기록
+    loop_debug: bool = os.getenv("LOOP_DEBUG", "false").lower() == "true"  # blocking 호출의 스택 트레이스 로그 (디버그용)
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # bcrypt 비용 (변경 시 로그인할 때 재해시)
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))  # 비밀번호 해시 스레드 수
+    password_hash_queue_size: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "64"))  # 해시 대기 요청 최대 수
 
     class Config:
         env_file = ".env"
@@ -1,11 +1,201 @@
-from supabase import create_client, Client
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 from app.config import settings
+from app.http_client import http_limits, http_timeout, use_http2
+from app.log import get_logger
+from app.metrics import query_path, record_db_query
+from app.tracing import start_span
+
+logger = get_logger(__name__)
+
+# Supabase(PostgREST) 요청용 HTTP 연결 풀 - 스레드 풀의 모든 워커가 연결을 재사용하도록 크기를 맞춤
+_db_http_client = httpx.Client(
+    http2=use_http2(),
+    timeout=http_timeout(),
+    limits=http_limits(settings.db_pool_size, settings.db_pool_size)
+)
+
+class _DeferredQuery:
+    """
+    client 생성 전에 만든 쿼리 - 메서드 호출을 기록했다가 execute()가 DB 스레드 풀에서 재생
+
+    이벤트 루프에서 supabase SDK import와 create_client를 실행하지 않기 위해 사용합니다.
+    """
+
+    def __init__(self, source: "LazySupabaseClient", steps: tuple = ()):
+        self._source = source
+        self._steps = steps
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def step(*args, **kwargs):
+            return _DeferredQuery(self._source, self._steps + ((name, args, kwargs),))
+        return step
+
+    @property
+    def path(self) -> str:
+        """metrics용 PostgREST 경로 (table("x") → /x, rpc("f") → /rpc/f)"""
+        if not self._steps or not self._steps[0][1]:
+            return "unknown"
+        name, args, _ = self._steps[0]
+        return f"/rpc/{args[0]}" if name == "rpc" else f"/{args[0]}"
+
+    def build(self):
+        """client를 생성하고 기록한 호출을 적용한 실제 쿼리 빌더 반환 (스레드 풀에서 호출)"""
+        target = self._source.connect()
+        if target is None:
+            raise RuntimeError("데이터베이스 연결이 필요합니다")
+        for name, args, kwargs in self._steps:
+            target = getattr(target, name)(*args, **kwargs)
+        return target
+
+class LazySupabaseClient:
+    """
+    처음 쿼리할 때 생성되는 Supabase client
+
+    supabase SDK import와 create_client는 느리므로 모듈 import 시점이 아니라 lifespan의 백그라운드
+    초기화(connect) 또는 첫 사용 시점에 수행합니다. bool 값은 설정 여부와 이전 연결 실패만 확인하므로
+    `if not supabase:` 검사가 연결을 시작하지 않습니다. 초기화가 끝나기 전에 만든 쿼리는
+    _DeferredQuery로 기록되어 execute()에서 DB 스레드 풀이 client를 생성한 뒤 실행되므로
+    이벤트 루프가 멈추지 않습니다.
+    """
+
+    def __init__(self, url: str, key: str):
+        self._url = url
+        self._key = key
+        self._client = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._url and self._key)
+
+    @property
+    def ready(self) -> bool:
+        """client 생성 완료 여부"""
+        return self._client is not None
+
+    def connect(self):
+        """client 생성 (이미 생성했거나 실패했으면 그 결과를 반환, 실패 시 None)"""
+        if self._client is not None or self._failed:
+            return self._client
+        with self._lock:
+            if self._client is not None or self._failed:
+                return self._client
+            try:
+                from supabase import create_client, ClientOptions
+                self._client = create_client(
+                    self._url,
+                    self._key,
+                    options=ClientOptions(httpx_client=_db_http_client, postgrest_client_timeout=http_timeout())
+                )
+                logger.info("✅ Supabase 연결 성공")
+            except Exception as e:
+                self._failed = True
+                logger.warning(f"⚠️  Supabase 연결 실패: {e} - .env 파일에 올바른 SUPABASE_URL과 SUPABASE_ANON_KEY를 설정해주세요")
+        return self._client
+
+    def __bool__(self) -> bool:
+        return self.configured and not self._failed
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._client is not None:
+            return getattr(self._client, name)
+        if self._failed:
+            raise RuntimeError("데이터베이스 연결이 필요합니다")
+        return getattr(_DeferredQuery(self), name)
 
 # Supabase client - 실제 사용 시 올바른 URL과 Key를 .env에 설정하세요
-try:
-    supabase: Client = create_client(settings.supabase_url, settings.supabase_anon_key)
-    print("✅ Supabase 연결 성공")
-except Exception as e:
-    print(f"⚠️  Supabase 연결 실패: {e}")
-    print("📝 .env 파일에 올바른 SUPABASE_URL과 SUPABASE_ANON_KEY를 설정해주세요")
-    supabase = None
\ No newline at end of file
+supabase = LazySupabaseClient(settings.supabase_url, settings.supabase_anon_key)
+
+# Supabase 클라이언트는 동기 방식이므로 쿼리는 전용 스레드 풀에서 실행합니다.
+# 풀 크기가 동시에 진행되는 DB 요청 수의 상한이 됩니다.
+_db_executor = ThreadPoolExecutor(
+    max_workers=settings.db_pool_size,
+    thread_name_prefix="supabase"
+)
+
+# 다시 시도하면 성공할 수 있는 PostgreSQL 오류 클래스 (SQLSTATE 앞 2자리)
+# 08 연결, 40 트랜잭션 롤백(교착 등), 53 자원 부족, 55 객체 상태(잠금), 57 관리자 개입(재시작 등),
+# 58 시스템 오류, XX 내부 오류
+_TRANSIENT_SQLSTATE_CLASSES = {"08", "40", "53", "55", "57", "58", "XX"}
+
+def is_permanent_error(error: BaseException) -> bool:
+    """
+    같은 쿼리를 다시 보내도 실패할 오류인지 판단
+
+    잘못된 데이터(JSON 변환 실패, 제약 조건 위반, 타입 오류)나 4xx 응답은 영구 오류이고,
+    연결 끊김, timeout, 5xx, 서버 과부하는 일시적 오류입니다. 판단할 수 없으면 일시적 오류로 봅니다.
+    """
+    if isinstance(error, (ValueError, TypeError)):
+        return True
+
+    from postgrest.exceptions import APIError
+    if not isinstance(error, APIError) or error.code is None:
+        return False
+
+    code = str(error.code)
+    if code.isdigit() and len(code) == 3:
+        # JSON이 아닌 오류 응답은 HTTP 상태 코드가 code로 들어옴
+        return code.startswith("4") and code not in ("408", "429")
+    if code.startswith("PGRST"):
+        # PGRST0xx는 PostgREST와 DB 사이의 연결 오류
+        return not code.startswith("PGRST0")
+    return code[:2] not in _TRANSIENT_SQLSTATE_CLASSES
+
+async def execute(query):
+    """쿼리를 DB 스레드 풀에서 실행 (이벤트 루프를 블로킹하지 않음)"""
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+    timings = []
+
+    def run():
+        started = time.perf_counter()
+        try:
+            if isinstance(query, _DeferredQuery):
+                return query.build().execute()
+            return query.execute()
+        finally:
+            timings.append((started - submitted, time.perf_counter() - started))
+
+    path = query_path(query)
+    ok = False
+    with start_span(f"db {path}", **{"db.path": path, "db.method": getattr(query, "http_method", None)}) as span:
+        try:
+            result = await loop.run_in_executor(_db_executor, run)
+            ok = True
+            return result
+        finally:
+            # 취소되어 아직 실행되지 않은 쿼리는 기록하지 않음
+            if timings:
+                wait_seconds, run_seconds = timings[0]
+                span.set_attribute("db.pool_wait_ms", round(wait_seconds * 1000, 3))
+                record_db_query(path, wait_seconds, run_seconds, ok)
+
+async def warm_up():
+    """Supabase client를 생성하고, 첫 요청이 연결 수립 비용을 내지 않도록 DB 연결과 스레드 풀 워커를 미리 준비"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_db_executor, supabase.connect)
+    if not supabase:
+        return
+
+    count = min(settings.db_warmup_connections, settings.db_pool_size)
+    started = time.perf_counter()
+    with start_span("db.warm_up", root=True, connections=count):
+        results = await asyncio.gather(
+            *[execute(supabase.table("users").select("id").limit(1)) for _ in range(count)],
+            return_exceptions=True
+        )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning("DB warm-up failed", extra={"failed": len(failures), "error": repr(failures[0])})
+    else:
+        logger.info("DB warm-up done", extra={"connections": count, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)})
@@ -0,0 +1,180 @@
+import struct
+from typing import List, Optional, Sequence
+import numpy as np
+
+STANDARD_GRAVITY = 9.80665
+
+# 바이너리 센서 구간 형식 (little-endian)
+#   헤더 16바이트: magic "BCS1", flags(u8, bit0 = 자이로 포함), 예약 3바이트, sample_rate_hz(f32), 샘플 수 n(u32)
+#   본문: 가속도 float32[n][3], (flags bit0이면) 자이로 float32[n][3]
+SENSOR_BLOB_CONTENT_TYPE = "application/vnd.badacall.sensor-window"
+SENSOR_BLOB_MAGIC = b"BCS1"
+SENSOR_BLOB_HEADER = struct.Struct("<4sB3xfI")
+SENSOR_BLOB_HAS_GYROSCOPE = 0x01
+
+# 사고 확률 모델 (로지스틱 회귀) - 계수를 바꾸면 version도 올려서 기존 신고를 재평가
+DETECTION_MODEL = {
+    "version": "heuristic-1",
+    "bias": -5.0,
+    "peak_g": 1.5,          # (최대 가속도[g] - 1)
+    "log_jerk": 0.5,        # log(1 + 최대 jerk[m/s³])
+    "tilt_deg": 0.04,       # 구간 시작/끝 중력 방향 변화[°]
+    "rotation_deg": 0.005   # 자이로 누적 회전량[°]
+}
+
+FEATURE_NAMES = ("peak_g", "max_jerk", "tilt_deg", "rotation_deg")
+
+def _pad_axes(samples: Sequence[Optional[Sequence[Sequence[float]]]], length: int) -> np.ndarray:
+    """길이가 다른 (N, 3) 샘플 목록을 NaN으로 채운 (B, length, 3) 배열로 변환"""
+    padded = np.full((len(samples), length, 3), np.nan)
+    for i, rows in enumerate(samples):
+        if rows is None or len(rows) == 0:
+            continue
+        values = np.asarray(rows, dtype=float)
+        if values.ndim != 2 or values.shape[1] != 3:
+            raise ValueError(f"window {i}: 센서 샘플은 [x, y, z] 형식이어야 합니다")
+        # NaN은 구간 길이를 맞추는 채움 값으로 쓰므로 입력에는 허용하지 않음
+        if not np.isfinite(values).all():
+            raise ValueError(f"window {i}: 센서 샘플에 NaN 또는 무한대 값이 있습니다")
+        padded[i, :len(values)] = values
+    return padded
+
+def encode_sensor_blob(window: dict) -> bytes:
+    """센서 구간 dict를 바이너리 형식으로 변환"""
+    accelerometer = np.asarray(window["accelerometer"], dtype="<f4")
+    gyroscope = window.get("gyroscope")
+    flags = 0
+    parts = [accelerometer.tobytes()]
+    if gyroscope is not None and len(gyroscope) > 0:
+        gyroscope = np.asarray(gyroscope, dtype="<f4")
+        if gyroscope.shape != accelerometer.shape:
+            raise ValueError("자이로 샘플 수는 가속도 샘플 수와 같아야 합니다")
+        flags |= SENSOR_BLOB_HAS_GYROSCOPE
+        parts.append(gyroscope.tobytes())
+
+    header = SENSOR_BLOB_HEADER.pack(SENSOR_BLOB_MAGIC, flags, float(window["sample_rate_hz"]), len(accelerometer))
+    return header + b"".join(parts)
+
+def decode_sensor_blob(data) -> dict:
+    """
+    바이너리 센서 구간을 dict로 변환
+
+    가속도/자이로 배열은 입력 버퍼를 복사하지 않는 읽기 전용 (n, 3) float32 뷰입니다.
+    """
+    buffer = memoryview(data)
+    if len(buffer) < SENSOR_BLOB_HEADER.size:
+        raise ValueError("센서 데이터 헤더가 올바르지 않습니다")
+    magic, flags, sample_rate_hz, count = SENSOR_BLOB_HEADER.unpack_from(buffer)
+    if magic != SENSOR_BLOB_MAGIC:
+        raise ValueError("지원하지 않는 센서 데이터 형식입니다")
+
+    axes = 2 if flags & SENSOR_BLOB_HAS_GYROSCOPE else 1
+    expected = SENSOR_BLOB_HEADER.size + axes * count * 3 * 4
+    if len(buffer) != expected:
+        raise ValueError(f"센서 데이터 길이가 올바르지 않습니다 (기대 {expected}바이트, 실제 {len(buffer)}바이트)")
+
+    samples = np.frombuffer(buffer, dtype="<f4", offset=SENSOR_BLOB_HEADER.size).reshape(axes, count, 3)
+    return {
+        "sample_rate_hz": sample_rate_hz,
+        "accelerometer": samples[0],
+        "gyroscope": samples[1] if axes == 2 else None
+    }
+
+def to_bytea(data: bytes) -> str:
+    """bytes를 PostgREST bytea 입력 형식(16진수)으로 변환"""
+    return "\\x" + data.hex()
+
+def from_bytea(value: str) -> bytes:
+    """PostgREST bytea 출력(16진수 문자열)을 bytes로 변환"""
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+
+def extract_features(
+    accelerometer: np.ndarray,
+    gyroscope: np.ndarray,
+    lengths: np.ndarray,
+    sample_rates: np.ndarray
+) -> dict:
+    """
+    센서 구간 배치에서 사고 판단용 특징 계산
+
+    accelerometer/gyroscope는 (B, T, 3) 배열(m/s², rad/s)이며 각 구간의 lengths 이후는 NaN입니다.
+    모든 구간을 한 번의 배열 연산으로 처리합니다.
+    """
+    batch = np.arange(len(lengths))
+    dt = 1.0 / sample_rates
+
+    magnitude = np.linalg.norm(accelerometer, axis=2)
+    peak_g = np.nan_to_num(magnitude).max(axis=1) / STANDARD_GRAVITY
+
+    jerk = np.linalg.norm(np.diff(accelerometer, axis=1), axis=2) * sample_rates[:, None]
+    max_jerk = np.nan_to_num(jerk).max(axis=1)
+
+    # 구간 앞/뒤 10% 평균 가속도(중력 방향)의 각도 변화 - 누적합으로 구간별 길이를 한 번에 처리
+    edge = np.maximum(lengths // 10, 1)
+    cumulative = np.concatenate(
+        [np.zeros((len(lengths), 1, 3)), np.nancumsum(accelerometer, axis=1)],
+        axis=1
+    )
+    head = cumulative[batch, edge] - cumulative[batch, 0]
+    tail = cumulative[batch, lengths] - cumulative[batch, lengths - edge]
+    cosine = np.einsum("ij,ij->i", head, tail) / (
+        np.linalg.norm(head, axis=1) * np.linalg.norm(tail, axis=1) + 1e-12
+    )
+    tilt_deg = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+    angular_speed = np.nan_to_num(np.linalg.norm(gyroscope, axis=2))
+    rotation_deg = np.degrees(angular_speed.sum(axis=1) * dt)
+
+    return {
+        "peak_g": peak_g,
+        "max_jerk": max_jerk,
+        "tilt_deg": tilt_deg,
+        "rotation_deg": rotation_deg
+    }
+
+def score_features(features: dict, model: dict = DETECTION_MODEL) -> np.ndarray:
+    """특징 배열로 사고 확률(0~1) 계산"""
+    z = (
+        model["bias"]
+        + model["peak_g"] * np.maximum(features["peak_g"] - 1.0, 0.0)
+        + model["log_jerk"] * np.log1p(features["max_jerk"])
+        + model["tilt_deg"] * features["tilt_deg"]
+        + model["rotation_deg"] * features["rotation_deg"]
+    )
+    return 1.0 / (1.0 + np.exp(-z))
+
+def score_windows(windows: List[dict], model: dict = DETECTION_MODEL) -> List[dict]:
+    """
+    센서 구간 목록을 한 번에 평가
+
+    각 구간은 sample_rate_hz, accelerometer([[x, y, z], ...]), gyroscope(선택)를 가진 dict입니다.
+    반환값은 구간별 accident_probability와 특징 값입니다.
+    """
+    if not windows:
+        return []
+
+    lengths = np.array([len(w["accelerometer"]) for w in windows])
+    if lengths.min() < 2:
+        raise ValueError("센서 구간에는 최소 2개의 가속도 샘플이 필요합니다")
+    sample_rates = np.array([float(w["sample_rate_hz"]) for w in windows])
+    if not (np.isfinite(sample_rates) & (sample_rates > 0)).all():
+        raise ValueError("sample_rate_hz는 0보다 큰 유한한 값이어야 합니다")
+
+    length = int(lengths.max())
+    accelerometer = _pad_axes([w["accelerometer"] for w in windows], length)
+    gyroscope = _pad_axes([w.get("gyroscope") for w in windows], length)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        features = extract_features(accelerometer, gyroscope, lengths, sample_rates)
+        probabilities = score_features(features, model)
+    # float32 최대값 근처의 샘플은 계산 중 무한대가 되어 JSON으로 저장할 수 없음
+    if not all(np.isfinite(features[name]).all() for name in FEATURE_NAMES) or not np.isfinite(probabilities).all():
+        raise ValueError("센서 값이 너무 커서 평가할 수 없습니다")
+
+    results = []
+    for i in range(len(windows)):
+        result = {name: round(float(features[name][i]), 4) for name in FEATURE_NAMES}
+        result["accident_probability"] = round(float(probabilities[i]), 4)
+        result["model_version"] = model["version"]
+        results.append(result)
+    return results
@@ -0,0 +1,63 @@
+from typing import Optional
+from fastapi import HTTPException, status
+from app.cache import TTLCache
+from app.config import settings
+from app.database import supabase, execute
+from app.log import get_logger
+
+logger = get_logger(__name__)
+
+# device_id → user_id 캐시 (미등록 기기는 None으로 짧게 캐시)
+device_users = TTLCache(
+    max_entries=settings.device_cache_max_entries,
+    ttl_seconds=settings.device_cache_ttl_seconds
+)
+
+_MISSING = object()
+
+def remember_device(device_id: str, user_id: str):
+    """등록된 기기의 user_id를 캐시에 저장"""
+    device_users.set(device_id, str(user_id))
+
+def forget_device(device_id: str):
+    """기기 캐시 무효화"""
+    device_users.delete(device_id)
+
+async def resolve_user_id(device_id: str) -> Optional[str]:
+    """기기 ID로 user_id 조회 (등록되지 않은 기기면 None)"""
+    cached = device_users.get(device_id, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
+    response = await execute(supabase.table("users").select("id").eq("device_id", device_id))
+    if not response.data:
+        device_users.set(device_id, None, ttl_seconds=settings.device_negative_cache_ttl_seconds)
+        return None
+
+    user_id = str(response.data[0]["id"])
+    remember_device(device_id, user_id)
+    return user_id
+
+async def require_user_id(device_id: str) -> str:
+    """등록된 기기의 user_id (의존성 주입)"""
+    if not supabase:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="데이터베이스 연결이 필요합니다."
+        )
+
+    try:
+        user_id = await resolve_user_id(device_id)
+    except Exception:
+        logger.exception("Error resolving device", extra={"device_id": device_id})
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="기기 확인 중 오류가 발생했습니다"
+        )
+
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="등록되지 않은 기기입니다."
+        )
+    return user_id
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Set
+from app.cache import TTLCache
+from app.models import ReportResponse
+
+def _as_utc(value: datetime) -> datetime:
+    """timezone 없는 시각은 UTC로 보고 (신고 시각은 datetime.utcnow()로 기록), UTC 시각으로 변환"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+class ReportEventBus:
+    """
+    신고 상태 변경을 구독자(SSE 연결)에게 전달하는 인프로세스 pub/sub
+
+    신고 하나(report:{id})와 기기 하나(device:{device_id}) 단위로 구독할 수 있습니다.
+    느린 구독자 때문에 발행이 막히지 않도록 큐가 가득 차면 가장 오래된 이벤트를 버립니다.
+    같은 변경이 이 프로세스와 DB 변경 수신(Realtime) 양쪽에서 발행되므로 신고의 (상태, updated_at)이
+    직전 발행과 같으면 다시 전달하지 않습니다. 이 프로세스는 timezone 없는 UTC 시각을, Realtime은
+    timezone이 있는 시각을 보내므로 UTC로 맞춘 뒤 비교합니다.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._last_published = TTLCache(max_entries=10000, ttl_seconds=600)
+
+    def subscribe(self, key: str) -> asyncio.Queue:
+        """구독 시작 - 이벤트를 받을 큐 반환"""
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers.setdefault(key, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, key: str, queue: asyncio.Queue):
+        """구독 종료"""
+        queues = self._subscribers.get(key)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[key]
+
+    def publish(self, report: ReportResponse):
+        """신고의 현재 상태를 해당 신고와 기기의 구독자에게 전달"""
+        version = (report.status, _as_utc(report.updated_at))
+        if self._last_published.get(report.id) == version:
+            return
+        self._last_published.set(report.id, version)
+
+        for key in (f"report:{report.id}", f"device:{report.device_id}"):
+            for queue in self._subscribers.get(key, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(report)
+
+    def subscriber_count(self) -> int:
+        """현재 구독 중인 연결 수"""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+report_events = ReportEventBus()
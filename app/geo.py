@@ -0,0 +1,70 @@
+import heapq
+from typing import Optional
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+def project_to_meters(latitudes: np.ndarray, longitudes: np.ndarray):
+    """위경도를 트랙 중심 기준의 평면 좌표(m)로 변환 (equirectangular 근사)"""
+    lat = np.radians(latitudes)
+    lon = np.unwrap(np.radians(longitudes))  # 날짜변경선을 지나는 트랙 보정
+    x = lon * np.cos(lat.mean()) * EARTH_RADIUS_M
+    y = lat * EARTH_RADIUS_M
+    return x, y
+
+def _farthest_point(x: np.ndarray, y: np.ndarray, start: int, end: int):
+    """start-end 직선에서 가장 먼 중간 점의 (인덱스, 거리)"""
+    xs = x[start + 1:end]
+    ys = y[start + 1:end]
+    dx = x[end] - x[start]
+    dy = y[end] - y[start]
+    length = np.hypot(dx, dy)
+    if length == 0:
+        distances = np.hypot(xs - x[start], ys - y[start])
+    else:
+        distances = np.abs(dx * (y[start] - ys) - dy * (x[start] - xs)) / length
+
+    offset = int(np.argmax(distances))
+    return start + 1 + offset, float(distances[offset])
+
+def simplify_track(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    tolerance_m: Optional[float] = None,
+    max_points: Optional[int] = None
+) -> np.ndarray:
+    """
+    Douglas-Peucker 방식으로 트랙을 단순화하고 남길 점의 인덱스를 반환
+
+    오차가 가장 큰 구간부터 분할하므로 tolerance_m(허용 오차, m)에 도달하거나
+    max_points개를 채우면 멈춥니다. 구간별 거리 계산은 NumPy로 벡터화되어 있습니다.
+    """
+    count = len(latitudes)
+    if count <= 2 or (max_points is not None and max_points >= count and not tolerance_m):
+        return np.arange(count)
+
+    tolerance = tolerance_m or 0.0
+    limit = max_points if max_points is not None else count
+    x, y = project_to_meters(np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64))
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    kept = 2
+
+    heap = []
+    index, distance = _farthest_point(x, y, 0, count - 1)
+    heapq.heappush(heap, (-distance, 0, count - 1, index))
+
+    while heap and kept < limit:
+        negative_distance, start, end, index = heapq.heappop(heap)
+        if -negative_distance <= tolerance:
+            break
+
+        keep[index] = True
+        kept += 1
+        for segment_start, segment_end in ((start, index), (index, end)):
+            if segment_end - segment_start > 1:
+                split, split_distance = _farthest_point(x, y, segment_start, segment_end)
+                heapq.heappush(heap, (-split_distance, segment_start, segment_end, split))
+
+    return np.flatnonzero(keep)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+from app.database import supabase, execute
+from app.location_buffer import location_buffer
+from app.log import get_logger
+from app.loop_monitor import loop_monitor
+from app.notifications import notification_dispatcher
+from app.report_wal import report_wal
+
+logger = get_logger(__name__)
+
+# 점검 결과 상태 (나쁜 순서)
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"
+STATUS_UNAVAILABLE = "unavailable"
+_SEVERITY = {STATUS_OK: 0, STATUS_DEGRADED: 1, STATUS_UNAVAILABLE: 2}
+
+def _queue_check(depth: int, limit: int) -> dict:
+    return {"status": STATUS_OK if depth < limit else STATUS_DEGRADED, "depth": depth, "limit": limit}
+
+def _report_wal_check() -> dict:
+    # dead-letter 신고는 운영자가 확인해야 하므로 남아 있는 동안 degraded
+    check = _queue_check(report_wal.pending_count, settings.health_max_report_wal_pending)
+    check["dead_letter_count"] = report_wal.dead_letter_count
+    check["writable"] = report_wal.writable
+    if report_wal.last_sync_error is not None:
+        check["status"] = STATUS_DEGRADED
+        check["last_sync_error"] = report_wal.last_sync_error
+    if report_wal.dead_letter_count:
+        check["status"] = STATUS_DEGRADED
+        check["dead_letter_path"] = report_wal.dead_letter_path
+    return check
+
+class ReadinessProbe:
+    """
+    트래픽을 받을 수 있는지 점검 (DB 연결, 쓰기 큐 적체, 이벤트 루프 지연)
+
+    - DB에 닿지 않아도 신고 write-ahead log에 기록할 수 있으면 degraded: 신고는 로컬에 접수되어
+      DB가 돌아오면 재전송됩니다. 이때 인스턴스가 재시작되면 (Render처럼 디스크가 임시인 환경에서)
+      접수 완료로 응답한 신고가 사라지므로 unavailable로 보고하지 않습니다.
+    - DB에 닿지 않고 write-ahead log에도 기록할 수 없으면 unavailable: 로드밸런서가 트래픽을 빼야 합니다.
+    - 큐가 밀리거나 루프가 느리거나 dead-letter 신고가 있으면 degraded: 요청은 처리되지만 오케스트레이터가 확장/재시작을 판단할 수 있습니다.
+
+    결과는 cache_seconds 동안 재사용하고, 동시에 들어온 probe는 진행 중인 점검 하나를 함께 기다리므로
+    probe가 잦아도 DB 쿼리는 cache_seconds마다 최대 1번입니다.
+    """
+
+    def __init__(self, cache_seconds: float, db_timeout: float):
+        self.cache_seconds = cache_seconds
+        self.db_timeout = db_timeout
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._in_flight: Optional[asyncio.Future] = None
+
+    async def _check_database(self) -> dict:
+        if not supabase:
+            return {"status": STATUS_UNAVAILABLE, "error": "데이터베이스가 설정되지 않았습니다"}
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(execute(supabase.table("users").select("id").limit(1)), timeout=self.db_timeout)
+        except asyncio.TimeoutError:
+            return {"status": STATUS_UNAVAILABLE, "error": f"{self.db_timeout}초 안에 응답하지 않았습니다"}
+        except Exception as e:
+            return {"status": STATUS_UNAVAILABLE, "error": repr(e)}
+        return {"status": STATUS_OK, "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    async def _check_event_loop(self) -> dict:
+        # 지연 모니터가 돌고 있으면 최근 window의 p99로 판단 (한 번의 측정보다 안정적)
+        if loop_monitor.running:
+            lag = loop_monitor.percentiles()
+            return {
+                "status": STATUS_OK if lag["p99_ms"] < settings.health_max_loop_lag_ms else STATUS_DEGRADED,
+                **lag,
+                "limit_ms": settings.health_max_loop_lag_ms
+            }
+
+        # 다른 준비된 콜백들이 모두 실행된 뒤에야 돌아오므로, 그 지연이 곧 요청이 처리를 기다리는 시간
+        started = time.perf_counter()
+        await asyncio.sleep(0)
+        lag_ms = (time.perf_counter() - started) * 1000
+        return {
+            "status": STATUS_OK if lag_ms < settings.health_max_loop_lag_ms else STATUS_DEGRADED,
+            "lag_ms": round(lag_ms, 2),
+            "limit_ms": settings.health_max_loop_lag_ms
+        }
+
+    async def _run_checks(self) -> dict:
+        database, event_loop = await asyncio.gather(self._check_database(), self._check_event_loop())
+        if database["status"] == STATUS_UNAVAILABLE and supabase and report_wal.writable:
+            database = {**database, "status": STATUS_DEGRADED, "reports": "write-ahead log에 접수 후 재전송"}
+        checks = {
+            "database": database,
+            "event_loop": event_loop,
+            "location_buffer": _queue_check(location_buffer.queue_depth, settings.health_max_location_queue),
+            "report_wal": _report_wal_check(),
+            "notifications": _queue_check(notification_dispatcher.queue_depth, settings.health_max_notification_queue)
+        }
+        status = max((check["status"] for check in checks.values()), key=_SEVERITY.__getitem__)
+        if status != STATUS_OK:
+            failing = {name: check for name, check in checks.items() if check["status"] != STATUS_OK}
+            logger.warning("Readiness check not ok", extra={"status": status, "checks": failing})
+        return {"status": status, "checked_at": datetime.now().isoformat(), "checks": checks}
+
+    def _store(self, task: asyncio.Future):
+        self._in_flight = None
+        if not task.cancelled() and task.exception() is None:
+            self._result = task.result()
+            self._checked_at = time.monotonic()
+
+    async def check(self) -> dict:
+        """점검 결과 (cache_seconds 이내의 결과가 있으면 재사용)"""
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._result
+
+        if self._in_flight is None:
+            self._in_flight = asyncio.ensure_future(self._run_checks())
+            self._in_flight.add_done_callback(self._store)
+        # probe 요청이 끊겨도 점검은 끝까지 진행해 다음 probe가 결과를 재사용하도록 shield
+        return await asyncio.shield(self._in_flight)
+
+readiness_probe = ReadinessProbe(
+    cache_seconds=settings.health_cache_seconds,
+    db_timeout=settings.health_db_timeout_seconds
+)
@@ -0,0 +1,49 @@
+import importlib.util
+from typing import Optional
+import httpx
+from app.config import settings
+from app.log import get_logger
+
+logger = get_logger(__name__)
+
+# h2 패키지(httpx[http2])가 없으면 HTTP/1.1 keep-alive로 동작
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.http_timeout_seconds, connect=settings.http_connect_timeout_seconds)
+
+def http_limits(max_connections: int, max_keepalive_connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds
+    )
+
+def use_http2() -> bool:
+    if settings.http2 and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+    return settings.http2 and HTTP2_AVAILABLE
+
+_client: Optional[httpx.AsyncClient] = None
+
+def open_http_client() -> httpx.AsyncClient:
+    """앱 수명 동안 공유하는 외부 HTTP 클라이언트 생성 (lifespan 시작 시)"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=use_http2(),
+            timeout=http_timeout(),
+            limits=http_limits(settings.http_max_connections, settings.http_max_keepalive_connections)
+        )
+    return _client
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 HTTP 클라이언트 (연결 풀/keep-alive 재사용)"""
+    return open_http_client()
+
+async def close_http_client():
+    """공유 HTTP 클라이언트 종료 (lifespan 종료 시)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from app.cache import TTLCache
+from app.config import settings
+from app.models import ReportResponse
+
+class ReportIdempotencyStore:
+    """
+    재시도된 신고 요청에 최초 응답을 돌려주기 위한 인메모리 저장소
+
+    Idempotency-Key 헤더가 있으면 그 키만 사용하고, 없을 때만 (device_id, 시간 구간, 반올림한 위치)로 만든 중복 키를 사용합니다.
+    같은 키의 요청이 동시에 들어오면 먼저 온 요청의 결과를 기다렸다가 그대로 돌려줍니다.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int, window_seconds: int, position_decimals: int):
+        self.window_seconds = window_seconds
+        self.position_decimals = position_decimals
+        self._results = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._report_keys = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def keys_for(
+        self,
+        device_id: str,
+        kind: str,
+        latitude: float,
+        longitude: float,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[List[Hashable], List[Hashable]]:
+        """(조회할 키, 저장할 키) - 구간 경계를 넘은 재시도도 잡도록 직전 구간도 조회"""
+        if idempotency_key:
+            # 명시적 키가 있으면 같은 위치의 새 신고를 중복으로 보지 않도록 그 키만 사용
+            explicit = ("key", device_id, idempotency_key)
+            return [explicit], [explicit]
+
+        bucket = int(time.time() // self.window_seconds)
+        position = (round(latitude, self.position_decimals), round(longitude, self.position_decimals))
+        current = ("dedup", device_id, kind, bucket) + position
+        previous = ("dedup", device_id, kind, bucket - 1) + position
+
+        return [current, previous], [current]
+
+    async def run(
+        self,
+        keys: Tuple[List[Hashable], List[Hashable]],
+        create: Callable[[], Awaitable[ReportResponse]]
+    ) -> ReportResponse:
+        """저장된 응답이 있으면 반환하고, 없으면 create()로 신고를 만든 뒤 응답 저장"""
+        lookup_keys, store_keys = keys
+        for key in lookup_keys:
+            cached = self._results.get(key)
+            if cached is not None:
+                return cached
+
+        for key in lookup_keys:
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        # 기다리는 재시도가 없을 때 실패 결과가 경고로 남지 않도록 처리
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        for key in store_keys:
+            self._in_flight[key] = future
+
+        try:
+            report = await create()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            for key in store_keys:
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+
+        for key in store_keys:
+            self._results.set(key, report)
+        self._report_keys.set(report.id, store_keys)
+        future.set_result(report)
+        return report
+
+    def forget_report(self, report_id: str):
+        """신고 상태가 바뀌면 저장된 응답 삭제 (취소 후 다시 신고할 수 있도록)"""
+        for key in self._report_keys.get(report_id, ()):
+            self._results.delete(key)
+        self._report_keys.delete(report_id)
+
+report_idempotency = ReportIdempotencyStore(
+    ttl_seconds=settings.report_idempotency_ttl_seconds,
+    max_entries=settings.report_idempotency_max_entries,
+    window_seconds=settings.report_dedup_window_seconds,
+    position_decimals=settings.report_dedup_position_decimals
+)
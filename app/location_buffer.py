@@ -0,0 +1,134 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+from app.config import settings
+from app.database import supabase, execute, is_permanent_error
+from app.tracing import start_span
+
+class LocationWriteBuffer:
+    """
+    여러 기기에서 들어오는 단건 위치 업데이트를 모아 bulk insert로 저장하는 버퍼
+
+    배치가 max_batch_size에 도달하거나 flush_interval 초가 지나면 저장하며,
+    각 요청은 자신의 행이 저장될 때까지 기다렸다가 저장된 행을 돌려받습니다.
+    저장된 행은 행마다 미리 만든 id로 요청과 짝지으며, 잘못된 행 하나 때문에 배치가 거부되면
+    한 행씩 다시 저장하여 그 행의 요청만 실패합니다.
+    """
+
+    def __init__(self, max_batch_size: int, flush_interval: float):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+        # 메트릭
+        self.flush_count = 0
+        self.failed_flush_count = 0
+        self.split_retry_count = 0
+        self.rows_written = 0
+        self.last_batch_size = 0
+        self.last_flush_latency_ms = 0.0
+        self.max_flush_latency_ms = 0.0
+        self._total_flush_latency_ms = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """저장 대기 중인 행 수"""
+        return len(self._pending)
+
+    async def add(self, row: dict) -> dict:
+        """행을 버퍼에 추가하고 저장된 행을 반환"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._flush_pending)
+
+        return await future
+
+    def _flush_pending(self):
+        """대기 중인 행을 배치 단위로 잘라 저장 태스크를 시작"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = asyncio.create_task(self._write(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _insert(self, batch: List[Tuple[dict, asyncio.Future]]):
+        """행들을 한 번의 insert로 저장하고 id가 같은 요청에 저장된 행 전달"""
+        response = await execute(supabase.table("locations").insert([row for row, _ in batch]))
+        saved_by_id = {str(saved["id"]): saved for saved in response.data or []}
+        for row, future in batch:
+            saved = saved_by_id.get(row["id"])
+            if future.done():
+                continue
+            if saved is None:
+                future.set_exception(RuntimeError("위치 저장 결과가 없습니다"))
+            else:
+                future.set_result(saved)
+                self.rows_written += 1
+
+    async def _write(self, batch: List[Tuple[dict, asyncio.Future]]):
+        """배치를 저장하고 대기 중인 요청에 결과 전달"""
+        started = time.perf_counter()
+        try:
+            # 여러 요청의 위치가 모인 배치이므로 요청 trace가 아닌 별도 trace로 기록
+            with start_span("location_buffer.write", root=True, batch_size=len(batch)):
+                try:
+                    await self._insert(batch)
+                except Exception as e:
+                    self.failed_flush_count += 1
+                    if len(batch) == 1 or not is_permanent_error(e):
+                        raise
+                    # 데이터 오류는 특정 행 때문이므로 한 행씩 다시 저장 (연결 오류는 재시도해도 같이 실패)
+                    self.split_retry_count += 1
+                    results = await asyncio.gather(*[self._insert([item]) for item in batch], return_exceptions=True)
+                    for (_, future), result in zip(batch, results):
+                        if isinstance(result, Exception) and not future.done():
+                            future.set_exception(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.flush_count += 1
+            self.last_batch_size = len(batch)
+            self.last_flush_latency_ms = latency_ms
+            self.max_flush_latency_ms = max(self.max_flush_latency_ms, latency_ms)
+            self._total_flush_latency_ms += latency_ms
+
+    async def flush(self):
+        """대기 중인 모든 행을 즉시 저장 (종료 시 사용)"""
+        self._flush_pending()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """버퍼 메트릭 조회"""
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight_flushes": len(self._tasks),
+            "flush_count": self.flush_count,
+            "failed_flush_count": self.failed_flush_count,
+            "split_retry_count": self.split_retry_count,
+            "rows_written": self.rows_written,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 3),
+            "max_flush_latency_ms": round(self.max_flush_latency_ms, 3),
+            "avg_flush_latency_ms": round(self._total_flush_latency_ms / self.flush_count, 3) if self.flush_count else 0.0
+        }
+
+location_buffer = LocationWriteBuffer(
+    max_batch_size=settings.location_batch_size,
+    flush_interval=settings.location_flush_interval_ms / 1000
+)
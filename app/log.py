@@ -0,0 +1,62 @@
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from app.config import settings
+from app.tracing import current_span
+
+# LogRecord 기본 속성 - 이외의 extra 필드는 구조화 로그에 그대로 포함
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (현재 span의 trace_id/span_id 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        span = current_span()
+        if span is not None:
+            entry["trace_id"] = span.trace_id
+            entry["span_id"] = span.span_id
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """개발용 한 줄 텍스트 로그 (trace_id 앞 8자리 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        span = current_span()
+        trace = f" [{span.trace_id[:8]}]" if span is not None else ""
+        extras = " ".join(
+            f"{key}={value}" for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_")
+        )
+        line = f"{record.levelname} {record.name}{trace}: {record.getMessage()}"
+        if extras:
+            line += f" ({extras})"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+def _configure():
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+    root = logging.getLogger("app")
+    root.handlers = [handler]
+    root.setLevel(settings.log_level.upper())
+    root.propagate = False
+
+_configure()
+
+def get_logger(name: str) -> logging.Logger:
+    """app.* 모듈용 logger"""
+    return logging.getLogger(name)
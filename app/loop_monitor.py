@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional
+from app.config import settings
+from app.log import get_logger
+from app.metrics import metrics
+
+logger = get_logger(__name__)
+
+event_loop_lag_seconds = metrics.histogram(
+    "event_loop_lag_seconds",
+    "예정보다 늦게 깨어난 시간 (이벤트 루프 지연)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+event_loop_blocked_total = metrics.counter("event_loop_blocked_total", "LOOP_BLOCK_THRESHOLD_MS 이상 루프가 멈춘 횟수")
+
+class LoopLagMonitor:
+    """
+    이벤트 루프 지연 측정
+
+    interval마다 sleep하고 예정 시각보다 늦게 깨어난 만큼을 지연으로 기록합니다. 그 사이 루프를 붙잡은
+    동기 I/O나 CPU 작업이 있으면 지연이 커집니다.
+
+    debug 모드에서는 감시 스레드가 루프의 heartbeat를 확인하다가 block_threshold 이상 멈추면
+    루프 스레드의 현재 스택(멈추게 한 코드 위치)을 로그로 남기고, asyncio debug 모드로 느린 콜백의
+    태스크 이름도 함께 기록합니다.
+    """
+
+    def __init__(self, interval: float, window: int, block_threshold: float, debug: bool):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.debug = debug
+        self._samples = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self.blocked_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """측정 태스크 (debug 모드면 감시 스레드도) 시작"""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run())
+
+        if self.debug:
+            # 느린 콜백 경고("Executing <Task ...> took 0.3 seconds")를 앱 로그로 출력
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.block_threshold
+            asyncio_logger = logging.getLogger("asyncio")
+            asyncio_logger.handlers = logging.getLogger("app").handlers
+            asyncio_logger.setLevel(logging.WARNING)
+
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(now - expected, 0.0)
+            self._samples.append(lag)
+            event_loop_lag_seconds.observe(lag)
+            if lag >= self.block_threshold:
+                self.blocked_count += 1
+                event_loop_blocked_total.inc()
+                if not self.debug:
+                    logger.warning("Event loop blocked", extra={"lag_ms": round(lag * 1000, 1)})
+
+    def _watch(self):
+        """감시 스레드 - 루프가 멈춰 있는 동안 루프 스레드의 스택을 한 번 기록"""
+        reported_beat = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            beat = self._heartbeat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.block_threshold or beat == reported_beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported_beat = beat
+            logger.warning(
+                "Event loop blocked, stack of the blocking call",
+                extra={
+                    "blocked_ms": round(stalled * 1000, 1),
+                    "stack": "".join(traceback.format_stack(frame))
+                }
+            )
+
+    def percentiles(self) -> dict:
+        """최근 window 동안의 지연 percentile [ms]"""
+        if not self._samples:
+            return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "samples": 0}
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+
+        def at(q: float) -> float:
+            return round(ordered[int(q * last)] * 1000, 2)
+
+        return {
+            "p50_ms": at(0.5),
+            "p90_ms": at(0.9),
+            "p99_ms": at(0.99),
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "samples": len(ordered)
+        }
+
+    async def close(self):
+        """측정 태스크와 감시 스레드 종료"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    def stats(self) -> dict:
+        """지연 메트릭 조회"""
+        return {**self.percentiles(), "blocked_count": self.blocked_count}
+
+loop_monitor = LoopLagMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    window=settings.loop_monitor_window,
+    block_threshold=settings.loop_block_threshold_ms / 1000,
+    debug=settings.loop_debug
+)
+
+# 대시보드용 최근 지연 percentile (/metrics 조회 시점에 계산)
+metrics.gauge("event_loop_lag_p50_seconds", "최근 이벤트 루프 지연 p50", lambda: loop_monitor.percentiles()["p50_ms"] / 1000)
+metrics.gauge("event_loop_lag_p90_seconds", "최근 이벤트 루프 지연 p90", lambda: loop_monitor.percentiles()["p90_ms"] / 1000)
+metrics.gauge("event_loop_lag_p99_seconds", "최근 이벤트 루프 지연 p99", lambda: loop_monitor.percentiles()["p99_ms"] / 1000)
+metrics.gauge("event_loop_lag_max_seconds", "최근 이벤트 루프 지연 최대값", lambda: loop_monitor.percentiles()["max_ms"] / 1000)
@@ -1,15 +1,75 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 import asyncio
-import httpx
 from datetime import datetime
+from typing import Optional
 from app.config import settings
-from app.routers import onboarding, reports, locations
+from app.database import warm_up
+from app.health import STATUS_DEGRADED, STATUS_UNAVAILABLE, readiness_probe
+from app.http_client import close_http_client, get_http_client, open_http_client
+from app.log import get_logger
+from app.loop_monitor import loop_monitor
+from app.routers import auth, onboarding, reports, locations
+from app.location_buffer import location_buffer
+from app.report_changes import report_change_feed
+from app.report_wal import report_wal
+from app.notifications import notification_dispatcher
+from app.metrics import metrics, metrics_middleware
+from app.tracing import start_span, tracing_middleware
+from app.devices import device_users
+from app.profiles import device_profiles
+
+logger = get_logger(__name__)
+
+# 백그라운드에서 자동으로 keep-alive 요청을 보내는 스케줄러 (유휴 슬립 방지)
+async def auto_ping():
+    """SELF_PING_INTERVAL_SECONDS마다 SELF_PING_URL로 keep-alive 요청 (공유 클라이언트로 연결 재사용)"""
+    while True:
+        await asyncio.sleep(settings.self_ping_interval_seconds)
+        try:
+            with start_span("auto_ping", root=True, url=settings.self_ping_url):
+                response = await get_http_client().get(settings.self_ping_url)
+                response.raise_for_status()
+        except Exception as e:
+            logger.warning("Auto ping failed", extra={"error": repr(e)})
+
+# DB client 생성/warm-up 태스크 - 끝나기 전에도 서버는 요청을 받고, /ready는 503을 반환
+_startup_task: Optional[asyncio.Task] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 공유 연결과 백그라운드 태스크를 준비하고, 종료 시 남은 작업을 정리"""
+    global _startup_task
+    open_http_client()
+    loop_monitor.start()
+    # 콜드 스타트 직후 /health와 첫 요청이 DB 초기화를 기다리지 않도록 백그라운드에서 실행
+    _startup_task = asyncio.create_task(warm_up())
+    ping_task = asyncio.create_task(auto_ping()) if settings.self_ping_url else None
+    reports.start_report_replayer()
+    reports.start_report_change_feed()
+    notification_dispatcher.start()
+
+    yield
+
+    if ping_task is not None:
+        ping_task.cancel()
+    if not _startup_task.done():
+        _startup_task.cancel()
+    await reports.stop_rescore_job()
+    await location_buffer.flush()
+    await report_wal.close()
+    await report_change_feed.close()
+    await notification_dispatcher.close()
+    await close_http_client()
+    await loop_monitor.close()
 
 app = FastAPI(
     title="바다콜 Backend",
     description="바다 한가운데에서 사고 발생 시 GPS 기반 자동 사고 감지 및 긴급 신고 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -18,9 +78,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(tracing_middleware)
+
+# 내부 큐/캐시 상태 (/metrics 조회 시점에 읽음)
+metrics.gauge("location_buffer_queue_depth", "DB 저장을 기다리는 위치 수", lambda: location_buffer.queue_depth)
+metrics.gauge("report_wal_pending", "DB 저장이 확인되지 않은 신고 수", lambda: report_wal.pending_count)
+metrics.gauge("notification_queue_depth", "전송을 기다리는 알림 작업 수", lambda: notification_dispatcher.queue_depth)
+metrics.gauge("report_change_feed_connected", "DB 신고 변경 수신(Realtime) 연결 여부", lambda: report_change_feed.connected)
+metrics.gauge("device_cache_hits_total", "device_id 캐시 hit 수", lambda: device_users.hits, kind="counter")
+metrics.gauge("device_cache_misses_total", "device_id 캐시 miss 수", lambda: device_users.misses, kind="counter")
+metrics.gauge("profile_cache_hits_total", "프로필 캐시 hit 수", lambda: device_profiles.hits, kind="counter")
+metrics.gauge("profile_cache_misses_total", "프로필 캐시 miss 수", lambda: device_profiles.misses, kind="counter")
+
 # Include routers
+app.include_router(auth.router)
 app.include_router(onboarding.router)
 app.include_router(reports.router)
 app.include_router(locations.router)
@@ -31,8 +106,35 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """프로세스 생존 여부 (liveness) - 의존성 점검은 /ready"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    트래픽을 받을 준비 여부 (로드밸런서/오케스트레이터용)
+
+    ok면 200, 시작 중이거나 DB와 신고 write-ahead log를 모두 쓸 수 없으면 503,
+    DB 장애(신고는 write-ahead log에 접수), 큐 적체, 이벤트 루프 지연으로 degraded면
+    HEALTH_DEGRADED_STATUS_CODE(기본 200)와 함께 실패한 항목을 반환합니다.
+    """
+    if _startup_task is None or not _startup_task.done():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+
+    result = await readiness_probe.check()
+    if result["status"] == STATUS_UNAVAILABLE:
+        status_code = 503
+    elif result["status"] == STATUS_DEGRADED:
+        status_code = settings.health_degraded_status_code
+    else:
+        status_code = 200
+    return JSONResponse(status_code=status_code, content=result)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Prometheus text 형식 메트릭"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/keep-alive")
 async def keep_alive():
     """서버 활성 상태 유지용 엔드포인트"""
@@ -41,20 +143,3 @@ async def keep_alive():
         "timestamp": datetime.now().isoformat(),
         "message": "서버가 활성 상태입니다"
     }
-
-# 백그라운드에서 자동으로 keep-alive 요청을 보내는 스케줄러
-async def auto_ping():
-    """14분마다 자동으로 keep-alive 요청"""
-    while True:
-        await asyncio.sleep(14 * 60)  # 14분 대기
-        try:
-            # 자신에게 ping 요청 (Render 환경에서는 외부 URL 사용)
-            async with httpx.AsyncClient() as client:
-                await client.get("https://bada-call-be.onrender.com/keep-alive", timeout=30)
-        except Exception as e:
-            print(f"Auto ping failed: {e}")
-
-@app.on_event("startup")
-async def startup_event():
-    """앱 시작시 백그라운드 태스크 시작"""
-    asyncio.create_task(auto_ping())
\ No newline at end of file
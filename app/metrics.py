@@ -0,0 +1,168 @@
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from app.log import get_logger
+
+logger = get_logger(__name__)
+
+# 기본 latency 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    """단조 증가 카운터 (label 조합별)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+class Histogram:
+    """버킷 히스토그램 (label 조합별 누적 버킷, 합계, 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[tuple, list] = {}  # labels → [버킷별 개수..., 합계, 개수]
+
+    def observe(self, value: float, *labelvalues: str):
+        entry = self._values.get(labelvalues)
+        if entry is None:
+            entry = self._values[labelvalues] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[i] += 1
+                break
+        entry[-2] += value
+        entry[-1] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, entry in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, ('le', repr(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, ('le', '+Inf'))} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {entry[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {entry[-1]}")
+        return lines
+
+class Gauge:
+    """조회 시점에 콜백으로 값을 읽는 메트릭 (큐 깊이, 캐시 hit 수 등 - 누적 값이면 kind="counter")"""
+
+    def __init__(self, name: str, description: str, read: Callable[[], float], kind: str = "gauge"):
+        self.name = name
+        self.description = description
+        self.read = read
+        self.kind = kind
+
+    def samples(self) -> List[str]:
+        try:
+            return [f"{self.name} {float(self.read())}"]
+        except Exception:
+            logger.exception("Error reading gauge", extra={"metric": self.name})
+            return []
+
+class MetricsRegistry:
+    """메트릭 모음 - Prometheus text exposition 형식으로 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, description, labelnames))
+
+    def histogram(self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, description, labelnames, buckets))
+
+    def gauge(self, name: str, description: str, read: Callable[[], float], kind: str = "gauge") -> Gauge:
+        return self._register(Gauge(name, description, read, kind))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+http_requests_total = metrics.counter("http_requests_total", "HTTP 요청 수", ("method", "route", "status"))
+http_request_errors_total = metrics.counter("http_request_errors_total", "5xx 응답 또는 처리 중 예외 수", ("method", "route"))
+http_request_duration_seconds = metrics.histogram("http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 헤더까지)", ("method", "route"))
+http_request_db_seconds = metrics.histogram("http_request_db_seconds", "HTTP 요청 하나가 DB 쿼리에 쓴 시간 합계", ("method", "route"))
+db_queries_total = metrics.counter("db_queries_total", "DB 쿼리 수", ("path", "outcome"))
+db_query_duration_seconds = metrics.histogram("db_query_duration_seconds", "DB 쿼리 실행 시간 (스레드 풀 대기 제외)", ("path",))
+db_pool_wait_seconds = metrics.histogram("db_pool_wait_seconds", "DB 스레드 풀 빈자리를 기다린 시간", ("path",))
+
+# 현재 요청이 DB에 쓴 시간 [초] - 미들웨어가 요청마다 새로 설정
+_request_db_time: ContextVar[Optional[list]] = ContextVar("request_db_time", default=None)
+
+def query_path(query) -> str:
+    """쿼리 빌더의 PostgREST 경로 (/reports, /rpc/onboard_device 등)"""
+    return getattr(query, "path", None) or "unknown"
+
+def record_db_query(path: str, wait_seconds: float, run_seconds: float, ok: bool):
+    """DB 쿼리 1회 기록 (database.execute에서 호출)"""
+    db_queries_total.inc(path, "ok" if ok else "error")
+    db_query_duration_seconds.observe(run_seconds, path)
+    db_pool_wait_seconds.observe(wait_seconds, path)
+
+    request_db_time = _request_db_time.get()
+    if request_db_time is not None:
+        request_db_time[0] += wait_seconds + run_seconds
+
+async def metrics_middleware(request, call_next):
+    """route별 요청 수, 처리 시간, DB 시간, 오류 수 기록"""
+    request_db_time = [0.0]
+    token = _request_db_time.set(request_db_time)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        _request_db_time.reset(token)
+
+        # 경로 파라미터가 들어간 실제 URL 대신 route 템플릿으로 집계 (label 수 제한)
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        method = request.method
+
+        http_requests_total.inc(method, route_path, str(status_code))
+        http_request_duration_seconds.observe(elapsed, method, route_path)
+        http_request_db_seconds.observe(request_db_time[0], method, route_path)
+        if status_code >= 500:
+            http_request_errors_total.inc(method, route_path)
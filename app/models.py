@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, Dict, List, Union
 from datetime import datetime
 from enum import Enum
@@ -23,6 +23,16 @@ class EmergencyType(str, Enum):
     SINKING = "sinking"
     OTHER = "other"
 
+class JobStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    GPX = "gpx"
+
 class Location(BaseModel):
     latitude: float
     longitude: float
@@ -36,6 +46,26 @@ class SensorData(BaseModel):
     heading: Optional[float] = None
     timestamp: datetime
 
+# Auth Models
+class UserRegister(BaseModel):
+    name: str
+    phone: str
+    password: str
+    boat_name: Optional[str] = None
+    boat_number: Optional[str] = None
+
+class UserLogin(BaseModel):
+    phone: str
+    password: str
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+    user_id: str
+
+class TokenData(BaseModel):
+    user_id: Optional[str] = None
+
 # Onboarding Models
 class OnboardingData(BaseModel):
     device_id: str
@@ -66,6 +96,15 @@ class UserProfile(BaseModel):
     emergency_contacts: List[EmergencyContact] = []
     created_at: datetime
 
+class User(BaseModel):
+    id: str
+    name: str
+    phone: str
+    boat_name: Optional[str] = None
+    boat_number: Optional[str] = None
+    emergency_contacts: List[EmergencyContact] = []
+    created_at: datetime
+
 # Report Models
 class EmergencyReportCreate(BaseModel):
     device_id: str
@@ -77,13 +116,40 @@ class EmergencyReportCreate(BaseModel):
     description: Optional[str] = None
     sensor_data: Optional[Dict] = None
 
+class SensorWindow(BaseModel):
+    sample_rate_hz: float
+    accelerometer: List[List[float]]  # [[x, y, z], ...] (m/s²)
+    gyroscope: Optional[List[List[float]]] = None  # [[x, y, z], ...] (rad/s)
+
 class AutoDetectionReport(BaseModel):
     device_id: str
     type: ReportType = ReportType.AUTO_DETECTION
-    location_latitude: float
-    location_longitude: float
-    sensor_data: Dict
+    location_latitude: float = Field(allow_inf_nan=False)
+    location_longitude: float = Field(allow_inf_nan=False)
+    sensor_data: Dict = {}
+    sensor_window: Optional[SensorWindow] = None  # 있으면 서버에서 사고 확률 계산
+    accident_probability: Optional[float] = Field(default=None, allow_inf_nan=False)
+
+class DetectionScoreRequest(BaseModel):
+    windows: List[SensorWindow]
+
+class DetectionScore(BaseModel):
     accident_probability: float
+    peak_g: float
+    max_jerk: float
+    tilt_deg: float
+    rotation_deg: float
+    model_version: str
+
+class DetectionRescoreJob(BaseModel):
+    job_id: str
+    status: JobStatus
+    model_version: str
+    scanned: int = 0
+    rescored: int = 0
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
 
 class ReportUpdate(BaseModel):
     status: Optional[ReportStatus] = None
@@ -130,6 +196,13 @@ class LocationResponse(BaseModel):
     heading: Optional[float]
     timestamp: datetime
 
+class NearbyVessel(BaseModel):
+    device_id: str
+    latitude: float
+    longitude: float
+    distance_km: float
+    timestamp: datetime
+
 # Legacy models (유지)
 class ReportBase(BaseModel):
     type: ReportType
@@ -0,0 +1,224 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Dict, List
+from app.config import settings
+from app.http_client import get_http_client
+from app.log import get_logger
+from app.models import ReportResponse, ReportType
+from app.profiles import get_device_profile
+from app.tracing import current_span, start_span
+
+logger = get_logger(__name__)
+
+class NotificationSender:
+    """알림 전송 인터페이스 - channel별로 하나씩 등록"""
+
+    channel = "sms"
+
+    async def send(self, to: str, message: str):
+        raise NotImplementedError
+
+class LogNotificationSender(NotificationSender):
+    """실제로 보내지 않고 로그와 메모리에만 남기는 전송기 (개발/테스트용)"""
+
+    def __init__(self, channel: str = "sms", history_size: int = 100):
+        self.channel = channel
+        self.sent = deque(maxlen=history_size)
+
+    async def send(self, to: str, message: str):
+        self.sent.append({"to": to, "message": message})
+        logger.info("Notification sent (log sender)", extra={"channel": self.channel, "to": to, "notification": message})
+
+class WebhookNotificationSender(NotificationSender):
+    """알림을 외부 발송 서비스 webhook으로 POST하는 전송기"""
+
+    def __init__(self, url: str, channel: str = "sms"):
+        self.url = url
+        self.channel = channel
+
+    async def send(self, to: str, message: str):
+        response = await get_http_client().post(self.url, json={"channel": self.channel, "to": to, "message": message})
+        response.raise_for_status()
+
+class RateLimiter:
+    """토큰 버킷 속도 제한 (초당 rate개, 최대 burst개까지 몰아서 허용)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+def build_report_message(report: ReportResponse, name: str) -> str:
+    """비상연락처에게 보낼 신고 알림 문구"""
+    kind = "자동 사고 감지" if report.type == ReportType.AUTO_DETECTION else "긴급 신고"
+    return (
+        f"[바다콜] {name}님의 {kind}가 접수되었습니다. "
+        f"위치: {report.location_latitude:.5f}, {report.location_longitude:.5f}"
+    )
+
+class NotificationDispatcher:
+    """
+    신고 접수 시 비상연락처 알림을 백그라운드에서 전송
+
+    신고 응답은 큐에 넣기만 하고 바로 반환하며, 고정된 수의 워커가 channel별 속도 제한을 지켜
+    전송합니다. 실패한 알림은 워커를 붙잡지 않고 지수 백오프 후 큐에 다시 넣습니다.
+    """
+
+    def __init__(self, workers: int, queue_size: int, max_attempts: int, initial_backoff: float):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._senders: Dict[str, NotificationSender] = {}
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.sent_count = 0
+        self.failed_count = 0
+        self.retry_count = 0
+        self.dropped_count = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def register(self, sender: NotificationSender, rate: float, burst: int):
+        """channel 전송기와 속도 제한 등록"""
+        self._senders[sender.channel] = sender
+        self._limiters[sender.channel] = RateLimiter(rate, burst)
+
+    def start(self):
+        """워커 시작"""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def _enqueue(self, job: dict) -> bool:
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            self.dropped_count += 1
+            logger.error("Notification queue full, dropping job", extra={"kind": job["kind"], "report_id": job["report"].id})
+            return False
+
+    def notify_report(self, report: ReportResponse):
+        """신고의 비상연락처 알림 예약 (전송을 기다리지 않음)"""
+        # 워커에서 신고 요청의 trace를 이어가도록 현재 span을 함께 전달
+        span = current_span()
+        self._enqueue({
+            "kind": "report",
+            "report": report,
+            "attempt": 1,
+            "trace": span.context if span is not None else None
+        })
+
+    def _retry_later(self, job: dict):
+        if job["attempt"] >= self.max_attempts:
+            self.failed_count += 1
+            logger.error("Giving up notification", extra={"kind": job["kind"], "report_id": job["report"].id, "attempt": job["attempt"]})
+            return
+
+        delay = self.initial_backoff * 2 ** (job["attempt"] - 1) * random.uniform(0.5, 1.0)
+        self.retry_count += 1
+        asyncio.get_running_loop().call_later(delay, self._enqueue, {**job, "attempt": job["attempt"] + 1})
+
+    async def _fan_out(self, job: dict):
+        """신고 기기의 비상연락처마다 전송 작업 생성"""
+        report = job["report"]
+        profile = await get_device_profile(report.device_id)
+        if profile is None or not profile.emergency_contacts:
+            return
+
+        message = build_report_message(report, profile.name)
+        for channel in self._senders:
+            for contact in profile.emergency_contacts:
+                self._enqueue({
+                    "kind": "message",
+                    "report": report,
+                    "channel": channel,
+                    "to": contact.phone,
+                    "message": message,
+                    "attempt": 1,
+                    "trace": current_span().context
+                })
+
+    async def _deliver(self, job: dict):
+        await self._limiters[job["channel"]].acquire()
+        await self._senders[job["channel"]].send(job["to"], job["message"])
+        self.sent_count += 1
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                with start_span(
+                    f"notification.{job['kind']}",
+                    parent=job["trace"],
+                    root=job["trace"] is None,
+                    report_id=job["report"].id,
+                    attempt=job["attempt"]
+                ):
+                    if job["kind"] == "report":
+                        await self._fan_out(job)
+                    else:
+                        await self._deliver(job)
+            except Exception as e:
+                logger.warning("Notification failed", extra={"kind": job["kind"], "report_id": job["report"].id, "attempt": job["attempt"], "error": repr(e)})
+                self._retry_later(job)
+            finally:
+                self._queue.task_done()
+
+    async def close(self, timeout: float = 5.0):
+        """대기 중인 알림을 timeout 동안 보내고 워커 종료"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Notification dispatcher closing with queued jobs", extra={"queue_depth": self.queue_depth})
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        """알림 메트릭 조회"""
+        return {
+            "queue_depth": self.queue_depth,
+            "sent_count": self.sent_count,
+            "failed_count": self.failed_count,
+            "retry_count": self.retry_count,
+            "dropped_count": self.dropped_count
+        }
+
+notification_dispatcher = NotificationDispatcher(
+    workers=settings.notification_workers,
+    queue_size=settings.notification_queue_size,
+    max_attempts=settings.notification_max_attempts,
+    initial_backoff=settings.notification_initial_backoff_seconds
+)
+
+if settings.notification_webhook_url:
+    _sender: NotificationSender = WebhookNotificationSender(settings.notification_webhook_url)
+else:
+    _sender = LogNotificationSender()
+notification_dispatcher.register(
+    _sender,
+    rate=settings.notification_rate_per_second,
+    burst=settings.notification_burst
+)
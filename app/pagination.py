@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional
+from fastapi import HTTPException, status
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """(정렬 값, id)를 불투명한 커서 문자열로 변환"""
+    raw = json.dumps([sort_value, str(row_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """커서 문자열을 (정렬 값, id)로 변환"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다"
+        )
+
+    # PostgREST 필터 문법을 깨뜨릴 수 있는 값은 거부
+    if not isinstance(sort_value, str) or any(char in f"{sort_value}{row_id}" for char in '"\\'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다"
+        )
+    return sort_value, row_id
+
+def apply_keyset(query, sort_column: str, cursor: Optional[str], desc: bool = True):
+    """
+    (sort_column, id) 기준 keyset 페이지네이션 적용
+
+    offset 방식과 달리 페이지가 깊어져도 인덱스 탐색 비용이 같고,
+    조회 중에 새 행이 추가되어도 행이 중복되거나 누락되지 않습니다.
+    """
+    query = query.order(sort_column, desc=desc).order("id", desc=desc)
+    if cursor is None:
+        return query
+
+    sort_value, row_id = decode_cursor(cursor)
+    op = "lt" if desc else "gt"
+    # OR 조건은 인덱스 탐색 조건이 되지 못해 앞 페이지 행을 모두 읽고 거르므로,
+    # 같은 뜻의 범위 조건(<= 또는 >=)을 함께 걸어 커서 위치부터 인덱스를 탐색하도록 함
+    bound = query.lte if desc else query.gte
+    return bound(sort_column, sort_value).or_(
+        f'{sort_column}.{op}."{sort_value}",'
+        f'and({sort_column}.eq."{sort_value}",id.{op}."{row_id}")'
+    )
+
+def next_cursor(rows: List[dict], sort_column: str, limit: int) -> Optional[str]:
+    """다음 페이지 커서 (마지막 페이지면 None)"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last[sort_column], last["id"])
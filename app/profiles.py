@@ -0,0 +1,77 @@
+import itertools
+from typing import Optional
+from app.cache import TTLCache
+from app.config import settings
+from app.database import supabase, execute
+from app.models import EmergencyContact, UserProfile
+
+# device_id → 조립된 UserProfile 캐시 (미등록 기기는 None으로 짧게 캐시)
+# 온보딩/프로필 수정 시 저장 결과로 바로 갱신(write-through)
+device_profiles = TTLCache(
+    max_entries=settings.profile_cache_max_entries,
+    ttl_seconds=settings.profile_cache_ttl_seconds
+)
+
+# device_id → 프로필 세대 (저장/무효화할 때마다 증가)
+# 조회 중에 프로필이 바뀌었으면 조회 결과(이전 프로필)로 캐시를 덮어쓰지 않기 위해 사용
+_generations = TTLCache(
+    max_entries=settings.profile_cache_max_entries,
+    ttl_seconds=settings.profile_cache_ttl_seconds
+)
+_next_generation = itertools.count(1)
+
+_MISSING = object()
+
+def to_user_profile(profile: dict) -> UserProfile:
+    """users 행(+ emergency_contacts 목록)을 UserProfile로 변환"""
+    return UserProfile(
+        device_id=profile["device_id"],
+        name=profile["name"],
+        phone=profile["phone"],
+        boat_name=profile.get("boat_name"),
+        boat_number=profile.get("boat_number"),
+        emergency_contacts=[
+            EmergencyContact(name=contact["name"], phone=contact["phone"])
+            for contact in profile.get("emergency_contacts") or []
+        ],
+        created_at=profile["created_at"]
+    )
+
+def _generation(device_id: str) -> int:
+    return _generations.get(device_id, 0)
+
+def remember_profile(profile: UserProfile):
+    """저장된 프로필을 캐시에 반영"""
+    _generations.set(profile.device_id, next(_next_generation))
+    device_profiles.set(profile.device_id, profile)
+
+def forget_profile(device_id: str):
+    """프로필 캐시 무효화 (진행 중인 조회도 결과를 캐시하지 않음)"""
+    _generations.set(device_id, next(_next_generation))
+    device_profiles.delete(device_id)
+
+async def get_device_profile(device_id: str) -> Optional[UserProfile]:
+    """기기 ID로 프로필 조회 (등록되지 않은 기기면 None)"""
+    cached = device_profiles.get(device_id, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
+    generation = _generation(device_id)
+    # 사용자와 비상연락처를 한 번의 요청으로 조회 (PostgREST 리소스 임베딩)
+    response = await execute(
+        supabase.table("users")
+        .select("device_id, name, phone, boat_name, boat_number, created_at, emergency_contacts(name, phone)")
+        .eq("device_id", device_id)
+        .order("created_at", foreign_table="emergency_contacts")
+    )
+    # 조회하는 동안 프로필이 저장/무효화되었으면 결과가 이전 프로필일 수 있으므로 캐시하지 않음
+    unchanged = _generation(device_id) == generation
+    if not response.data:
+        if unchanged:
+            device_profiles.set(device_id, None, ttl_seconds=settings.device_negative_cache_ttl_seconds)
+        return None
+
+    profile = to_user_profile(response.data[0])
+    if unchanged:
+        device_profiles.set(device_id, profile)
+    return profile
@@ -0,0 +1,123 @@
+import asyncio
+import random
+from typing import Callable, Optional
+from app.config import settings
+from app.log import get_logger
+
+logger = get_logger(__name__)
+
+class ReportChangeFeed:
+    """
+    reports 테이블의 변경을 Supabase Realtime(postgres_changes)으로 받아 전달
+
+    배차 시스템처럼 이 프로세스 밖에서 DB의 신고 상태를 바꾸거나 다른 인스턴스가 신고를 접수해도
+    SSE 구독자가 변경을 받도록 합니다. 연결이 끊겨 라이브러리의 재연결도 실패하면 백오프 후 처음부터
+    다시 연결합니다. 끊겨 있는 동안의 변경은 전달되지 않으므로 SSE는 연결할 때 현재 상태를 먼저 보냅니다.
+    """
+
+    def __init__(self, url: str, key: str, initial_backoff: float, max_backoff: float, check_interval: float = 5.0):
+        self.url = url
+        self.key = key
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.check_interval = check_interval
+        self._on_change: Optional[Callable[[dict], None]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._broken: Optional[asyncio.Event] = None
+
+        # 메트릭
+        self.connected = False
+        self.change_count = 0
+        self.reconnect_count = 0
+
+    def start(self, on_change: Callable[[dict], None]):
+        """변경 수신 시작 - on_change는 변경된 reports 행(dict)을 받음"""
+        if self._task is not None or not (self.url and self.key):
+            return
+        self._on_change = on_change
+        self._task = asyncio.create_task(self._run())
+
+    def _handle_change(self, payload: dict):
+        record = payload.get("data", {}).get("record")
+        if not record:
+            return  # DELETE
+        self.change_count += 1
+        try:
+            self._on_change(record)
+        except Exception:
+            logger.exception("Error handling report change", extra={"report_id": record.get("id")})
+
+    def _handle_state(self, state, error: Optional[Exception]):
+        if str(getattr(state, "value", state)) == "SUBSCRIBED":
+            self.connected = True
+            logger.info("Report change feed subscribed")
+            return
+        logger.warning("Report change feed channel state changed", extra={"state": str(getattr(state, "value", state)), "error": repr(error)})
+        self._broken.set()
+
+    async def _run(self):
+        # realtime(websockets) import는 느리므로 시작 후 백그라운드에서 수행
+        from realtime import AsyncRealtimeClient, RealtimePostgresChangesListenEvent
+
+        backoff = self.initial_backoff
+        while True:
+            client = AsyncRealtimeClient(f"{self.url}/realtime/v1", token=self.key, max_retries=3, initial_backoff=self.initial_backoff)
+            self._broken = asyncio.Event()
+            try:
+                await client.connect()
+                channel = client.channel("badacall-reports")
+                channel.on_postgres_changes(
+                    RealtimePostgresChangesListenEvent.All,
+                    self._handle_change,
+                    table="reports",
+                    schema="public"
+                )
+                await channel.subscribe(self._handle_state)
+                backoff = self.initial_backoff
+
+                # 채널 오류가 나거나 라이브러리의 자동 재연결이 포기하면 다시 연결
+                while client.is_connected and not self._broken.is_set():
+                    waiter = asyncio.ensure_future(self._broken.wait())
+                    try:
+                        await asyncio.wait({waiter}, timeout=self.check_interval)
+                    finally:
+                        waiter.cancel()
+                logger.warning("Report change feed disconnected")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Report change feed connection failed", extra={"retry_in_seconds": round(backoff, 1), "error": repr(e)})
+            finally:
+                self.connected = False
+                try:
+                    await client.close()
+                except Exception:
+                    pass
+
+            self.reconnect_count += 1
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def close(self):
+        """변경 수신 중지"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> dict:
+        """변경 수신 메트릭 조회"""
+        return {
+            "enabled": self._task is not None,
+            "connected": self.connected,
+            "change_count": self.change_count,
+            "reconnect_count": self.reconnect_count
+        }
+
+report_change_feed = ReportChangeFeed(
+    url=settings.supabase_url if settings.report_realtime_enabled else "",
+    key=settings.supabase_anon_key,
+    initial_backoff=settings.report_replay_initial_backoff_seconds,
+    max_backoff=settings.report_replay_max_backoff_seconds
+)
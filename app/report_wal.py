@@ -0,0 +1,351 @@
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.config import settings
+from app.log import get_logger
+from app.tracing import start_span
+
+logger = get_logger(__name__)
+
+class ReportWriteAheadLog:
+    """
+    신고를 DB에 저장하기 전에 로컬 디스크에 먼저 기록하는 append-only 로그
+
+    신고는 세그먼트 파일(report-000001.log ...)에 JSON 한 줄로 추가되고, 짧은 주기로
+    모아서 fsync한 뒤에 접수 완료로 응답합니다. DB 저장이 확인되면 commit 레코드를 남기며,
+    commit되지 않은 신고는 백그라운드에서 백오프하며 DB로 다시 전송합니다.
+    모든 신고가 commit된 이전 세그먼트는 삭제됩니다.
+
+    요청 처리 중인 신고와 겹치지 않도록, 새 신고는 replay_grace 초가 지나거나
+    retry_soon()이 호출된 뒤에만 재전송 대상이 됩니다. 재전송에 실패한 신고는 신고마다
+    따로 백오프하므로 계속 실패하는 신고가 다른 신고의 재전송을 막지 않으며, 다시 보내도
+    성공할 수 없는 오류(잘못된 데이터 등)의 신고는 dead-letter 파일로 옮깁니다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int,
+        fsync_interval: float,
+        replay_grace: float,
+        initial_backoff: float,
+        max_backoff: float
+    ):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_interval = fsync_interval
+        self.replay_grace = replay_grace
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self._file = None
+        self._segment_index = 0
+        self._segment_size = 0
+        self._pending: Dict[str, list] = {}  # report_id → [세그먼트 번호, 신고 데이터, 재전송 가능 시각, 재전송 실패 횟수]
+        self._segment_pending: Dict[int, int] = {}  # 세그먼트 번호 → commit되지 않은 신고 수
+        self._sync_waiters: List[asyncio.Future] = []
+        self._sync_task: Optional[asyncio.Task] = None
+        self._replay_wakeup: Optional[asyncio.Event] = None
+        self._replay_task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.appended_count = 0
+        self.replayed_count = 0
+        self.replay_failure_count = 0
+        self.dead_letter_count = 0
+        self.last_sync_error: Optional[str] = None
+
+    @property
+    def writable(self) -> bool:
+        """새 신고를 기록하고 fsync할 수 있는지 (열려 있고 마지막 fsync가 성공한 경우)"""
+        return self._file is not None and not self._file.closed and self.last_sync_error is None
+
+    @property
+    def pending_count(self) -> int:
+        """DB에 아직 저장되지 않은 신고 수"""
+        return len(self._pending)
+
+    @property
+    def dead_letter_path(self) -> str:
+        """재전송을 포기한 신고를 보관하는 파일 (운영자가 확인 후 처리)"""
+        return os.path.join(self.directory, "dead-letter.log")
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"report-{index:06d}.log")
+
+    def _segment_indexes(self) -> List[int]:
+        indexes = []
+        for name in os.listdir(self.directory):
+            if name.startswith("report-") and name.endswith(".log"):
+                indexes.append(int(name[len("report-"):-len(".log")]))
+        return sorted(indexes)
+
+    def open(self):
+        """기존 세그먼트에서 commit되지 않은 신고를 복구하고 새 세그먼트 열기"""
+        if self._file is not None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        indexes = self._segment_indexes()
+        for index in indexes:
+            with open(self._segment_path(index), "r", encoding="utf-8") as segment:
+                for line in segment:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 중단된 마지막 줄은 응답하지 않은 신고이므로 무시
+                        continue
+                    if entry["op"] == "report":
+                        self._track(entry["id"], index, entry["data"], ready_at=0.0)
+                    elif entry["op"] == "commit":
+                        self._untrack(entry["id"])
+
+        for index in indexes:
+            if not self._segment_pending.get(index):
+                self._remove_segment(index)
+
+        if self._pending:
+            logger.info(f"📝 복구된 미전송 신고: {len(self._pending)}건", extra={"pending": len(self._pending)})
+
+        if os.path.exists(self.dead_letter_path):
+            with open(self.dead_letter_path, "r", encoding="utf-8") as dead_letters:
+                self.dead_letter_count = sum(1 for line in dead_letters if line.strip())
+            if self.dead_letter_count:
+                logger.warning("Report dead letters waiting for an operator", extra={"dead_letter_count": self.dead_letter_count, "path": self.dead_letter_path})
+
+        self._segment_index = (indexes[-1] if indexes else 0) + 1
+        self._open_segment()
+
+    def _open_segment(self):
+        self._file = open(self._segment_path(self._segment_index), "a", encoding="utf-8")
+        self._segment_size = 0
+
+    def _track(self, report_id: str, index: int, data: dict, ready_at: float):
+        if report_id in self._pending:
+            return
+        self._pending[report_id] = [index, data, ready_at, 0]
+        self._segment_pending[index] = self._segment_pending.get(index, 0) + 1
+
+    def _untrack(self, report_id: str) -> Optional[int]:
+        entry = self._pending.pop(report_id, None)
+        if entry is None:
+            return None
+        index = entry[0]
+        self._segment_pending[index] -= 1
+        return index
+
+    def _remove_segment(self, index: int):
+        self._segment_pending.pop(index, None)
+        try:
+            os.remove(self._segment_path(index))
+        except FileNotFoundError:
+            pass
+
+    def _write(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        self._file.write(line)
+        self._segment_size += len(line)
+
+    async def append(self, report: dict):
+        """신고를 로그에 기록하고 디스크에 fsync될 때까지 대기"""
+        self.open()
+        self._write({"op": "report", "id": report["id"], "data": report})
+        self._track(report["id"], self._segment_index, report, ready_at=time.monotonic() + self.replay_grace)
+        self.appended_count += 1
+
+        future = asyncio.get_running_loop().create_future()
+        self._sync_waiters.append(future)
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_after_interval())
+        await future
+
+    def retry_soon(self, report_id: str):
+        """DB 저장에 실패한 신고를 바로 재전송 대상으로 표시"""
+        entry = self._pending.get(report_id)
+        if entry is None:
+            return
+        entry[2] = 0.0
+        if self._replay_wakeup is not None:
+            self._replay_wakeup.set()
+
+    async def _sync_after_interval(self):
+        """
+        fsync_interval 동안 모인 기록을 한 번의 fsync로 디스크에 반영 (group commit)
+
+        fsync와 세그먼트 교체가 끝날 때까지 _sync_task를 유지하여 동기화가 동시에 두 개 실행되지
+        않도록 하고 (닫힌 파일을 fsync하지 않도록), 그동안 추가된 기록은 이어서 한 번 더 동기화합니다.
+        """
+        await asyncio.sleep(self.fsync_interval)
+        try:
+            while self._sync_waiters:
+                waiters, self._sync_waiters = self._sync_waiters, []
+                try:
+                    self._file.flush()
+                    await asyncio.get_running_loop().run_in_executor(None, os.fsync, self._file.fileno())
+                    if self._segment_size >= self.segment_max_bytes:
+                        await self._rotate()
+                except Exception as e:
+                    self.last_sync_error = repr(e)
+                    logger.error("Report WAL sync failed", extra={"error": repr(e), "path": self.directory})
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                    continue
+
+                self.last_sync_error = None
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            self._sync_task = None
+
+    async def _rotate(self):
+        """새 세그먼트로 바꾸고 이전 세그먼트를 fsync한 뒤 닫음 (fsync는 스레드 풀에서 실행)"""
+        # 새 기록이 바로 새 세그먼트로 가도록 먼저 교체하고, 이전 세그먼트에 남은 기록은 닫기 전에 반영
+        previous_file, previous = self._file, self._segment_index
+        previous_file.flush()
+        self._segment_index += 1
+        self._open_segment()
+
+        def sync_and_close():
+            try:
+                os.fsync(previous_file.fileno())
+            finally:
+                previous_file.close()
+
+        await asyncio.get_running_loop().run_in_executor(None, sync_and_close)
+        if not self._segment_pending.get(previous):
+            self._remove_segment(previous)
+
+    def commit(self, report_id: str):
+        """DB 저장이 확인된 신고 표시 (commit 레코드는 fsync하지 않음 - 재전송은 이미 저장된 신고를 건너뜀)"""
+        index = self._untrack(report_id)
+        if index is None:
+            return
+        self._write({"op": "commit", "id": report_id})
+        if index != self._segment_index and not self._segment_pending.get(index):
+            self._remove_segment(index)
+
+    def discard(self, report_id: str):
+        """접수하지 않기로 한 신고를 재전송 대상에서 제외 (요청에 오류로 응답한 경우)"""
+        self.commit(report_id)
+
+    def dead_letter(self, report_id: str, error: BaseException):
+        """다시 보내도 성공할 수 없는 신고를 dead-letter 파일로 옮기고 재전송 대상에서 제외"""
+        entry = self._pending.get(report_id)
+        if entry is None:
+            return
+        line = json.dumps(
+            {"id": report_id, "error": repr(error), "failed_at": time.time(), "data": entry[1]},
+            ensure_ascii=False,
+            default=str
+        )
+        # 세그먼트에서 지우기 전에 dead-letter 기록이 디스크에 남아야 하므로 바로 fsync
+        with open(self.dead_letter_path, "a", encoding="utf-8") as dead_letters:
+            dead_letters.write(line + "\n")
+            dead_letters.flush()
+            os.fsync(dead_letters.fileno())
+        self.dead_letter_count += 1
+        self.commit(report_id)
+        logger.error("Report moved to dead letters", extra={"report_id": report_id, "error": repr(error), "path": self.dead_letter_path})
+
+    def start_replayer(
+        self,
+        write: Callable[[dict], Awaitable[Optional[dict]]],
+        on_written: Optional[Callable[[dict], None]] = None,
+        is_permanent: Optional[Callable[[BaseException], bool]] = None
+    ):
+        """
+        commit되지 않은 신고를 DB로 다시 전송하는 백그라운드 태스크 시작
+
+        write가 None을 반환하면 이미 DB에 있던 신고로 보고 commit만 합니다.
+        is_permanent(오류)가 True인 실패는 재시도하지 않고 dead-letter로 옮깁니다.
+        """
+        self.open()
+        if self._replay_task is not None:
+            return
+        self._replay_wakeup = asyncio.Event()
+        self._replay_task = asyncio.create_task(self._replay_loop(write, on_written, is_permanent))
+
+    async def _wait_for_wakeup(self, timeout: float):
+        # wait_for는 깨우기와 취소가 겹치면 취소를 삼킬 수 있어 wait로 대기
+        self._replay_wakeup.clear()
+        waiter = asyncio.ensure_future(self._replay_wakeup.wait())
+        try:
+            await asyncio.wait({waiter}, timeout=timeout)
+        finally:
+            waiter.cancel()
+
+    async def _replay_loop(self, write, on_written, is_permanent):
+        while True:
+            if not self._pending:
+                await self._wait_for_wakeup(self.replay_grace)
+                continue
+
+            report_id, entry = min(self._pending.items(), key=lambda item: item[1][2])
+            delay = entry[2] - time.monotonic()
+            if delay > 0:
+                await self._wait_for_wakeup(delay)
+                continue
+
+            try:
+                with start_span("report_wal.replay", root=True, report_id=report_id, pending=len(self._pending), attempt=entry[3] + 1):
+                    saved = await write(entry[1])
+            except Exception as e:
+                if is_permanent is not None and is_permanent(e):
+                    self.dead_letter(report_id, e)
+                    continue
+
+                # 실패한 신고만 뒤로 미루어 다른 신고는 계속 재전송
+                self.replay_failure_count += 1
+                entry[3] += 1
+                backoff = min(self.initial_backoff * 2 ** (entry[3] - 1), self.max_backoff)
+                entry[2] = time.monotonic() + backoff * random.uniform(0.5, 1.0)
+                logger.warning("Report replay failed", extra={"report_id": report_id, "attempt": entry[3], "pending": len(self._pending), "retry_in_seconds": round(backoff, 1), "error": repr(e)})
+                continue
+
+            self.commit(report_id)
+            self.replayed_count += 1
+            if saved is not None and on_written is not None:
+                on_written(saved)
+
+    async def close(self):
+        """재전송 태스크를 멈추고 남은 기록을 디스크에 반영"""
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            try:
+                await self._replay_task
+            except asyncio.CancelledError:
+                pass
+            self._replay_task = None
+
+        if self._sync_task is not None:
+            await self._sync_task
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> dict:
+        """로그 메트릭 조회"""
+        return {
+            "pending_count": self.pending_count,
+            "segment_count": len(self._segment_pending) + (0 if self._segment_index in self._segment_pending else 1),
+            "appended_count": self.appended_count,
+            "replayed_count": self.replayed_count,
+            "replay_failure_count": self.replay_failure_count,
+            "dead_letter_count": self.dead_letter_count
+        }
+
+report_wal = ReportWriteAheadLog(
+    directory=settings.report_wal_dir,
+    segment_max_bytes=settings.report_wal_segment_max_bytes,
+    fsync_interval=settings.report_wal_fsync_interval_ms / 1000,
+    replay_grace=settings.report_insert_timeout_seconds + 1,
+    initial_backoff=settings.report_replay_initial_backoff_seconds,
+    max_backoff=settings.report_replay_max_backoff_seconds
+)
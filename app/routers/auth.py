@@ -1,13 +1,17 @@
 from datetime import timedelta
 from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.models import UserRegister, UserLogin, Token, User
 from app.auth import (
     authenticate_user,
     create_access_token,
     create_user,
+    get_user_by_id,
     get_user_by_phone,
     get_current_user,
+    revoke_token,
+    security,
+    user_claims,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
@@ -38,7 +42,7 @@ async def register(user_data: UserRegister):
     # JWT 토큰 생성
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user["id"])},
+        data=user_claims(user),
         expires_delta=access_token_expires
     )
 
@@ -66,7 +70,7 @@ async def login(user_credentials: UserLogin):
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user["id"])},
+        data=user_claims(user),
         expires_delta=access_token_expires
     )
 
@@ -94,20 +98,46 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     )
 
 @router.post("/refresh", response_model=Token, summary="토큰 갱신")
-async def refresh_token(current_user: dict = Depends(get_current_user)):
+async def refresh_token(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """
-    JWT 토큰을 갱신합니다.
+    JWT 토큰을 갱신합니다. 사용자를 DB에서 다시 확인하고, 기존 토큰은 폐기합니다.
 
     **인증이 필요한 엔드포인트입니다.**
     """
+    # JWT_STATELESS 모드의 current_user는 토큰 클레임이므로, 삭제된 사용자가 계속 갱신하지 못하도록 DB에서 확인
+    user = await get_user_by_id(str(current_user["id"]))
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="사용자를 찾을 수 없습니다",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    revoke_token(credentials.credentials)
+
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(current_user["id"])},
+        data=user_claims(user),
         expires_delta=access_token_expires
     )
 
     return Token(
         access_token=access_token,
         token_type="bearer",
-        user_id=str(current_user["id"])
-    )
\ No newline at end of file
+        user_id=str(user["id"])
+    )
+
+@router.post("/logout", summary="로그아웃")
+async def logout(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    현재 토큰을 폐기합니다. 폐기된 토큰은 만료 시각까지 사용할 수 없습니다.
+
+    **인증이 필요한 엔드포인트입니다.**
+    """
+    revoke_token(credentials.credentials)
+    return {"message": "로그아웃되었습니다"}
@@ -1,16 +1,102 @@
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from app.models import (
+    ExportFormat,
     LocationUpdate,
-    LocationResponse
+    LocationResponse,
+    NearbyVessel
 )
 # from app.auth import get_current_user  # 더 이상 필요 없음
 import uuid
-from app.database import supabase
+import numpy as np
+from app.cache import TTLCache
+from app.config import settings
+from app.database import supabase, execute
+from app.geo import simplify_track
+from app.location_buffer import location_buffer
+from app.pagination import apply_keyset, next_cursor
+from app.spatial import VesselIndex
+from app.track_export import MEDIA_TYPES, content_disposition, stream_track
+from app.log import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/location", tags=["위치 관리"])
 
+# 기기별 최신 위치 캐시 - /location/current 조회 시 DB 접근 없이 응답
+latest_locations = TTLCache(
+    max_entries=settings.location_cache_max_entries,
+    ttl_seconds=settings.location_cache_ttl_seconds
+)
+
+# 기기별 최신 위치 공간 인덱스 - 주변 선박 검색용
+vessel_index = VesselIndex()
+
+def _parse_timestamp(value) -> datetime:
+    """기기가 보낸 위치 시각을 datetime으로 변환 (ISO 8601 형식이 아니면 ValueError)"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"timestamp는 ISO 8601 형식이어야 합니다: {value!r}")
+
+def _build_location_insert_data(location_data: LocationUpdate) -> dict:
+    """
+    LocationUpdate를 locations 테이블 insert 데이터로 변환
+
+    잘못된 값이 여러 기기의 위치를 모은 bulk insert 전체를 실패시키지 않도록 버퍼에 넣기 전에 검증하며,
+    bulk insert 결과를 요청과 짝지을 수 있도록 id를 미리 생성합니다.
+    """
+    if location_data.timestamp:
+        timestamp = _parse_timestamp(location_data.timestamp).isoformat()
+    else:
+        timestamp = datetime.utcnow().isoformat()
+
+    # 위치 데이터 준비 - user_id 없이 간단하게
+    return {
+        "id": str(uuid.uuid4()),
+        "device_id": location_data.device_id,
+        "latitude": location_data.latitude,
+        "longitude": location_data.longitude,
+        "accuracy": location_data.accuracy,
+        "altitude": location_data.altitude,
+        "speed": location_data.speed,
+        "heading": location_data.heading,
+        "timestamp": timestamp
+    }
+
+def _to_location_response(location: dict) -> LocationResponse:
+    """locations 테이블 행을 LocationResponse로 변환"""
+    return LocationResponse(
+        id=str(location["id"]),
+        device_id=str(location["device_id"]),
+        latitude=location["latitude"],
+        longitude=location["longitude"],
+        accuracy=location.get("accuracy"),
+        altitude=location.get("altitude"),
+        speed=location.get("speed"),
+        heading=location.get("heading"),
+        timestamp=location["timestamp"]
+    )
+
+def _as_utc(value: datetime) -> datetime:
+    """timezone 정보가 없는 시간은 UTC로 간주"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def _remember_latest(location: LocationResponse):
+    """기존 캐시보다 최신 위치일 때만 최신 위치 캐시와 공간 인덱스 갱신"""
+    cached = latest_locations.get(location.device_id)
+    if cached is not None and _as_utc(cached.timestamp) > _as_utc(location.timestamp):
+        return
+    latest_locations.set(location.device_id, location)
+    vessel_index.update(location.device_id, location.latitude, location.longitude, _as_utc(location.timestamp))
+
 @router.post("/update", response_model=LocationResponse, summary="GPS 위치 업데이트")
 async def update_location(
     location_data: LocationUpdate
@@ -28,60 +114,131 @@ async def update_location(
     - **speed**: 속도 (m/s, 선택사항)
     - **heading**: 방향 (도, 선택사항)
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
     try:
-        # 간단한 timestamp 처리
-        timestamp = datetime.utcnow().isoformat()
-        if location_data.timestamp:
-            if isinstance(location_data.timestamp, str):
-                timestamp = location_data.timestamp
-            else:
-                timestamp = location_data.timestamp.isoformat()
-
-        # 위치 데이터 준비 - user_id 없이 간단하게
-        location_insert_data = {
-            "device_id": location_data.device_id,
-            "latitude": location_data.latitude,
-            "longitude": location_data.longitude,
-            "accuracy": location_data.accuracy,
-            "altitude": location_data.altitude,
-            "speed": location_data.speed,
-            "heading": location_data.heading,
-            "timestamp": timestamp
-        }
+        location_insert_data = _build_location_insert_data(location_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
-        # 데이터베이스에 위치 저장
-        response = supabase.table("locations").insert(location_insert_data).execute()
+    try:
+        # 버퍼에 추가 - 여러 기기의 업데이트가 하나의 bulk insert로 저장됨
+        location = await location_buffer.add(location_insert_data)
+        location_response = _to_location_response(location)
+        _remember_latest(location_response)
+        return location_response
 
-        if response.data:
-            location = response.data[0]
-            return LocationResponse(
-                id=str(location["id"]),
-                device_id=str(location["device_id"]),
-                latitude=location["latitude"],
-                longitude=location["longitude"],
-                accuracy=location.get("accuracy"),
-                altitude=location.get("altitude"),
-                speed=location.get("speed"),
-                heading=location.get("heading"),
-                timestamp=location["timestamp"]
-            )
-        else:
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"위치 업데이트 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@router.post("/batch", response_model=List[LocationResponse], summary="GPS 위치 일괄 업데이트")
+async def update_location_batch(
+    locations_data: List[LocationUpdate]
+):
+    """
+    여러 개의 GPS 위치를 한 번에 저장합니다.
+
+    **인증이 필요하지 않은 엔드포인트입니다.**
+
+    - 요청 본문은 `LocationUpdate` 객체의 배열입니다
+    - 최대 `LOCATION_BATCH_SIZE`개까지 한 번의 insert로 저장됩니다
+    """
+    if not supabase:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="데이터베이스 연결이 필요합니다."
+        )
+
+    if not locations_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="저장할 위치가 없습니다"
+        )
+
+    if len(locations_data) > settings.location_batch_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"한 번에 최대 {settings.location_batch_size}개까지 저장할 수 있습니다"
+        )
+
+    try:
+        locations_insert_data = [_build_location_insert_data(location) for location in locations_data]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    try:
+        response = await execute(supabase.table("locations").insert(locations_insert_data))
+
+        if not response.data:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="위치 저장에 실패했습니다"
             )
 
+        locations = [_to_location_response(location) for location in response.data]
+        for location in locations:
+            _remember_latest(location)
+        return locations
+
+    except HTTPException:
+        raise
     except Exception as e:
+        logger.exception("Error saving location batch")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"위치 업데이트 중 오류가 발생했습니다: {str(e)}"
+            detail=f"위치 일괄 업데이트 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@router.get("/buffer/stats", summary="위치 쓰기 버퍼 통계")
+async def get_location_buffer_stats():
+    """
+    위치 쓰기 버퍼의 상태를 조회합니다.
+
+    - 대기 중인 행 수 (queue_depth)
+    - flush 횟수, 실패 횟수, 저장된 행 수
+    - flush 지연 시간 (마지막/최대/평균, ms)
+    """
+    return location_buffer.stats()
+
+@router.get("/nearby", response_model=List[NearbyVessel], summary="주변 선박 조회")
+async def get_nearby_vessels(
+    lat: float = Query(..., ge=-90, le=90, description="위도"),
+    lon: float = Query(..., ge=-180, le=180, description="경도"),
+    radius_km: float = Query(default=20, gt=0, le=500, description="검색 반경 (km)"),
+    limit: int = Query(default=10, ge=1, le=100, description="최대 선박 수"),
+    exclude_device_id: Optional[str] = Query(default=None, description="결과에서 제외할 기기 ID (신고 기기 등)")
+):
+    """
+    지정한 좌표에서 가까운 선박을 거리순으로 조회합니다.
+
+    구조 협조용 엔드포인트로, 서버 메모리의 공간 인덱스만 사용하므로 DB를 조회하지 않습니다.
+    최근 `NEARBY_MAX_AGE_MINUTES`분 이내에 위치를 보낸 선박만 포함됩니다.
+    """
+    since = datetime.now(timezone.utc) - timedelta(minutes=settings.nearby_max_age_minutes)
+    vessels = vessel_index.nearby(lat, lon, radius_km, limit, since=since, exclude_device_id=exclude_device_id)
+    return [
+        NearbyVessel(
+            device_id=device_id,
+            latitude=latitude,
+            longitude=longitude,
+            distance_km=round(distance, 3),
+            timestamp=timestamp
         )
+        for distance, device_id, latitude, longitude, timestamp in vessels
+    ]
 
 @router.get("/current", response_model=LocationResponse, summary="현재 위치 조회")
 async def get_current_location(
@@ -89,8 +246,14 @@ async def get_current_location(
 ):
     """
     사용자의 최신 위치를 조회합니다.
+
+    최근에 저장된 위치는 캐시에서 바로 응답하고, 캐시에 없을 때만 DB를 조회합니다.
     """
-    if supabase is None:
+    cached = latest_locations.get(device_id)
+    if cached is not None:
+        return cached
+
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
@@ -98,12 +261,13 @@ async def get_current_location(
 
     try:
         # 최신 위치 조회 (시간순 정렬)
-        response = supabase.table("locations")\
-            .select("*")\
-            .eq("device_id", device_id)\
-            .order("timestamp", desc=True)\
-            .limit(1)\
-            .execute()
+        response = await execute(
+            supabase.table("locations")
+            .select("*")
+            .eq("device_id", device_id)
+            .order("timestamp", desc=True)
+            .limit(1)
+        )
 
         if not response.data:
             raise HTTPException(
@@ -111,78 +275,200 @@ async def get_current_location(
                 detail="위치 정보를 찾을 수 없습니다"
             )
 
-        location = response.data[0]
-        return LocationResponse(
-            id=str(location["id"]),
-            device_id=str(location["device_id"]),
-            latitude=location["latitude"],
-            longitude=location["longitude"],
-            accuracy=location.get("accuracy"),
-            altitude=location.get("altitude"),
-            speed=location.get("speed"),
-            heading=location.get("heading"),
-            timestamp=location["timestamp"]
-        )
+        location = _to_location_response(response.data[0])
+        _remember_latest(location)
+        return location
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error fetching current location: {e}")
+    except Exception:
+        logger.exception("Error fetching current location", extra={"device_id": device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="현재 위치 조회 중 오류가 발생했습니다"
         )
 
+async def _iter_location_chunks(
+    device_id: str,
+    start: Optional[datetime],
+    end: Optional[datetime]
+):
+    """기기의 위치를 시간순으로 EXPORT_CHUNK_SIZE개씩 읽기 ((timestamp, id) keyset)"""
+    chunk_size = settings.export_chunk_size
+    cursor = None
+    while True:
+        query = supabase.table("locations").select("*").eq("device_id", device_id)
+        if start:
+            query = query.gte("timestamp", start.isoformat())
+        if end:
+            query = query.lte("timestamp", end.isoformat())
+
+        response = await execute(apply_keyset(query, "timestamp", cursor, desc=False).limit(chunk_size))
+        if response.data:
+            yield response.data
+
+        cursor = next_cursor(response.data, "timestamp", chunk_size)
+        if cursor is None:
+            return
+
+async def _simplified_history(
+    device_id: str,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    tolerance_m: Optional[float],
+    max_points: Optional[int]
+) -> List[LocationResponse]:
+    """기간 내 전체 트랙을 읽어 단순화한 위치 목록 (최신순)"""
+    latitudes, longitudes, rows = [], [], []
+    async for chunk in _iter_location_chunks(device_id, start, end):
+        for location in chunk:
+            latitudes.append(location["latitude"])
+            longitudes.append(location["longitude"])
+            rows.append((
+                location["id"], location["device_id"], location["timestamp"], location.get("accuracy"),
+                location.get("altitude"), location.get("speed"), location.get("heading")
+            ))
+
+        if len(rows) > settings.track_simplify_max_source_points:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"단순화할 위치가 {settings.track_simplify_max_source_points}개를 넘습니다. start/end로 기간을 좁혀주세요."
+            )
+
+    # 잡음이 많은 트랙은 수만 개 점에서 1초 가까이 걸리므로 응답 객체 생성까지 이벤트 루프 밖에서 실행
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _simplify_rows, latitudes, longitudes, rows, tolerance_m, max_points)
+
+def _simplify_rows(
+    latitudes: List[float],
+    longitudes: List[float],
+    rows: List[tuple],
+    tolerance_m: Optional[float],
+    max_points: Optional[int]
+) -> List[LocationResponse]:
+    """트랙을 단순화하고 남은 위치를 최신순 LocationResponse로 변환"""
+    indices = simplify_track(np.array(latitudes), np.array(longitudes), tolerance_m, max_points)
+
+    locations = []
+    for index in indices[::-1]:
+        location_id, location_device_id, timestamp, accuracy, altitude, speed, heading = rows[index]
+        locations.append(LocationResponse(
+            id=str(location_id),
+            device_id=str(location_device_id),
+            latitude=latitudes[index],
+            longitude=longitudes[index],
+            accuracy=accuracy,
+            altitude=altitude,
+            speed=speed,
+            heading=heading,
+            timestamp=timestamp
+        ))
+    return locations
+
 @router.get("/history", response_model=List[LocationResponse], summary="위치 이력 조회")
 async def get_location_history(
+    http_response: Response,
     device_id: str,
     limit: int = Query(default=20, ge=1, le=100, description="조회할 개수 (1-100)"),
-    offset: int = Query(default=0, ge=0, description="건너뛸 개수")
+    offset: int = Query(default=0, ge=0, description="건너뛸 개수 (cursor 사용 시 무시)"),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 X-Next-Cursor 값"),
+    start: Optional[datetime] = Query(default=None, description="시작 시간 (선택사항)"),
+    end: Optional[datetime] = Query(default=None, description="종료 시간 (선택사항)"),
+    tolerance_m: Optional[float] = Query(default=None, gt=0, description="트랙 단순화 허용 오차 (미터)"),
+    max_points: Optional[int] = Query(default=None, ge=2, le=10000, description="트랙 단순화 후 최대 점 개수")
 ):
     """
     사용자의 위치 이력을 조회합니다.
 
     - **limit**: 조회할 개수 (기본값: 20, 최대: 100)
-    - **offset**: 건너뛸 개수 (기본값: 0)
+    - **cursor**: 다음 페이지 커서 (응답 헤더 `X-Next-Cursor`, 마지막 페이지면 없음)
+    - **offset**: 건너뛸 개수 (기본값: 0, 하위 호환용 - cursor 사용 권장)
+    - **start** / **end**: 조회할 시간 범위 (선택사항)
+
+    **tolerance_m** 또는 **max_points**를 지정하면 기간 내 전체 트랙을 서버에서 단순화
+    (Douglas-Peucker)하여 한 번에 반환합니다. 이때 limit/offset/cursor는 무시됩니다.
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
     try:
-        # 위치 이력 조회 (최신순)
-        response = supabase.table("locations")\
-            .select("*")\
-            .eq("device_id", device_id)\
-            .order("timestamp", desc=True)\
-            .range(offset, offset + limit - 1)\
-            .execute()
+        if tolerance_m is not None or max_points is not None:
+            return await _simplified_history(device_id, start, end, tolerance_m, max_points)
+
+        # 위치 이력 조회 (최신순, (timestamp, id) keyset)
+        query = supabase.table("locations").select("*").eq("device_id", device_id)
+        if start:
+            query = query.gte("timestamp", start.isoformat())
+        if end:
+            query = query.lte("timestamp", end.isoformat())
+
+        query = apply_keyset(query, "timestamp", cursor)
+        if cursor is None and offset:
+            query = query.range(offset, offset + limit - 1)
+        else:
+            query = query.limit(limit)
+
+        response = await execute(query)
+
+        cursor_value = next_cursor(response.data, "timestamp", limit)
+        if cursor_value:
+            http_response.headers["X-Next-Cursor"] = cursor_value
 
         locations = []
         for location in response.data:
-            locations.append(LocationResponse(
-                id=str(location["id"]),
-                device_id=str(location["device_id"]),
-                latitude=location["latitude"],
-                longitude=location["longitude"],
-                accuracy=location.get("accuracy"),
-                altitude=location.get("altitude"),
-                speed=location.get("speed"),
-                heading=location.get("heading"),
-                timestamp=location["timestamp"]
-            ))
+            locations.append(_to_location_response(location))
 
         return locations
 
-    except Exception as e:
-        print(f"Error fetching location history: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching location history", extra={"device_id": device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="위치 이력 조회 중 오류가 발생했습니다"
         )
 
+@router.get("/export", summary="위치 이력 내보내기")
+async def export_location_history(
+    device_id: str,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON, description="내보내기 형식 (ndjson, csv, gpx)"),
+    start: Optional[datetime] = Query(default=None, description="시작 시간 (선택사항)"),
+    end: Optional[datetime] = Query(default=None, description="종료 시간 (선택사항)")
+):
+    """
+    기기의 전체 위치 이력을 시간순으로 스트리밍합니다.
+
+    DB에서 일정 크기씩 나눠 읽으며 바로 전송하므로 이력이 길어도 서버 메모리 사용량이 일정합니다.
+
+    - **format**: ndjson (기본값), csv, gpx
+    - **start** / **end**: 조회할 시간 범위 (선택사항)
+    """
+    if not supabase:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="데이터베이스 연결이 필요합니다."
+        )
+
+    async def body():
+        try:
+            async for chunk in stream_track(_iter_location_chunks(device_id, start, end), format.value, device_id):
+                yield chunk
+        except Exception:
+            # 응답이 이미 시작되었으므로 상태 코드를 바꿀 수 없음 - 스트림 중단
+            logger.exception("Error exporting location history", extra={"device_id": device_id})
+            raise
+
+    filename = f"{device_id}-track.{format.value}"
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format.value],
+        headers={"Content-Disposition": content_disposition(filename)}
+    )
+
 @router.post("/test", summary="위치 테스트")
 async def test_location_update(
     device_id: str,
@@ -192,7 +478,7 @@ async def test_location_update(
     """
     간단한 위치 테스트 API
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
@@ -207,7 +493,7 @@ async def test_location_update(
             "timestamp": datetime.utcnow().isoformat()
         }
 
-        response = supabase.table("locations").insert(test_data).execute()
+        response = await execute(supabase.table("locations").insert(test_data))
 
         if response.data:
             return {"success": True, "data": response.data[0]}
@@ -224,11 +510,17 @@ async def get_location_stats(
     """
     사용자의 위치 통계 정보를 조회합니다.
 
+    통계는 위치가 저장될 때마다 DB 트리거로 갱신되는 `device_location_stats`에서
+    한 행만 읽으므로 이력 크기와 관계없이 일정한 시간에 응답합니다.
+
     - 총 위치 기록 수
     - 첫 기록 시간
     - 마지막 기록 시간
+    - 이동 거리 (km)
+    - 최고 속도 (m/s)
+    - 활동 시간 (10분 이내 간격으로 기록된 구간의 합, 시간)
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
@@ -236,33 +528,35 @@ async def get_location_stats(
 
     try:
         # 통계 조회
-        response = supabase.table("locations")\
-            .select("id, timestamp")\
-            .eq("device_id", device_id)\
-            .order("timestamp", desc=False)\
-            .execute()
-
-        total_count = len(response.data)
+        response = await execute(
+            supabase.table("device_location_stats")
+            .select("*")
+            .eq("device_id", device_id)
+        )
 
-        if total_count == 0:
+        if not response.data or not response.data[0]["total_count"]:
             return {
                 "total_count": 0,
                 "first_record": None,
-                "last_record": None
+                "last_record": None,
+                "distance_km": 0.0,
+                "max_speed": None,
+                "active_hours": 0.0
             }
 
-        first_record = response.data[0]["timestamp"]
-        last_record = response.data[-1]["timestamp"]
-
+        stats = response.data[0]
         return {
-            "total_count": total_count,
-            "first_record": first_record,
-            "last_record": last_record
+            "total_count": stats["total_count"],
+            "first_record": stats["first_record"],
+            "last_record": stats["last_record"],
+            "distance_km": round(stats["distance_km"], 3),
+            "max_speed": stats.get("max_speed"),
+            "active_hours": round(stats["active_seconds"] / 3600, 3)
         }
 
-    except Exception as e:
-        print(f"Error fetching location stats: {e}")
+    except Exception:
+        logger.exception("Error fetching location stats", extra={"device_id": device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="위치 통계 조회 중 오류가 발생했습니다"
-        )
\ No newline at end of file
+        )
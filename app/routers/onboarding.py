@@ -1,11 +1,34 @@
 from fastapi import APIRouter, HTTPException, status
-from app.models import OnboardingData, OnboardingResponse, UserProfile, EmergencyContact
-from app.database import supabase
-from datetime import datetime
-import uuid
+from app.models import OnboardingData, OnboardingResponse, UserProfile
+from app.database import supabase, execute
+from app.devices import remember_device
+from app.log import get_logger
+from app.profiles import device_profiles, forget_profile, get_device_profile, remember_profile, to_user_profile
+from typing import Optional
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/onboarding", tags=["온보딩"])
 
+def _profile_params(data: OnboardingData, device_id: Optional[str] = None) -> dict:
+    """onboard_device / update_device_profile RPC 인자"""
+    contacts = [
+        {"name": name, "phone": phone}
+        for name, phone in (
+            (data.emergency_contact_1_name, data.emergency_contact_1_phone),
+            (data.emergency_contact_2_name, data.emergency_contact_2_phone)
+        )
+        if name and phone
+    ]
+    return {
+        "p_device_id": device_id or data.device_id,
+        "p_name": data.name,
+        "p_phone": data.phone,
+        "p_boat_name": data.boat_name,
+        "p_boat_number": data.boat_number,
+        "p_contacts": contacts
+    }
+
 @router.post("/setup", response_model=OnboardingResponse, summary="온보딩 정보 설정")
 async def setup_onboarding(onboarding_data: OnboardingData):
     """
@@ -20,76 +43,44 @@ async def setup_onboarding(onboarding_data: OnboardingData):
     - **boat_number**: 선박번호 (선택사항)
     - **emergency_contact_***: 비상연락처 (선택사항)
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
     try:
-        # 기존 device_id 확인
-        response = supabase.table("users").select("*").eq("device_id", onboarding_data.device_id).execute()
-        if response.data:
+        # 사용자와 비상연락처를 한 번의 RPC(한 트랜잭션)로 저장
+        response = await execute(supabase.rpc("onboard_device", _profile_params(onboarding_data)))
+        profile = response.data
+        if not profile:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="이미 등록된 기기입니다"
             )
-
-        # 새 사용자 생성
-        user_id = str(uuid.uuid4())
-        user_insert_data = {
-            "id": user_id,
-            "device_id": onboarding_data.device_id,
-            "name": onboarding_data.name,
-            "phone": onboarding_data.phone,
-            "boat_name": onboarding_data.boat_name,
-            "boat_number": onboarding_data.boat_number,
-            "created_at": datetime.utcnow().isoformat()
-        }
-
-        response = supabase.table("users").insert(user_insert_data).execute()
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="사용자 생성에 실패했습니다"
-            )
-
-        # 비상연락처 저장
-        if onboarding_data.emergency_contact_1_name and onboarding_data.emergency_contact_1_phone:
-            emergency_contact_1 = {
-                "id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "name": onboarding_data.emergency_contact_1_name,
-                "phone": onboarding_data.emergency_contact_1_phone,
-                "created_at": datetime.utcnow().isoformat()
-            }
-            supabase.table("emergency_contacts").insert(emergency_contact_1).execute()
-
-        if onboarding_data.emergency_contact_2_name and onboarding_data.emergency_contact_2_phone:
-            emergency_contact_2 = {
-                "id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "name": onboarding_data.emergency_contact_2_name,
-                "phone": onboarding_data.emergency_contact_2_phone,
-                "created_at": datetime.utcnow().isoformat()
-            }
-            supabase.table("emergency_contacts").insert(emergency_contact_2).execute()
+        remember_device(onboarding_data.device_id, str(profile["id"]))
+        remember_profile(to_user_profile(profile))
 
         return OnboardingResponse(
             device_id=onboarding_data.device_id,
             message="온보딩 완료되었습니다",
-            user_id=user_id
+            user_id=str(profile["id"])
         )
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error creating user: {e}")
+    except Exception:
+        logger.exception("Error creating user", extra={"device_id": onboarding_data.device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온보딩 처리 중 오류가 발생했습니다"
         )
 
+@router.get("/cache/stats", summary="프로필 캐시 상태")
+async def get_profile_cache_stats():
+    """프로필 캐시 항목 수와 hit/miss 통계를 조회합니다."""
+    return device_profiles.stats()
+
 @router.get("/profile/{device_id}", response_model=UserProfile, summary="프로필 조회")
 async def get_profile(device_id: str):
     """
@@ -97,44 +88,26 @@ async def get_profile(device_id: str):
 
     **인증이 필요하지 않은 엔드포인트입니다.**
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
     try:
-        # 사용자 정보 조회
-        response = supabase.table("users").select("*").eq("device_id", device_id).execute()
-        if not response.data:
+        # 캐시에 있으면 DB 조회 없이 반환
+        profile = await get_device_profile(device_id)
+        if profile is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="등록되지 않은 기기입니다"
             )
-
-        user = response.data[0]
-
-        # 비상연락처 조회
-        emergency_contacts_response = supabase.table("emergency_contacts").select("*").eq("user_id", user["id"]).execute()
-        emergency_contacts = [
-            EmergencyContact(name=contact["name"], phone=contact["phone"])
-            for contact in emergency_contacts_response.data
-        ]
-
-        return UserProfile(
-            device_id=user["device_id"],
-            name=user["name"],
-            phone=user["phone"],
-            boat_name=user.get("boat_name"),
-            boat_number=user.get("boat_number"),
-            emergency_contacts=emergency_contacts,
-            created_at=user["created_at"]
-        )
+        return profile
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error fetching profile: {e}")
+    except Exception:
+        logger.exception("Error fetching profile", extra={"device_id": device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="프로필 조회 중 오류가 발생했습니다"
@@ -147,64 +120,33 @@ async def update_profile(device_id: str, profile_data: OnboardingData):
 
     **인증이 필요하지 않은 엔드포인트입니다.**
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
+    # 저장하는 동안 시작된 조회가 이전 프로필을 캐시하지 않도록 먼저 무효화
+    forget_profile(device_id)
     try:
-        # 사용자 존재 확인
-        response = supabase.table("users").select("id").eq("device_id", device_id).execute()
+        # 사용자 정보와 비상연락처를 한 번의 RPC(한 트랜잭션)로 교체하고 저장된 프로필을 그대로 반환
+        response = await execute(supabase.rpc("update_device_profile", _profile_params(profile_data, device_id)))
         if not response.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="등록되지 않은 기기입니다"
             )
 
-        user_id = response.data[0]["id"]
-
-        # 사용자 정보 업데이트
-        update_data = {
-            "name": profile_data.name,
-            "phone": profile_data.phone,
-            "boat_name": profile_data.boat_name,
-            "boat_number": profile_data.boat_number
-        }
-
-        supabase.table("users").update(update_data).eq("device_id", device_id).execute()
-
-        # 기존 비상연락처 삭제
-        supabase.table("emergency_contacts").delete().eq("user_id", user_id).execute()
-
-        # 새 비상연락처 추가
-        if profile_data.emergency_contact_1_name and profile_data.emergency_contact_1_phone:
-            emergency_contact_1 = {
-                "id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "name": profile_data.emergency_contact_1_name,
-                "phone": profile_data.emergency_contact_1_phone,
-                "created_at": datetime.utcnow().isoformat()
-            }
-            supabase.table("emergency_contacts").insert(emergency_contact_1).execute()
-
-        if profile_data.emergency_contact_2_name and profile_data.emergency_contact_2_phone:
-            emergency_contact_2 = {
-                "id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "name": profile_data.emergency_contact_2_name,
-                "phone": profile_data.emergency_contact_2_phone,
-                "created_at": datetime.utcnow().isoformat()
-            }
-            supabase.table("emergency_contacts").insert(emergency_contact_2).execute()
-
-        # 업데이트된 프로필 반환
-        return await get_profile(device_id)
+        profile = to_user_profile(response.data)
+        remember_profile(profile)
+        return profile
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error updating profile: {e}")
+    except Exception:
+        # 응답을 받지 못했어도 저장되었을 수 있으므로 그 사이 캐시된 프로필도 무효화
+        forget_profile(device_id)
+        logger.exception("Error updating profile", extra={"device_id": device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="프로필 수정 중 오류가 발생했습니다"
@@ -1,22 +1,148 @@
+import asyncio
+import json
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from app.models import (
     EmergencyReportCreate,
     AutoDetectionReport,
     ReportUpdate,
     ReportResponse,
-    ReportStatus
+    ReportStatus,
+    ReportType,
+    DetectionScoreRequest,
+    DetectionScore,
+    DetectionRescoreJob,
+    JobStatus
 )
 import uuid
 # from app.auth import get_current_user  # 더 이상 필요 없음
-from app.database import supabase
+from app.auth import require_admin_key
+from app.cache import TTLCache
+from app.config import settings
+from app.database import supabase, execute, is_permanent_error
+from app.detection import (
+    DETECTION_MODEL,
+    SENSOR_BLOB_CONTENT_TYPE,
+    SENSOR_BLOB_HEADER,
+    decode_sensor_blob,
+    encode_sensor_blob,
+    from_bytea,
+    score_windows,
+    to_bytea
+)
+from app.devices import resolve_user_id, require_user_id
+from app.events import report_events
+from app.idempotency import report_idempotency
+from app.log import get_logger
+from app.notifications import notification_dispatcher
+from app.pagination import apply_keyset, next_cursor
+from app.report_changes import report_change_feed
+from app.report_wal import report_wal
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/reports", tags=["신고 관리"])
 
+# 응답에 필요한 컬럼 (원시 센서 구간 sensor_blob은 재평가할 때만 조회)
+REPORT_COLUMNS = (
+    "id, device_id, type, status, location_latitude, location_longitude, location_address, "
+    "sensor_data, accident_probability, voice_file_url, video_file_url, description, reported_at, updated_at"
+)
+
+# 더 이상 상태가 바뀌지 않는 신고 상태
+FINAL_STATUSES = {ReportStatus.COMPLETED, ReportStatus.CANCELLED}
+
+def _to_report_response(report: dict) -> ReportResponse:
+    """reports 테이블 행을 ReportResponse로 변환"""
+    return ReportResponse(
+        id=str(report["id"]),
+        device_id=str(report["device_id"]),
+        type=report["type"],
+        status=report["status"],
+        location_latitude=report["location_latitude"],
+        location_longitude=report["location_longitude"],
+        location_address=report.get("location_address"),
+        sensor_data=report.get("sensor_data"),
+        accident_probability=report.get("accident_probability"),
+        voice_file_url=report.get("voice_file_url"),
+        video_file_url=report.get("video_file_url"),
+        description=report.get("description"),
+        reported_at=report["reported_at"],
+        updated_at=report["updated_at"]
+    )
+
+async def _replay_report(report: dict) -> Optional[dict]:
+    """
+    write-ahead log의 신고를 DB에 저장 (이미 저장된 신고면 None)
+
+    crash 직전에 저장되었거나 timeout 뒤에 늦게 저장된 신고를 다시 보내도 그 사이 바뀐 상태
+    (dispatched, cancelled 등)를 덮어쓰지 않도록 id 충돌 시 아무것도 하지 않습니다.
+    """
+    if not supabase:
+        raise RuntimeError("데이터베이스 연결이 필요합니다")
+    response = await execute(supabase.table("reports").upsert(report, ignore_duplicates=True))
+    return response.data[0] if response.data else None
+
+def start_report_change_feed():
+    """DB에서 바뀐 신고 상태(외부 배차 시스템의 변경 포함)를 SSE 구독자에게 전달 시작"""
+    report_change_feed.start(lambda row: report_events.publish(_to_report_response(row)))
+
+def start_report_replayer():
+    """DB에 저장되지 않은 신고를 백그라운드에서 재전송 시작"""
+    report_wal.start_replayer(
+        _replay_report,
+        lambda saved: report_events.publish(_to_report_response(saved)),
+        is_permanent=is_permanent_error
+    )
+
+async def _save_report(report_insert_data: dict) -> ReportResponse:
+    """
+    신고를 write-ahead log에 먼저 기록한 뒤 DB에 저장
+
+    DB 연결이 없거나 저장이 일시적으로 실패/지연되더라도 디스크에 기록된 신고는 접수된 것으로
+    응답하고 백그라운드에서 재전송합니다. 다시 보내도 실패할 오류(잘못된 데이터 등)는 접수하지 않고
+    오류로 응답합니다.
+    """
+    report_id = report_insert_data["id"]
+    try:
+        await report_wal.append(report_insert_data)
+        logged = True
+    except Exception:
+        logger.exception("Error writing report to write-ahead log", extra={"report_id": report_id})
+        logged = False
+
+    try:
+        if not supabase:
+            raise RuntimeError("데이터베이스 연결이 필요합니다")
+        response = await asyncio.wait_for(
+            execute(supabase.table("reports").insert(report_insert_data)),
+            timeout=settings.report_insert_timeout_seconds
+        )
+        if not response.data:
+            raise RuntimeError("신고 저장 결과가 없습니다")
+        report_wal.commit(report_id)
+        report = _to_report_response(response.data[0])
+    except Exception as e:
+        if not logged:
+            raise
+        if is_permanent_error(e):
+            report_wal.discard(report_id)
+            raise
+        logger.warning("Report accepted, DB write deferred", extra={"report_id": report_id, "error": repr(e)})
+        report_wal.retry_soon(report_id)
+        report = _to_report_response(report_insert_data)
+
+    report_events.publish(report)
+    notification_dispatcher.notify_report(report)
+    return report
+
 @router.post("/emergency", response_model=ReportResponse, summary="긴급 신고")
 async def create_emergency_report(
-    report_data: EmergencyReportCreate
+    report_data: EmergencyReportCreate,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")
 ):
     """
     긴급 신고를 접수합니다.
@@ -28,24 +154,27 @@ async def create_emergency_report(
     - **location_address**: 주소 (선택사항)
     - **description**: 상황 설명 (선택사항)
     - **sensor_data**: 센서 데이터 (선택사항)
-    """
-    if supabase is None:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="데이터베이스 연결이 필요합니다."
-        )
 
+    같은 `Idempotency-Key` 헤더로 재시도하거나, 같은 기기가 짧은 시간 안에 같은 위치에서
+    다시 신고하면 새 신고를 만들지 않고 처음 접수된 신고를 그대로 반환합니다.
+    """
+    keys = report_idempotency.keys_for(
+        report_data.device_id,
+        f"{report_data.type.value}:{report_data.emergency_type.value}",
+        report_data.location_latitude,
+        report_data.location_longitude,
+        idempotency_key
+    )
+    return await report_idempotency.run(keys, lambda: _create_emergency_report(report_data))
+
+async def _create_emergency_report(report_data: EmergencyReportCreate) -> ReportResponse:
+    """긴급 신고 생성 (DB 장애 시에도 write-ahead log에 기록되면 접수)"""
     try:
-        # 기기 ID로 사용자 확인 (선택적)
-        try:
-            user_response = supabase.table("users").select("id").eq("device_id", report_data.device_id).execute()
-            user_id = user_response.data[0]["id"] if user_response.data else None
-        except Exception as e:
-            print(f"Warning: Could not find user for device_id {report_data.device_id}: {e}")
-            user_id = None
-
-        # 신고 데이터 준비 - user_id 없이도 가능하도록
+        # 신고 데이터 준비 - user_id는 외래키 문제(users_backup 테이블 참조)로 저장하지 않으므로
+        # DB 장애 중에도 바로 기록되도록 기기 → 사용자 조회를 하지 않음
+        # id는 미리 생성하여 재전송 시 같은 신고가 중복 저장되지 않도록 함
         report_insert_data = {
+            "id": str(uuid.uuid4()),
             "device_id": report_data.device_id,
             "type": report_data.type,
             "emergency_type": report_data.emergency_type,
@@ -59,47 +188,169 @@ async def create_emergency_report(
             "updated_at": datetime.utcnow().isoformat()
         }
 
-        # user_id는 외래키 문제로 인해 제외 (users_backup 테이블 참조 문제)
-        # if user_id:
-        #     report_insert_data["user_id"] = user_id
-
         # 데이터베이스에 신고 생성
-        response = supabase.table("reports").insert(report_insert_data).execute()
-
-        if response.data:
-            report = response.data[0]
-            return ReportResponse(
-                id=str(report["id"]),
-                device_id=str(report["device_id"]),
-                type=report["type"],
-                status=report["status"],
-                location_latitude=report["location_latitude"],
-                location_longitude=report["location_longitude"],
-                location_address=report.get("location_address"),
-                sensor_data=report.get("sensor_data"),
-                accident_probability=report.get("accident_probability"),
-                voice_file_url=report.get("voice_file_url"),
-                video_file_url=report.get("video_file_url"),
-                description=report.get("description"),
-                reported_at=report["reported_at"],
-                updated_at=report["updated_at"]
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="신고 접수에 실패했습니다"
-            )
+        return await _save_report(report_insert_data)
 
     except Exception as e:
-        print(f"Error creating emergency report: {e}")
+        logger.exception("Error creating emergency report", extra={"device_id": report_data.device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"신고 처리 중 오류가 발생했습니다: {str(e)}"
         )
 
+async def _score_sensor_windows(windows: List[dict]) -> List[dict]:
+    """센서 구간을 한 번에 평가 (NumPy 연산은 이벤트 루프 밖에서 실행)"""
+    if len(windows) > settings.detection_max_windows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"한 번에 최대 {settings.detection_max_windows}개 구간까지 평가할 수 있습니다"
+        )
+    if any(len(window["accelerometer"]) > settings.detection_max_samples for window in windows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"센서 구간당 최대 {settings.detection_max_samples}개 샘플까지 허용됩니다"
+        )
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(None, score_windows, windows)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/auto-detection/score", response_model=List[DetectionScore], summary="센서 구간 사고 확률 평가")
+async def score_detection_windows(request: DetectionScoreRequest):
+    """
+    원시 센서 구간들의 사고 확률을 한 번에 계산합니다.
+
+    - **windows**: 센서 구간 목록 (sample_rate_hz, accelerometer [[x, y, z], ...] m/s², gyroscope rad/s)
+
+    최대 가속도(g), 최대 jerk, 중력 방향 변화, 자이로 누적 회전량을 특징으로 사용합니다.
+    """
+    return await _score_sensor_windows([window.dict() for window in request.windows])
+
+async def _rescore_reports(job: DetectionRescoreJob):
+    """원시 센서 구간이 있는 자동 감지 신고를 배치 단위로 다시 평가 (진행 상황은 job에 기록)"""
+    batch_size = settings.detection_rescore_batch_size
+    cursor = None
+    while True:
+        query = apply_keyset(
+            supabase.table("reports")
+            .select("id, reported_at, sensor_data, sensor_blob")
+            .eq("type", ReportType.AUTO_DETECTION.value),
+            "reported_at",
+            cursor
+        ).limit(batch_size)
+        rows = (await execute(query)).data
+        job.scanned += len(rows)
+
+        # 원시 구간이 있고 이전 모델로 평가된 신고만 다시 계산
+        stale = [
+            row for row in rows
+            if row.get("sensor_blob")
+            and ((row.get("sensor_data") or {}).get("detection") or {}).get("model_version") != DETECTION_MODEL["version"]
+        ]
+        if stale:
+            scores = await _score_sensor_windows([decode_sensor_blob(from_bytea(row["sensor_blob"])) for row in stale])
+            await asyncio.gather(*[
+                execute(
+                    supabase.table("reports").update({
+                        "accident_probability": score["accident_probability"],
+                        "sensor_data": {**(row.get("sensor_data") or {}), "detection": score}
+                    }).eq("id", row["id"])
+                )
+                for row, score in zip(stale, scores)
+            ])
+            job.rescored += len(stale)
+
+        cursor = next_cursor(rows, "reported_at", batch_size)
+        if cursor is None:
+            break
+
+async def _run_rescore_job(job: DetectionRescoreJob):
+    try:
+        await _rescore_reports(job)
+        job.status = JobStatus.COMPLETED
+        logger.info("Auto detection rescore done", extra={"job_id": job.job_id, "scanned": job.scanned, "rescored": job.rescored})
+    except asyncio.CancelledError:
+        job.status = JobStatus.FAILED
+        job.error = "서버 종료로 중단되었습니다"
+        raise
+    except Exception as e:
+        logger.exception("Error rescoring auto detection reports", extra={"job_id": job.job_id})
+        job.status = JobStatus.FAILED
+        job.error = e.detail if isinstance(e, HTTPException) else "자동 감지 신고 재평가 중 오류가 발생했습니다"
+    finally:
+        job.finished_at = datetime.utcnow()
+
+# 재평가 작업 기록 (job_id → DetectionRescoreJob)과 실행 중인 작업
+_rescore_jobs = TTLCache(max_entries=100, ttl_seconds=86400)
+_rescore_task: Optional[asyncio.Task] = None
+_rescore_job: Optional[DetectionRescoreJob] = None
+
+async def stop_rescore_job():
+    """실행 중인 재평가 작업 취소 (lifespan 종료 시 호출)"""
+    if _rescore_task is not None and not _rescore_task.done():
+        _rescore_task.cancel()
+        await asyncio.wait([_rescore_task])
+
+@router.post(
+    "/auto-detection/rescore",
+    response_model=DetectionRescoreJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="자동 감지 신고 재평가 시작 (관리용)",
+    dependencies=[Depends(require_admin_key)]
+)
+async def rescore_auto_detection_reports():
+    """
+    원시 센서 구간이 저장된 자동 감지 신고를 현재 모델로 다시 평가하는 백그라운드 작업을 시작합니다.
+
+    모델이 바뀐 뒤 호출하면 이전 버전으로 계산된 신고의 accident_probability를 일괄 갱신합니다.
+    X-Admin-Key 헤더가 필요하며, 진행 상황은 반환된 job_id로 조회합니다.
+    이미 실행 중인 작업이 있으면 새로 시작하지 않고 그 작업을 반환합니다.
+    """
+    global _rescore_task, _rescore_job
+    if not supabase:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="데이터베이스 연결이 필요합니다."
+        )
+
+    if _rescore_task is not None and not _rescore_task.done():
+        return _rescore_job
+
+    _rescore_job = DetectionRescoreJob(
+        job_id=str(uuid.uuid4()),
+        status=JobStatus.RUNNING,
+        model_version=DETECTION_MODEL["version"],
+        started_at=datetime.utcnow()
+    )
+    _rescore_jobs.set(_rescore_job.job_id, _rescore_job)
+    _rescore_task = asyncio.create_task(_run_rescore_job(_rescore_job))
+    return _rescore_job
+
+@router.get(
+    "/auto-detection/rescore/{job_id}",
+    response_model=DetectionRescoreJob,
+    summary="자동 감지 신고 재평가 진행 상황 (관리용)",
+    dependencies=[Depends(require_admin_key)]
+)
+async def get_rescore_job(job_id: str):
+    """재평가 작업의 상태(running/completed/failed)와 조회/갱신한 신고 수를 조회합니다."""
+    job = _rescore_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="재평가 작업을 찾을 수 없습니다"
+        )
+    return job
+
 @router.post("/auto-detection", response_model=ReportResponse, summary="자동 사고 감지 신고")
 async def create_auto_detection_report(
-    report_data: AutoDetectionReport
+    report_data: AutoDetectionReport,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")
 ):
     """
     자동 사고 감지 신고를 접수합니다.
@@ -110,25 +361,128 @@ async def create_auto_detection_report(
     - **location_latitude**: 위도
     - **location_longitude**: 경도
     - **sensor_data**: 센서 데이터 (가속도, 충격 등)
-    - **accident_probability**: 사고 확률 (0.0 ~ 1.0)
+    - **sensor_window**: 원시 센서 구간 (있으면 서버에서 사고 확률을 계산하여 사용)
+    - **accident_probability**: 기기에서 계산한 사고 확률 (0.0 ~ 1.0, sensor_window가 없을 때 필수)
+
+    긴급 신고와 같은 방식으로 재시도된 요청은 처음 접수된 신고를 반환합니다.
     """
-    if supabase is None:
+    keys = report_idempotency.keys_for(
+        report_data.device_id,
+        report_data.type.value,
+        report_data.location_latitude,
+        report_data.location_longitude,
+        idempotency_key
+    )
+    window = report_data.sensor_window.dict() if report_data.sensor_window is not None else None
+    return await report_idempotency.run(keys, lambda: _create_auto_detection_report(report_data, window))
+
+@router.post("/auto-detection/binary", response_model=ReportResponse, summary="자동 사고 감지 신고 (바이너리 센서 구간)")
+async def create_auto_detection_report_binary(
+    request: Request,
+    device_id: str,
+    location_latitude: float = Query(..., allow_inf_nan=False),
+    location_longitude: float = Query(..., allow_inf_nan=False),
+    accident_probability: Optional[float] = Query(default=None, allow_inf_nan=False),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")
+):
+    """
+    원시 센서 구간을 바이너리로 받아 자동 사고 감지 신고를 접수합니다.
+
+    본문 형식 (`application/vnd.badacall.sensor-window`, little-endian):
+    - 헤더 16바이트: `BCS1`, flags(u8, bit0 = 자이로 포함), 예약 3바이트, sample_rate_hz(f32), 샘플 수 n(u32)
+    - 가속도 float32[n][3] (m/s²), flags bit0이면 자이로 float32[n][3] (rad/s)
+
+    같은 구간의 JSON보다 4~5배 작고, 서버는 복사 없이 배열로 읽어 사고 확률을 계산합니다.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in (SENSOR_BLOB_CONTENT_TYPE, "application/octet-stream"):
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="데이터베이스 연결이 필요합니다."
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type은 {SENSOR_BLOB_CONTENT_TYPE}이어야 합니다"
         )
 
+    max_bytes = SENSOR_BLOB_HEADER.size + 2 * settings.detection_max_samples * 3 * 4
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"센서 구간당 최대 {settings.detection_max_samples}개 샘플까지 허용됩니다"
+    )
+    if int(request.headers.get("content-length") or 0) > max_bytes:
+        raise too_large
+
+    # chunked 본문은 Content-Length가 없으므로 읽으면서 크기를 확인하고 초과하면 바로 중단
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise too_large
+    sensor_blob = bytes(body)
     try:
-        # 기기 ID로 사용자 확인
-        user_response = supabase.table("users").select("id").eq("device_id", report_data.device_id).execute()
-        if not user_response.data:
+        window = decode_sensor_blob(sensor_blob)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    report_data = AutoDetectionReport(
+        device_id=device_id,
+        location_latitude=location_latitude,
+        location_longitude=location_longitude,
+        accident_probability=accident_probability
+    )
+    keys = report_idempotency.keys_for(
+        report_data.device_id,
+        report_data.type.value,
+        report_data.location_latitude,
+        report_data.location_longitude,
+        idempotency_key
+    )
+    return await report_idempotency.run(keys, lambda: _create_auto_detection_report(report_data, window, sensor_blob))
+
+async def _create_auto_detection_report(
+    report_data: AutoDetectionReport,
+    window: Optional[dict] = None,
+    sensor_blob: Optional[bytes] = None
+) -> ReportResponse:
+    """자동 감지 신고 생성 (DB 장애 시에도 write-ahead log에 기록되면 접수)"""
+    try:
+        # 기기 ID로 사용자 확인 - DB 장애로 확인할 수 없으면 사용자 없이 접수
+        try:
+            user_id = await resolve_user_id(report_data.device_id)
+        except Exception as e:
+            logger.warning("Could not resolve device, accepting without user", extra={"device_id": report_data.device_id, "error": repr(e)})
+            user_id = None
+        else:
+            if user_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="등록되지 않은 기기입니다. 먼저 온보딩을 완료해주세요."
+                )
+
+        # 원시 센서 구간이 있으면 서버에서 사고 확률 계산 (기기 값은 참고용으로 보관)
+        # 구간은 JSONB 대신 바이너리(sensor_blob)로 저장하여 재평가에 사용
+        sensor_data = dict(report_data.sensor_data)
+        accident_probability = report_data.accident_probability
+        if window is not None:
+            detection = (await _score_sensor_windows([window]))[0]
+            if sensor_blob is None:
+                try:
+                    sensor_blob = encode_sensor_blob(window)
+                except ValueError as e:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=str(e)
+                    )
+            if accident_probability is not None:
+                sensor_data["client_accident_probability"] = accident_probability
+            sensor_data["detection"] = detection
+            accident_probability = detection["accident_probability"]
+        elif accident_probability is None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="등록되지 않은 기기입니다. 먼저 온보딩을 완료해주세요."
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="sensor_window 또는 accident_probability가 필요합니다"
             )
 
-        user_id = user_response.data[0]["id"]
-
         # 자동 감지 신고 데이터 준비
         report_id = str(uuid.uuid4())
         report_insert_data = {
@@ -139,41 +493,21 @@ async def create_auto_detection_report(
             "status": ReportStatus.PENDING,
             "location_latitude": report_data.location_latitude,
             "location_longitude": report_data.location_longitude,
-            "sensor_data": report_data.sensor_data,
-            "accident_probability": report_data.accident_probability,
+            "sensor_data": sensor_data,
+            "accident_probability": accident_probability,
             "reported_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat()
         }
+        if sensor_blob is not None:
+            report_insert_data["sensor_blob"] = to_bytea(sensor_blob)
 
         # 데이터베이스에 신고 생성
-        response = supabase.table("reports").insert(report_insert_data).execute()
-
-        if response.data:
-            report = response.data[0]
-            return ReportResponse(
-                id=str(report["id"]),
-                device_id=str(report["device_id"]),
-                type=report["type"],
-                status=report["status"],
-                location_latitude=report["location_latitude"],
-                location_longitude=report["location_longitude"],
-                location_address=report.get("location_address"),
-                sensor_data=report.get("sensor_data"),
-                accident_probability=report.get("accident_probability"),
-                voice_file_url=report.get("voice_file_url"),
-                video_file_url=report.get("video_file_url"),
-                description=report.get("description"),
-                reported_at=report["reported_at"],
-                updated_at=report["updated_at"]
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="자동 감지 신고 접수에 실패했습니다"
-            )
+        return await _save_report(report_insert_data)
 
-    except Exception as e:
-        print(f"Error creating auto detection report: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error creating auto detection report", extra={"device_id": report_data.device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="자동 감지 신고 처리 중 오류가 발생했습니다"
@@ -182,32 +516,23 @@ async def create_auto_detection_report(
 @router.get("/status/{report_id}", response_model=ReportResponse, summary="신고 상태 조회")
 async def get_report_status(
     report_id: str,
-    device_id: str
+    device_id: str,
+    user_id: str = Depends(require_user_id)
 ):
     """
     특정 신고의 상태를 조회합니다.
 
     - **report_id**: 신고 ID (UUID)
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
     try:
-        # 기기 ID로 사용자 확인
-        user_response = supabase.table("users").select("id").eq("device_id", device_id).execute()
-        if not user_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="등록되지 않은 기기입니다."
-            )
-
-        user_id = user_response.data[0]["id"]
-
         # 신고 조회 (사용자 본인의 신고만)
-        response = supabase.table("reports").select("*").eq("id", report_id).eq("user_id", user_id).execute()
+        response = await execute(supabase.table("reports").select(REPORT_COLUMNS).eq("id", report_id).eq("user_id", user_id))
 
         if not response.data:
             raise HTTPException(
@@ -216,27 +541,12 @@ async def get_report_status(
             )
 
         report = response.data[0]
-        return ReportResponse(
-            id=str(report["id"]),
-            device_id=str(report["device_id"]),
-            type=report["type"],
-            status=report["status"],
-            location_latitude=report["location_latitude"],
-            location_longitude=report["location_longitude"],
-            location_address=report.get("location_address"),
-            sensor_data=report.get("sensor_data"),
-            accident_probability=report.get("accident_probability"),
-            voice_file_url=report.get("voice_file_url"),
-            video_file_url=report.get("video_file_url"),
-            description=report.get("description"),
-            reported_at=report["reported_at"],
-            updated_at=report["updated_at"]
-        )
+        return _to_report_response(report)
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error fetching report status: {e}")
+    except Exception:
+        logger.exception("Error fetching report status", extra={"report_id": report_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="신고 상태 조회 중 오류가 발생했습니다"
@@ -245,32 +555,23 @@ async def get_report_status(
 @router.put("/{report_id}/cancel", response_model=ReportResponse, summary="신고 취소")
 async def cancel_report(
     report_id: str,
-    device_id: str
+    device_id: str,
+    user_id: str = Depends(require_user_id)
 ):
     """
     신고를 취소합니다. (PENDING 상태에서만 가능)
 
     - **report_id**: 신고 ID (UUID)
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
     try:
-        # 기기 ID로 사용자 확인
-        user_response = supabase.table("users").select("id").eq("device_id", device_id).execute()
-        if not user_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="등록되지 않은 기기입니다."
-            )
-
-        user_id = user_response.data[0]["id"]
-
         # 먼저 신고 존재 여부 및 상태 확인
-        response = supabase.table("reports").select("*").eq("id", report_id).eq("user_id", user_id).execute()
+        response = await execute(supabase.table("reports").select(REPORT_COLUMNS).eq("id", report_id).eq("user_id", user_id))
 
         if not response.data:
             raise HTTPException(
@@ -288,34 +589,21 @@ async def cancel_report(
             )
 
         # 상태를 CANCELLED로 업데이트
-        update_response = supabase.table("reports").update({
+        update_response = await execute(supabase.table("reports").update({
             "status": ReportStatus.CANCELLED,
             "updated_at": datetime.utcnow().isoformat()
-        }).eq("id", report_id).eq("user_id", user_id).execute()
+        }).eq("id", report_id).eq("user_id", user_id))
 
         if update_response.data:
-            updated_report = update_response.data[0]
-            return ReportResponse(
-                id=str(updated_report["id"]),
-                device_id=str(updated_report["device_id"]),
-                type=updated_report["type"],
-                status=updated_report["status"],
-                location_latitude=updated_report["location_latitude"],
-                location_longitude=updated_report["location_longitude"],
-                location_address=updated_report.get("location_address"),
-                sensor_data=updated_report.get("sensor_data"),
-                accident_probability=updated_report.get("accident_probability"),
-                voice_file_url=updated_report.get("voice_file_url"),
-                video_file_url=updated_report.get("video_file_url"),
-                description=updated_report.get("description"),
-                reported_at=updated_report["reported_at"],
-                updated_at=updated_report["updated_at"]
-            )
+            updated_report = _to_report_response(update_response.data[0])
+            report_idempotency.forget_report(updated_report.id)
+            report_events.publish(updated_report)
+            return updated_report
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error cancelling report: {e}")
+    except Exception:
+        logger.exception("Error cancelling report", extra={"report_id": report_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="신고 취소 중 오류가 발생했습니다"
@@ -323,65 +611,147 @@ async def cancel_report(
 
 @router.get("/history", response_model=List[ReportResponse], summary="신고 이력 조회")
 async def get_report_history(
+    http_response: Response,
     device_id: str,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 X-Next-Cursor 값"),
+    user_id: str = Depends(require_user_id)
 ):
     """
     사용자의 신고 이력을 조회합니다.
 
     - **limit**: 조회할 개수 (기본값: 10)
-    - **offset**: 건너뛸 개수 (기본값: 0)
+    - **cursor**: 다음 페이지 커서 (응답 헤더 `X-Next-Cursor`, 마지막 페이지면 없음)
+    - **offset**: 건너뛸 개수 (기본값: 0, 하위 호환용 - cursor 사용 권장)
     """
-    if supabase is None:
+    if not supabase:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="데이터베이스 연결이 필요합니다."
         )
 
     try:
-        # 기기 ID로 사용자 확인
-        user_response = supabase.table("users").select("id").eq("device_id", device_id).execute()
-        if not user_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="등록되지 않은 기기입니다."
-            )
+        # 사용자의 모든 신고 조회 (최신순, (reported_at, id) keyset)
+        query = apply_keyset(
+            supabase.table("reports").select(REPORT_COLUMNS).eq("user_id", user_id),
+            "reported_at",
+            cursor
+        )
+        if cursor is None and offset:
+            query = query.range(offset, offset + limit - 1)
+        else:
+            query = query.limit(limit)
 
-        user_id = user_response.data[0]["id"]
+        response = await execute(query)
 
-        # 사용자의 모든 신고 조회 (최신순)
-        response = supabase.table("reports")\
-            .select("*")\
-            .eq("user_id", user_id)\
-            .order("reported_at", desc=True)\
-            .range(offset, offset + limit - 1)\
-            .execute()
+        cursor_value = next_cursor(response.data, "reported_at", limit)
+        if cursor_value:
+            http_response.headers["X-Next-Cursor"] = cursor_value
 
         reports = []
         for report in response.data:
-            reports.append(ReportResponse(
-                id=str(report["id"]),
-                device_id=str(report["device_id"]),
-                type=report["type"],
-                status=report["status"],
-                location_latitude=report["location_latitude"],
-                location_longitude=report["location_longitude"],
-                location_address=report.get("location_address"),
-                sensor_data=report.get("sensor_data"),
-                accident_probability=report.get("accident_probability"),
-                voice_file_url=report.get("voice_file_url"),
-                video_file_url=report.get("video_file_url"),
-                description=report.get("description"),
-                reported_at=report["reported_at"],
-                updated_at=report["updated_at"]
-            ))
+            reports.append(_to_report_response(report))
 
         return reports
 
-    except Exception as e:
-        print(f"Error fetching report history: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching report history", extra={"device_id": device_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="신고 이력 조회 중 오류가 발생했습니다"
-        )
\ No newline at end of file
+        )
+
+def _format_sse(report: ReportResponse) -> str:
+    """ReportResponse를 Server-Sent Events 메시지로 변환"""
+    data = json.dumps(jsonable_encoder(report), ensure_ascii=False)
+    return f"event: report\nid: {report.id}\ndata: {data}\n\n"
+
+async def _report_event_stream(
+    request: Request,
+    key: str,
+    queue: asyncio.Queue,
+    initial: Optional[ReportResponse] = None,
+    close_on_final: bool = False
+):
+    """구독한 신고 상태 변경을 SSE로 전송 (주기적으로 keep-alive 주석 전송)"""
+    try:
+        if initial is not None:
+            yield _format_sse(initial)
+            if close_on_final and initial.status in FINAL_STATUSES:
+                return
+
+        while not await request.is_disconnected():
+            try:
+                report = await asyncio.wait_for(queue.get(), timeout=settings.sse_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield _format_sse(report)
+            if close_on_final and report.status in FINAL_STATUSES:
+                return
+    finally:
+        report_events.unsubscribe(key, queue)
+
+@router.get("/events", summary="기기 신고 상태 스트림")
+async def stream_device_report_events(
+    request: Request,
+    device_id: str,
+    user_id: str = Depends(require_user_id)
+):
+    """
+    기기의 모든 신고 상태 변경을 Server-Sent Events로 받습니다.
+
+    신고가 접수되거나 상태가 바뀔 때마다 `event: report` 메시지로 최신 `ReportResponse`가 전송됩니다.
+    `GET /reports/status/{report_id}`를 반복 호출하는 대신 사용하세요.
+    """
+    key = f"device:{device_id}"
+    return StreamingResponse(
+        _report_event_stream(request, key, report_events.subscribe(key)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{report_id}/events", summary="신고 상태 스트림")
+async def stream_report_events(
+    request: Request,
+    report_id: str,
+    device_id: str,
+    user_id: str = Depends(require_user_id)
+):
+    """
+    특정 신고의 상태 변경을 Server-Sent Events로 받습니다.
+
+    연결 직후 현재 상태를 한 번 보내고, 이후 상태가 바뀔 때마다 전송합니다.
+    신고가 완료(completed) 또는 취소(cancelled)되면 스트림이 종료됩니다.
+
+    - **report_id**: 신고 ID (UUID)
+    """
+    # 현재 상태를 읽는 동안 발생한 변경도 놓치지 않도록 먼저 구독
+    key = f"report:{report_id}"
+    queue = report_events.subscribe(key)
+    try:
+        response = await execute(supabase.table("reports").select(REPORT_COLUMNS).eq("id", report_id).eq("user_id", user_id))
+    except Exception:
+        report_events.unsubscribe(key, queue)
+        logger.exception("Error fetching report for events", extra={"report_id": report_id})
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="신고 상태 조회 중 오류가 발생했습니다"
+        )
+
+    if not response.data:
+        report_events.unsubscribe(key, queue)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="신고를 찾을 수 없습니다"
+        )
+
+    return StreamingResponse(
+        _report_event_stream(request, key, queue, _to_report_response(response.data[0]), close_on_final=True),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
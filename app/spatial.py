@@ -0,0 +1,97 @@
+import heapq
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 좌표 사이의 거리 (km)"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class VesselIndex:
+    """
+    기기별 최신 위치에 대한 격자(grid) 공간 인덱스
+
+    위경도를 cell_size_deg 크기의 칸으로 나눠 기기를 담아두고, 반경 검색 시
+    반경에 걸치는 칸의 기기만 거리 계산하므로 전체 기기 수와 무관하게 빠릅니다.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.1):
+        self.cell_size_deg = cell_size_deg
+        self._lon_cells = int(round(360 / cell_size_deg))
+        self._positions: Dict[str, Tuple[float, float, datetime, Tuple[int, int]]] = {}
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        row = int(math.floor((latitude + 90) / self.cell_size_deg))
+        col = int(math.floor((longitude + 180) / self.cell_size_deg)) % self._lon_cells
+        return row, col
+
+    def update(self, device_id: str, latitude: float, longitude: float, timestamp: datetime):
+        """기기의 최신 위치 반영"""
+        cell = self._cell(latitude, longitude)
+        previous = self._positions.get(device_id)
+        if previous is not None and previous[3] != cell:
+            self._discard(device_id, previous[3])
+
+        self._positions[device_id] = (latitude, longitude, timestamp, cell)
+        self._cells.setdefault(cell, set()).add(device_id)
+
+    def remove(self, device_id: str):
+        """기기를 인덱스에서 제거"""
+        previous = self._positions.pop(device_id, None)
+        if previous is not None:
+            self._discard(device_id, previous[3])
+
+    def _discard(self, device_id: str, cell: Tuple[int, int]):
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(device_id)
+            if not members:
+                del self._cells[cell]
+
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int,
+        since: Optional[datetime] = None,
+        exclude_device_id: Optional[str] = None
+    ) -> List[Tuple[float, str, float, float, datetime]]:
+        """반경 내 가장 가까운 기기 목록 [(거리 km, device_id, 위도, 경도, 시간)]"""
+        lat_span = radius_km / KM_PER_DEGREE
+        cos_lat = max(math.cos(math.radians(min(abs(latitude) + lat_span, 90.0))), 1e-6)
+        lon_span = min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+
+        min_row, min_col = self._cell(max(latitude - lat_span, -90.0), longitude - lon_span)
+        max_row, _ = self._cell(min(latitude + lat_span, 90.0), longitude)
+        col_count = min(int(math.ceil(2 * lon_span / self.cell_size_deg)) + 1, self._lon_cells)
+
+        candidates = []
+        for row in range(min_row, max_row + 1):
+            for offset in range(col_count):
+                members = self._cells.get((row, (min_col + offset) % self._lon_cells))
+                if not members:
+                    continue
+                for device_id in members:
+                    if device_id == exclude_device_id:
+                        continue
+                    device_latitude, device_longitude, timestamp, _ = self._positions[device_id]
+                    if since is not None and timestamp < since:
+                        continue
+                    distance = haversine_km(latitude, longitude, device_latitude, device_longitude)
+                    if distance <= radius_km:
+                        candidates.append((distance, device_id, device_latitude, device_longitude, timestamp))
+
+        return heapq.nsmallest(limit, candidates)
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+
+# W3C trace context (traceparent: 00-<trace_id 32자리>-<span_id 16자리>-<flags>)
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+class Span:
+    """하나의 작업 구간 (trace_id로 요청 → DB → 백그라운드 작업을 묶음)"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "start_ns", "end_ns", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    @property
+    def context(self) -> Tuple[str, str]:
+        """다른 작업에 넘겨 부모로 이어 붙일 (trace_id, span_id)"""
+        return self.trace_id, self.span_id
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+class SpanExporter:
+    """끝난 span을 내보내는 인터페이스"""
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+class NoopSpanExporter(SpanExporter):
+    def export(self, span: Span):
+        pass
+
+class InMemorySpanExporter(SpanExporter):
+    """최근 span을 메모리에 보관 (개발/테스트용)"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+    def find(self, trace_id: str) -> List[Span]:
+        return [span for span in self.spans if span.trace_id == trace_id]
+
+    def clear(self):
+        self.spans.clear()
+
+class JsonFileSpanExporter(SpanExporter):
+    """span을 JSON lines 파일에 추가"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+def _build_exporter() -> SpanExporter:
+    if settings.trace_exporter == "memory":
+        return InMemorySpanExporter()
+    if settings.trace_exporter == "file":
+        return JsonFileSpanExporter(settings.trace_file)
+    return NoopSpanExporter()
+
+_exporter: SpanExporter = _build_exporter()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def set_exporter(exporter: SpanExporter):
+    """span exporter 교체"""
+    global _exporter
+    _exporter = exporter
+
+def get_exporter() -> SpanExporter:
+    return _exporter
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+@contextmanager
+def start_span(name: str, parent: Optional[Tuple[str, str]] = None, root: bool = False, **attributes):
+    """
+    span 시작 (with 블록이 끝나면 종료하고 exporter로 전달)
+
+    parent를 생략하면 현재 span의 자식이 됩니다. asyncio.create_task는 contextvar를 복사하므로
+    요청 안에서 만든 태스크의 span도 같은 trace에 이어집니다. 여러 요청이 모인 작업처럼
+    특정 요청에 속하지 않는 작업은 root=True로 새 trace를 시작합니다.
+    """
+    if parent is None and not root:
+        current = _current_span.get()
+        parent = current.context if current is not None else None
+
+    if parent is not None:
+        span = Span(name, parent[0], parent[1], attributes)
+    else:
+        span = Span(name, os.urandom(16).hex(), None, attributes)
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        try:
+            _exporter.export(span)
+        except Exception:
+            pass  # span 내보내기 실패가 요청 처리를 깨뜨리지 않도록 무시
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """traceparent 헤더를 (trace_id, span_id)로 변환 (형식이 틀리면 None)"""
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if match is None:
+        return None
+    return match.group(1), match.group(2)
+
+def format_traceparent(span: Span) -> str:
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+async def tracing_middleware(request, call_next):
+    """요청마다 span 시작 (클라이언트의 traceparent가 있으면 이어서 기록)"""
+    parent = parse_traceparent(request.headers.get("traceparent"))
+    with start_span(f"{request.method} {request.url.path}", parent=parent, root=parent is None) as span:
+        span.set_attribute("http.method", request.method)
+        span.set_attribute("http.target", request.url.path)
+        try:
+            response = await call_next(request)
+        finally:
+            route = request.scope.get("route")
+            if route is not None:
+                span.name = f"{request.method} {route.path}"
+                span.set_attribute("http.route", route.path)
+
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 500:
+            span.status = "error"
+        response.headers["traceparent"] = format_traceparent(span)
+        return response
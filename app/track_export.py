@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+import re
+from typing import AsyncIterator, List
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+EXPORT_FIELDS = ["id", "device_id", "timestamp", "latitude", "longitude", "accuracy", "altitude", "speed", "heading"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "gpx": "application/gpx+xml"
+}
+
+def content_disposition(filename: str) -> str:
+    """
+    첨부 파일 Content-Disposition 헤더 값
+
+    filename에는 안전한 ASCII 문자만 남기고(따옴표, 줄바꿈 등으로 헤더가 깨지지 않도록),
+    원래 이름은 RFC 5987 filename*로 함께 보냅니다.
+    """
+    fallback = re.sub(r"[^A-Za-z0-9._-]", "_", filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+def _ndjson_chunk(rows: List[dict]) -> str:
+    return "".join(
+        json.dumps({field: row.get(field) for field in EXPORT_FIELDS}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def _csv_chunk(rows: List[dict], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore", lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def _gpx_chunk(rows: List[dict]) -> str:
+    points = []
+    for row in rows:
+        point = f'<trkpt lat="{row["latitude"]}" lon="{row["longitude"]}">'
+        if row.get("altitude") is not None:
+            point += f'<ele>{row["altitude"]}</ele>'
+        point += f'<time>{escape(str(row["timestamp"]))}</time></trkpt>\n'
+        points.append(point)
+    return "".join(points)
+
+async def stream_track(chunks: AsyncIterator[List[dict]], export_format: str, device_id: str) -> AsyncIterator[str]:
+    """DB에서 읽은 위치 청크를 지정한 형식의 텍스트 청크로 변환"""
+    if export_format == "gpx":
+        yield (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<gpx version="1.1" creator="BADA-CALL" xmlns="http://www.topografix.com/GPX/1/1">\n'
+            f'<trk><name>{escape(device_id)}</name><trkseg>\n'
+        )
+
+    first = True
+    async for rows in chunks:
+        if export_format == "ndjson":
+            yield _ndjson_chunk(rows)
+        elif export_format == "csv":
+            yield _csv_chunk(rows, header=first)
+        else:
+            yield _gpx_chunk(rows)
+        first = False
+
+    if export_format == "csv" and first:
+        yield _csv_chunk([], header=True)
+    if export_format == "gpx":
+        yield "</trkseg></trk>\n</gpx>\n"
@@ -68,4 +68,215 @@ DROP POLICY IF EXISTS "Users can view own locations" ON locations;
 DROP POLICY IF EXISTS "Users can insert own locations" ON locations;
 
 CREATE POLICY "Users can view own locations" ON locations FOR SELECT USING (true);
-CREATE POLICY "Users can insert own locations" ON locations FOR INSERT WITH CHECK (true);
\ No newline at end of file
+CREATE POLICY "Users can insert own locations" ON locations FOR INSERT WITH CHECK (true);
+
+-- 기기별 위치/신고 이력 조회용 컬럼/인덱스 (keyset 페이지네이션)
+ALTER TABLE locations ADD COLUMN IF NOT EXISTS device_id TEXT;
+CREATE INDEX IF NOT EXISTS idx_locations_device_timestamp ON locations (device_id, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_reports_user_reported_at ON reports (user_id, reported_at DESC, id DESC);
+
+-- 기기별 위치 통계 (locations insert 트리거로 증분 유지)
+CREATE TABLE IF NOT EXISTS device_location_stats (
+    device_id TEXT PRIMARY KEY,
+    total_count BIGINT NOT NULL DEFAULT 0,
+    first_record TIMESTAMP WITH TIME ZONE,
+    last_record TIMESTAMP WITH TIME ZONE,
+    last_latitude FLOAT,
+    last_longitude FLOAT,
+    distance_km FLOAT NOT NULL DEFAULT 0,
+    max_speed FLOAT,
+    active_seconds FLOAT NOT NULL DEFAULT 0
+);
+
+-- 두 좌표 사이의 거리 (km)
+CREATE OR REPLACE FUNCTION haversine_km(lat1 FLOAT, lon1 FLOAT, lat2 FLOAT, lon2 FLOAT)
+RETURNS FLOAT AS $$
+    SELECT 2 * 6371.0088 * ASIN(SQRT(
+        POWER(SIN(RADIANS(lat2 - lat1) / 2), 2) +
+        COS(RADIANS(lat1)) * COS(RADIANS(lat2)) * POWER(SIN(RADIANS(lon2 - lon1) / 2), 2)
+    ))
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 위치가 저장될 때마다 통계 갱신
+-- 이전 위치와 10분 이내 간격이면 활동 시간으로 집계하고, 늦게 도착한 과거 위치는 거리에 반영하지 않음
+CREATE OR REPLACE FUNCTION update_device_location_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    prev device_location_stats%ROWTYPE;
+    is_latest BOOLEAN;
+    step_km FLOAT := 0;
+    step_seconds FLOAT := 0;
+BEGIN
+    IF NEW.device_id IS NULL THEN
+        RETURN NEW;
+    END IF;
+
+    INSERT INTO device_location_stats (device_id) VALUES (NEW.device_id) ON CONFLICT (device_id) DO NOTHING;
+    SELECT * INTO prev FROM device_location_stats WHERE device_id = NEW.device_id FOR UPDATE;
+
+    is_latest := prev.last_record IS NULL OR NEW.timestamp >= prev.last_record;
+
+    IF prev.last_record IS NOT NULL AND is_latest THEN
+        step_km := haversine_km(prev.last_latitude, prev.last_longitude, NEW.latitude, NEW.longitude);
+        step_seconds := EXTRACT(EPOCH FROM NEW.timestamp - prev.last_record);
+        IF step_seconds > 600 THEN
+            step_seconds := 0;
+        END IF;
+    END IF;
+
+    UPDATE device_location_stats SET
+        total_count = total_count + 1,
+        first_record = LEAST(first_record, NEW.timestamp),
+        last_record = GREATEST(last_record, NEW.timestamp),
+        last_latitude = CASE WHEN is_latest THEN NEW.latitude ELSE last_latitude END,
+        last_longitude = CASE WHEN is_latest THEN NEW.longitude ELSE last_longitude END,
+        distance_km = distance_km + step_km,
+        max_speed = GREATEST(max_speed, NEW.speed),
+        active_seconds = active_seconds + step_seconds
+    WHERE device_id = NEW.device_id;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS trg_update_device_location_stats ON locations;
+CREATE TRIGGER trg_update_device_location_stats
+    AFTER INSERT ON locations
+    FOR EACH ROW EXECUTE FUNCTION update_device_location_stats();
+
+-- 기존 위치 데이터로 통계 초기화 (이미 통계가 있는 기기는 건너뜀)
+INSERT INTO device_location_stats (
+    device_id, total_count, first_record, last_record, last_latitude, last_longitude,
+    distance_km, max_speed, active_seconds
+)
+SELECT
+    device_id,
+    COUNT(*),
+    MIN(timestamp),
+    MAX(timestamp),
+    (ARRAY_AGG(latitude ORDER BY timestamp DESC))[1],
+    (ARRAY_AGG(longitude ORDER BY timestamp DESC))[1],
+    COALESCE(SUM(haversine_km(prev_latitude, prev_longitude, latitude, longitude)), 0),
+    MAX(speed),
+    COALESCE(SUM(CASE WHEN gap_seconds <= 600 THEN gap_seconds ELSE 0 END), 0)
+FROM (
+    SELECT
+        device_id, latitude, longitude, speed, timestamp,
+        LAG(latitude) OVER w AS prev_latitude,
+        LAG(longitude) OVER w AS prev_longitude,
+        EXTRACT(EPOCH FROM timestamp - LAG(timestamp) OVER w) AS gap_seconds
+    FROM locations
+    WHERE device_id IS NOT NULL
+    WINDOW w AS (PARTITION BY device_id ORDER BY timestamp)
+) AS steps
+GROUP BY device_id
+ON CONFLICT (device_id) DO NOTHING;
+
+ALTER TABLE device_location_stats ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Users can view location stats" ON device_location_stats;
+CREATE POLICY "Users can view location stats" ON device_location_stats FOR SELECT USING (true);
+
+-- 자동 감지 원시 센서 구간 (바이너리 형식은 app/detection.py 참고, JSONB보다 4~5배 작음)
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS sensor_blob BYTEA;
+
+-- 온보딩/프로필 저장 RPC (사용자 + 비상연락처를 한 번의 요청, 한 트랜잭션으로 처리)
+ALTER TABLE users ADD COLUMN IF NOT EXISTS device_id TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_device_id ON users (device_id);
+
+CREATE TABLE IF NOT EXISTS emergency_contacts (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_emergency_contacts_user_id ON emergency_contacts (user_id);
+
+-- 사용자 프로필 JSON (users 행 + emergency_contacts 배열)
+CREATE OR REPLACE FUNCTION device_profile(p_user_id UUID)
+RETURNS JSONB AS $$
+    SELECT to_jsonb(u) || jsonb_build_object(
+        'emergency_contacts',
+        COALESCE(
+            (SELECT jsonb_agg(jsonb_build_object('name', c.name, 'phone', c.phone) ORDER BY c.created_at, c.id)
+             FROM emergency_contacts c WHERE c.user_id = u.id),
+            '[]'::jsonb
+        )
+    )
+    FROM (SELECT id, device_id, name, phone, boat_name, boat_number, created_at FROM users WHERE id = p_user_id) u;
+$$ LANGUAGE sql STABLE;
+
+-- 신규 기기 등록: 이미 등록된 기기면 NULL 반환
+CREATE OR REPLACE FUNCTION onboard_device(
+    p_device_id TEXT,
+    p_name TEXT,
+    p_phone TEXT,
+    p_boat_name TEXT DEFAULT NULL,
+    p_boat_number TEXT DEFAULT NULL,
+    p_contacts JSONB DEFAULT '[]'::jsonb
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_user_id UUID;
+BEGIN
+    INSERT INTO users (device_id, name, phone, boat_name, boat_number)
+    VALUES (p_device_id, p_name, p_phone, p_boat_name, p_boat_number)
+    ON CONFLICT (device_id) DO NOTHING
+    RETURNING id INTO v_user_id;
+
+    IF v_user_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- clock_timestamp()로 전달된 순서를 created_at에 보존
+    INSERT INTO emergency_contacts (user_id, name, phone, created_at)
+    SELECT v_user_id, c.name, c.phone, clock_timestamp()
+    FROM jsonb_to_recordset(p_contacts) AS c(name TEXT, phone TEXT);
+
+    RETURN device_profile(v_user_id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- 프로필 수정: 비상연락처는 전달된 목록으로 교체, 등록되지 않은 기기면 NULL 반환
+CREATE OR REPLACE FUNCTION update_device_profile(
+    p_device_id TEXT,
+    p_name TEXT,
+    p_phone TEXT,
+    p_boat_name TEXT DEFAULT NULL,
+    p_boat_number TEXT DEFAULT NULL,
+    p_contacts JSONB DEFAULT '[]'::jsonb
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_user_id UUID;
+BEGIN
+    UPDATE users
+    SET name = p_name, phone = p_phone, boat_name = p_boat_name, boat_number = p_boat_number
+    WHERE device_id = p_device_id
+    RETURNING id INTO v_user_id;
+
+    IF v_user_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    DELETE FROM emergency_contacts WHERE user_id = v_user_id;
+    -- clock_timestamp()로 전달된 순서를 created_at에 보존
+    INSERT INTO emergency_contacts (user_id, name, phone, created_at)
+    SELECT v_user_id, c.name, c.phone, clock_timestamp()
+    FROM jsonb_to_recordset(p_contacts) AS c(name TEXT, phone TEXT);
+
+    RETURN device_profile(v_user_id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- 신고 변경을 Supabase Realtime으로 발행 (외부 배차 시스템의 상태 변경도 SSE 구독자에게 전달)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_publication_tables
+        WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'reports'
+    ) THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE reports;
+    END IF;
+END;
+$$;
@@ -0,0 +1,81 @@
+"""
+DB 쿼리 동시 처리량 벤치마크 (이벤트 루프에서 직접 실행 vs database.execute 스레드 풀)
+
+로컬 PostgREST 대역 서버(postgrest_stub)에 지연을 두고 같은 쿼리를 동시에 보내,
+핸들러에서 query.execute()를 직접 부르던 방식(요청이 직렬화되고 루프가 멈춤)과
+app.database.execute()의 처리 시간과 최대 이벤트 루프 지연을 비교합니다.
+
+    python scripts/bench_db_concurrency.py --latency-ms 50 --concurrency 50 --pool-size 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from postgrest_stub import PostgRESTStub
+
+async def measure(run_queries) -> tuple:
+    """(총 처리 시간 ms, 최대 루프 지연 ms) - 10ms 주기 ticker로 루프 지연 측정"""
+    lags = []
+
+    async def ticker():
+        while True:
+            expected = time.perf_counter() + 0.01
+            await asyncio.sleep(0.01)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await run_queries()
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.02)  # 루프를 붙잡고 있던 동안의 지연이 기록되도록 ticker에 한 번 양보
+    ticking.cancel()
+    return elapsed * 1000, max(lags, default=0.0) * 1000
+
+async def bench(concurrency: int):
+    from app.database import execute, supabase
+
+    def query():
+        return supabase.table("locations").select("*").eq("device_id", "bench-device").limit(1)
+
+    await asyncio.get_running_loop().run_in_executor(None, supabase.connect)
+    await execute(query())  # 연결 수립 비용 제외
+
+    async def blocking_call():
+        # 변경 전: async 핸들러 안에서 동기 client를 직접 호출
+        return query().execute()
+
+    async def before():
+        await asyncio.gather(*[blocking_call() for _ in range(concurrency)])
+
+    async def after():
+        await asyncio.gather(*[execute(query()) for _ in range(concurrency)])
+
+    return await measure(before), await measure(after)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="DB 쿼리 동시 처리량 벤치마크")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    stub = PostgRESTStub(latency_ms=args.latency_ms).start()
+    stub.configure_env()
+    os.environ["DB_POOL_SIZE"] = str(args.pool_size)
+
+    (before_ms, before_lag), (after_ms, after_lag) = asyncio.run(bench(args.concurrency))
+    stub.stop()
+
+    print(f"동시 요청 {args.concurrency}개, DB 지연 {args.latency_ms:.0f} ms, DB_POOL_SIZE={args.pool_size}")
+    print(f"  직접 실행   : {before_ms:8.1f} ms ({args.concurrency / before_ms * 1000:7.1f} req/s), 최대 루프 지연 {before_lag:8.1f} ms")
+    print(f"  스레드 풀   : {after_ms:8.1f} ms ({args.concurrency / after_ms * 1000:7.1f} req/s), 최대 루프 지연 {after_lag:8.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
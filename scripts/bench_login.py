@@ -0,0 +1,109 @@
+"""
+로그인 처리량 부하 테스트 (bcrypt 스레드 풀 워커 수별)
+
+로컬 PostgREST 대역 서버(postgrest_stub)에 사용자 한 명을 두고 app.auth.authenticate_user를 동시에 호출하여
+초당 로그인 수와 최대 이벤트 루프 지연을 측정합니다. PASSWORD_HASH_WORKERS는 import 시점에 읽으므로
+워커 수마다 새 프로세스에서 측정하며, "루프에서 직접"은 변경 전처럼 이벤트 루프에서 bcrypt를 실행한 경우입니다.
+bcrypt는 해시 계산 중 GIL을 해제하므로 처리량은 CPU 코어 수까지 늘어납니다.
+
+    python scripts/bench_login.py --rounds 10 --logins 32 --workers 1,2,4,8
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from postgrest_stub import PostgRESTStub
+
+PHONE = "010-0000-0000"
+PASSWORD = "bench-password"
+
+async def measure_logins(stub: PostgRESTStub, logins: int, inline: bool) -> dict:
+    """동시 로그인 처리 시간과 최대 이벤트 루프 지연 (10ms 주기 ticker로 측정)"""
+    from app import auth
+
+    stub.rows["users"] = [{"id": "bench-user", "phone": PHONE, "password_hash": auth.get_password_hash(PASSWORD)}]
+
+    async def login():
+        if inline:
+            # 변경 전: async 함수 안에서 bcrypt 검증을 직접 실행
+            user = await auth.get_user_by_phone(PHONE)
+            return auth.verify_password(PASSWORD, user["password_hash"])
+        return await auth.authenticate_user(PHONE, PASSWORD)
+
+    lags = []
+
+    async def ticker():
+        while True:
+            expected = time.perf_counter() + 0.01
+            await asyncio.sleep(0.01)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    await login()  # client 생성, 연결 수립 제외
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    results = await asyncio.gather(*[login() for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.02)  # 루프를 붙잡고 있던 동안의 지연이 기록되도록 ticker에 한 번 양보
+    ticking.cancel()
+    return {"elapsed": elapsed, "max_lag": max(lags, default=0.0), "ok": sum(1 for result in results if result)}
+
+def child(args) -> int:
+    stub = PostgRESTStub(latency_ms=args.latency_ms).start()
+    stub.configure_env()
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.child_workers)
+    os.environ["PASSWORD_HASH_QUEUE_SIZE"] = str(args.logins)
+
+    measured = asyncio.run(measure_logins(stub, args.logins, args.inline))
+    stub.stop()
+    print(json.dumps(measured))
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="로그인 처리량 부하 테스트")
+    parser.add_argument("--rounds", type=int, default=10, help="BCRYPT_ROUNDS")
+    parser.add_argument("--logins", type=int, default=32, help="동시 로그인 수")
+    parser.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 1}", help="측정할 PASSWORD_HASH_WORKERS 목록")
+    parser.add_argument("--latency-ms", type=float, default=5, help="DB 지연")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--child-workers", type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--inline", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args)
+
+    print(f"동시 로그인 {args.logins}회, BCRYPT_ROUNDS={args.rounds}, CPU 코어 {os.cpu_count()}개")
+    runs = [("루프에서 직접", 1, True)] + [
+        (f"워커 {workers}개", workers, False)
+        for workers in sorted({int(value) for value in args.workers.split(",")})
+    ]
+    for label, workers, inline in runs:
+        command = [
+            sys.executable, os.path.abspath(__file__), "--child",
+            "--child-workers", str(workers),
+            "--rounds", str(args.rounds),
+            "--logins", str(args.logins),
+            "--latency-ms", str(args.latency_ms)
+        ] + (["--inline"] if inline else [])
+        result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stderr[-2000:])
+            return 1
+        measured = json.loads(result.stdout.strip().splitlines()[-1])
+        print(
+            f"  {label:<12} {measured['elapsed'] * 1000:8.1f} ms  {args.logins / measured['elapsed']:7.1f} 로그인/s  "
+            f"최대 루프 지연 {measured['max_lag'] * 1000:7.1f} ms  (성공 {measured['ok']}/{args.logins})"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+온보딩/프로필 수정 지연 벤치마크 (순차 쿼리 vs RPC 한 번)
+
+로컬 PostgREST 대역 서버(postgrest_stub)에 DB 왕복 지연을 두고,
+변경 전 핸들러가 보내던 순차 쿼리(온보딩 4회, 프로필 수정 7회)와
+현재 setup_onboarding / update_profile 핸들러(RPC 1회)의 요청 처리 시간과 DB 요청 수를 비교합니다.
+
+    python scripts/bench_onboarding.py --latency-ms 20,50,100
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from postgrest_stub import PostgRESTStub
+
+DEVICE_ID = "bench-device"
+
+async def bench(stub: PostgRESTStub, repeat: int) -> dict:
+    from app.database import execute, supabase
+    from app.models import OnboardingData
+    from app.routers import onboarding
+
+    data = OnboardingData(
+        device_id=DEVICE_ID,
+        name="홍길동",
+        phone="010-0000-0000",
+        boat_name="바다호",
+        boat_number="BN-1",
+        emergency_contact_1_name="가족",
+        emergency_contact_1_phone="010-1111-1111",
+        emergency_contact_2_name="선주",
+        emergency_contact_2_phone="010-2222-2222"
+    )
+    profile = {
+        "id": "bench-user",
+        "device_id": DEVICE_ID,
+        "name": data.name,
+        "phone": data.phone,
+        "boat_name": data.boat_name,
+        "boat_number": data.boat_number,
+        "emergency_contacts": [{"name": "가족", "phone": "010-1111-1111"}, {"name": "선주", "phone": "010-2222-2222"}],
+        "created_at": "2026-01-01T00:00:00+00:00"
+    }
+    stub.rpc["onboard_device"] = profile
+    stub.rpc["update_device_profile"] = profile
+    user = {key: value for key, value in profile.items() if key != "emergency_contacts"}
+    contacts = [{"user_id": "bench-user", **contact} for contact in profile["emergency_contacts"]]
+
+    async def sequential_setup():
+        # 변경 전 setup_onboarding: 기존 기기 확인 → 사용자 → 비상연락처 2건
+        await execute(supabase.table("users").select("*").eq("device_id", DEVICE_ID))
+        await execute(supabase.table("users").insert(user))
+        for contact in contacts:
+            await execute(supabase.table("emergency_contacts").insert(contact))
+
+    async def sequential_update():
+        # 변경 전 update_profile: 확인 → 수정 → 연락처 삭제 → 2건 추가 → get_profile(사용자, 연락처)
+        await execute(supabase.table("users").select("*").eq("device_id", DEVICE_ID))
+        await execute(supabase.table("users").update(user).eq("device_id", DEVICE_ID))
+        await execute(supabase.table("emergency_contacts").delete().eq("user_id", "bench-user"))
+        for contact in contacts:
+            await execute(supabase.table("emergency_contacts").insert(contact))
+        await execute(supabase.table("users").select("*").eq("device_id", DEVICE_ID))
+        await execute(supabase.table("emergency_contacts").select("*").eq("user_id", "bench-user"))
+
+    async def rpc_setup():
+        await onboarding.setup_onboarding(data)
+
+    async def rpc_update():
+        await onboarding.update_profile(DEVICE_ID, data)
+
+    async def measure(call) -> tuple:
+        """(중앙값 ms, 요청당 DB 요청 수)"""
+        samples = []
+        requests = stub.requests
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await call()
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        return samples[len(samples) // 2], (stub.requests - requests) / repeat
+
+    await execute(supabase.table("users").select("id").limit(1))  # client 생성, 연결 수립 제외
+    return {
+        "온보딩": (await measure(sequential_setup), await measure(rpc_setup)),
+        "프로필 수정": (await measure(sequential_update), await measure(rpc_update))
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="온보딩 순차 쿼리 vs RPC 벤치마크")
+    parser.add_argument("--latency-ms", default="20,50,100", help="DB 왕복 지연 목록")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stub = PostgRESTStub().start()
+    stub.configure_env()
+    for latency_ms in [float(value) for value in args.latency_ms.split(",")]:
+        stub.latency_ms = latency_ms
+        results = asyncio.run(bench(stub, args.repeat))
+        print(f"DB 지연 {latency_ms:.0f} ms")
+        for name, ((before_ms, before_calls), (after_ms, after_calls)) in results.items():
+            print(
+                f"  {name:<8} 순차 {before_ms:7.1f} ms ({before_calls:.0f}회)  →  RPC {after_ms:7.1f} ms ({after_calls:.0f}회)"
+                f"  {before_ms / after_ms:4.1f}배"
+            )
+    stub.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+위치 기록 페이지네이션 벤치마크 (offset vs keyset 커서)
+
+한 기기의 위치 N행(기본 100만)을 (device_id, timestamp, id) 인덱스가 있는 SQLite 메모리 DB에 넣고,
+여러 깊이의 페이지를 offset 방식과 app.pagination의 커서 방식으로 읽는 시간을 비교합니다.
+커서 조건은 apply_keyset이 PostgREST에 보내는 필터와 같은 모양입니다
+(timestamp <= t AND (timestamp < t OR (timestamp = t AND id < i))).
+--without-bound는 범위 조건 없이 OR 조건만 쓴 경우(인덱스를 처음부터 읽고 거름)를 함께 측정합니다.
+
+SQLite는 PostgreSQL의 B-tree 인덱스 대역이므로 절대 시간은 다르지만,
+offset은 건너뛴 행 수에 비례하고 커서는 깊이와 무관하다는 차이는 같습니다.
+
+    python scripts/bench_pagination.py --rows 1000000 --limit 100
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.pagination import decode_cursor, encode_cursor
+
+DEVICE_ID = "bench-device"
+
+COLUMNS = "id, device_id, latitude, longitude, timestamp"
+OFFSET_SQL = f"SELECT {COLUMNS} FROM locations WHERE device_id = ? ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
+KEYSET_SQL = (
+    f"SELECT {COLUMNS} FROM locations WHERE device_id = ? "
+    "AND timestamp <= ? AND (timestamp < ? OR (timestamp = ? AND id < ?)) "
+    "ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+UNBOUNDED_KEYSET_SQL = (
+    f"SELECT {COLUMNS} FROM locations WHERE device_id = ? "
+    "AND (timestamp < ? OR (timestamp = ? AND id < ?)) "
+    "ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+
+def create_locations(rows: int) -> sqlite3.Connection:
+    """rows개의 위치 기록 생성 (다른 기기 행도 섞어서 인덱스 범위 탐색이 필요하도록 함)"""
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE locations (id TEXT PRIMARY KEY, device_id TEXT, latitude REAL, longitude REAL, timestamp TEXT)")
+    started = datetime(2026, 1, 1)
+
+    def generate():
+        for i in range(rows):
+            # 1초 간격, 같은 timestamp가 있어도 id로 순서가 정해지도록 2행씩 같은 시각 사용
+            timestamp = (started + timedelta(seconds=i // 2)).isoformat()
+            yield (f"{i:08d}", DEVICE_ID, 35.0 + i * 1e-6, 129.0, timestamp)
+            if i % 10 == 0:
+                yield (f"o{i:08d}", "other-device", 35.0, 129.0, timestamp)
+
+    db.executemany("INSERT INTO locations VALUES (?, ?, ?, ?, ?)", generate())
+    db.execute("CREATE INDEX idx_locations_device_timestamp_id ON locations (device_id, timestamp DESC, id DESC)")
+    db.commit()
+    return db
+
+def timed(db: sqlite3.Connection, sql: str, params: tuple, repeat: int) -> float:
+    """중앙값 실행 시간 (ms)"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        db.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="offset vs keyset 페이지네이션 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--without-bound", action="store_true", help="범위 조건 없는 커서 조건도 측정")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = create_locations(args.rows)
+    print(f"위치 {args.rows:,}행 생성: {time.perf_counter() - started:.1f} s, 페이지 크기 {args.limit}")
+    header = f"  {'깊이(건너뛴 행)':>16}  {'offset':>10}  {'커서':>10}"
+    print(header + (f"  {'커서(OR만)':>10}" if args.without_bound else ""))
+
+    depths = [0, 1_000, 10_000, 100_000, args.rows // 2, args.rows - args.limit]
+    for depth in sorted({d for d in depths if 0 <= d < args.rows}):
+        offset_ms = timed(db, OFFSET_SQL, (DEVICE_ID, args.limit, depth), args.repeat)
+
+        unbounded_ms = None
+        if depth == 0:
+            keyset_ms = timed(db, OFFSET_SQL, (DEVICE_ID, args.limit, 0), args.repeat)
+        else:
+            # 직전 페이지 마지막 행으로 커서를 만들고 API와 같은 방식으로 해석 (측정 제외)
+            row_id, timestamp = db.execute(
+                "SELECT id, timestamp FROM locations WHERE device_id = ? ORDER BY timestamp DESC, id DESC LIMIT 1 OFFSET ?",
+                (DEVICE_ID, depth - 1)
+            ).fetchone()
+            sort_value, cursor_id = decode_cursor(encode_cursor(timestamp, row_id))
+            keyset_ms = timed(db, KEYSET_SQL, (DEVICE_ID, sort_value, sort_value, sort_value, cursor_id, args.limit), args.repeat)
+            if args.without_bound:
+                unbounded_ms = timed(db, UNBOUNDED_KEYSET_SQL, (DEVICE_ID, sort_value, sort_value, cursor_id, args.limit), args.repeat)
+
+        line = f"  {depth:>16,}  {offset_ms:>7.2f} ms  {keyset_ms:>7.2f} ms"
+        if args.without_bound:
+            line += f"  {unbounded_ms:>7.2f} ms" if unbounded_ms is not None else f"  {'-':>10}"
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
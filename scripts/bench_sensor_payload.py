@@ -0,0 +1,88 @@
+"""
+자동 감지 센서 구간 업로드 형식 벤치마크 (JSON vs 바이너리)
+
+같은 센서 구간(가속도 + 자이로)을 기존 JSON 본문과 application/vnd.badacall.sensor-window 바이너리로 만들어
+전송 크기(gzip 포함), 서버 파싱 시간, 저장 크기를 비교합니다.
+
+- JSON 파싱: json.loads + AutoDetectionReport 검증 + float32 배열 변환 (라우터와 같은 경로)
+- 바이너리 파싱: decode_sensor_blob (memoryview 위의 np.frombuffer, 복사 없음)
+- 저장: 기존 sensor_data JSONB의 window 크기 vs sensor_blob BYTEA 크기
+
+    python scripts/bench_sensor_payload.py --samples 100,500,2000,6000
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.detection import decode_sensor_blob, encode_sensor_blob
+from app.models import AutoDetectionReport
+
+def make_window(samples: int, seed: int = 0) -> dict:
+    """휴대폰 센서처럼 float64 값이 그대로 직렬화되는 구간 (중력 + 잡음)"""
+    rng = np.random.default_rng(seed)
+    accelerometer = rng.normal(0.0, 0.5, (samples, 3)) + [0.0, 0.0, 9.80665]
+    gyroscope = rng.normal(0.0, 0.05, (samples, 3))
+    return {"sample_rate_hz": 100.0, "accelerometer": accelerometer.tolist(), "gyroscope": gyroscope.tolist()}
+
+def timed(func, repeat: int) -> float:
+    """중앙값 실행 시간 (ms)"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def parse_json(body: bytes):
+    report = AutoDetectionReport(**json.loads(body))
+    window = report.sensor_window.model_dump()
+    return np.asarray(window["accelerometer"], dtype="<f4"), np.asarray(window["gyroscope"], dtype="<f4")
+
+def parse_binary(body: bytes):
+    window = decode_sensor_blob(body)
+    return window["accelerometer"], window["gyroscope"]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="센서 구간 JSON vs 바이너리 벤치마크")
+    parser.add_argument("--samples", default="100,500,2000,6000", help="구간당 샘플 수 목록")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'샘플':>6}  {'JSON':>9}  {'gzip':>8}  {'바이너리':>8}  {'gzip':>8}  {'JSON 파싱':>10}  {'바이너리 파싱':>10}  {'JSONB':>9}  {'BYTEA':>8}")
+    for samples in [int(value) for value in args.samples.split(",")]:
+        window = make_window(samples)
+        json_body = json.dumps({
+            "device_id": "bench-device",
+            "location_latitude": 35.1,
+            "location_longitude": 129.0,
+            "sensor_window": window
+        }).encode("utf-8")
+        binary_body = encode_sensor_blob(window)
+
+        # 두 경로가 같은 배열을 만드는지 확인
+        json_arrays, binary_arrays = parse_json(json_body), parse_binary(binary_body)
+        assert all(np.array_equal(a, b) for a, b in zip(json_arrays, binary_arrays))
+
+        json_ms = timed(lambda: parse_json(json_body), args.repeat)
+        binary_ms = timed(lambda: parse_binary(binary_body), args.repeat)
+        jsonb_bytes = len(json.dumps(window, separators=(",", ":")))
+
+        print(
+            f"{samples:>6}  {len(json_body) / 1024:>6.1f} KB  {len(gzip.compress(json_body)) / 1024:>5.1f} KB  "
+            f"{len(binary_body) / 1024:>5.1f} KB  {len(gzip.compress(binary_body)) / 1024:>5.1f} KB  "
+            f"{json_ms:>7.3f} ms  {binary_ms * 1000:>9.1f} us  "
+            f"{jsonb_bytes / 1024:>6.1f} KB  {len(binary_body) / 1024:>5.1f} KB"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+콜드 스타트 import 시간 점검
+
+`python -X importtime -c "import app.main"`을 새 프로세스에서 실행하여 import에 걸린 시간을 측정하고,
+예산(STARTUP_IMPORT_BUDGET_MS 또는 --budget-ms)을 넘으면 종료 코드 1을 반환합니다.
+
+    python scripts/check_startup_time.py --budget-ms 1500 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_imports(module: str, runs: int):
+    """module import 시간(ms)과 가장 느린 최상위 패키지 목록 (여러 번 측정한 중앙값 기준)"""
+    totals = []
+    slowest = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+
+        # 형식: "import time: self [us] | cumulative | imported package" (모듈마다 한 줄)
+        cumulative_ms = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+            cumulative_ms[name.strip()] = int(cumulative) / 1000
+
+        totals.append(cumulative_ms[module])
+        # 최상위 패키지(fastapi, numpy 등)별 누적 시간
+        for name, ms in cumulative_ms.items():
+            if "." not in name and not name.startswith("_"):
+                slowest.setdefault(name, []).append(ms)
+
+    totals.sort()
+    median = totals[len(totals) // 2]
+    ranked = sorted(((sorted(v)[len(v) // 2], k) for k, v in slowest.items() if k != module), reverse=True)
+    return median, ranked
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="app import 시간 예산 점검")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500")))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    total, ranked = measure_imports(args.module, args.runs)
+    print(f"{args.module} import: {total:.1f} ms (예산 {args.budget_ms:.0f} ms, {args.runs}회 중앙값)")
+    for ms, name in ranked[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if total > args.budget_ms:
+        print(f"❌ import 시간이 예산을 {total - args.budget_ms:.1f} ms 초과했습니다")
+        return 1
+    print("✅ 예산 이내")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
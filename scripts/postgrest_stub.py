@@ -0,0 +1,90 @@
+"""
+벤치마크용 로컬 PostgREST 대역 서버
+
+실제 Supabase 없이 app.database가 만든 HTTP 요청을 그대로 받아, 요청마다 정해진 지연(latency)을 둔 뒤
+PostgREST와 같은 모양의 JSON을 돌려줍니다. 스레드 방식 서버라 동시 요청은 동시에 처리됩니다.
+
+- GET /rest/v1/<table>: rows[table] (기본 빈 목록)
+- POST/PATCH /rest/v1/<table>: 받은 행을 그대로 반환
+- DELETE /rest/v1/<table>: 빈 목록
+- POST /rest/v1/rpc/<function>: rpc[function] (기본 null)
+
+app 모듈을 import하기 전에 start()로 서버를 띄우고 configure_env()로 SUPABASE_URL을 지정해야 합니다.
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# 형식만 맞춘 anon key (supabase SDK가 JWT 모양인지 확인함)
+STUB_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.stub"
+
+class PostgRESTStub:
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.rows: Dict[str, list] = {}
+        self.rpc: Dict[str, object] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "PostgRESTStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive (연결 풀 재사용)
+            disable_nagle_algorithm = True  # 헤더와 본문을 나눠 쓸 때 delayed ACK로 40ms씩 밀리지 않도록
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self):
+                with stub._lock:
+                    stub.requests += 1
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                time.sleep(stub.latency_ms / 1000)
+
+                path = self.path.split("?", 1)[0].removeprefix("/rest/v1/")
+                if path.startswith("rpc/"):
+                    data = stub.rpc.get(path[len("rpc/"):])
+                elif self.command == "GET":
+                    data = stub.rows.get(path, [])
+                elif self.command in ("POST", "PATCH"):
+                    data = body if isinstance(body, list) else [body]
+                else:
+                    data = []
+
+                payload = json.dumps(data).encode("utf-8")
+                self.send_response(200 if self.command != "POST" or path.startswith("rpc/") else 201)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _respond
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def configure_env(self):
+        """app.config가 이 서버를 바라보도록 환경 변수 설정 (app import 전에 호출)"""
+        os.environ["SUPABASE_URL"] = self.url
+        os.environ["SUPABASE_KEY"] = STUB_KEY
+        os.environ["HTTP2"] = "false"
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        os.environ.setdefault("LOG_FORMAT", "text")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# app.config는 import 시점에 환경 변수를 읽으므로 app 모듈보다 먼저 설정
+os.environ.setdefault("REPORT_WAL_DIR", tempfile.mkdtemp(prefix="report-wal-"))
+os.environ.setdefault("LOG_FORMAT", "text")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,98 @@
+import asyncio
+import random
+from typing import Dict, Optional, Set
+import httpx
+from postgrest.exceptions import APIError
+
+class FlakyReportStore:
+    """
+    연결이 끊기는 DB를 흉내 낸 reports 저장소 (write-ahead log 재전송용 write 함수 제공)
+
+    - drop_rate 비율의 요청은 저장 전에 연결이 끊김
+    - late_rate 비율의 요청은 저장된 뒤 응답이 끊김 (timeout 뒤에 늦게 저장된 경우)
+    - poison_ids의 신고는 항상 연결이 끊기고, invalid_ids의 신고는 제약 조건 위반으로 실패
+    - id가 이미 있으면 upsert(ignore_duplicates=True)처럼 아무것도 바꾸지 않고 None 반환
+    """
+
+    def __init__(self, drop_rate: float = 0.0, late_rate: float = 0.0, seed: int = 0):
+        self.rows: Dict[str, dict] = {}
+        self.attempts: Dict[str, int] = {}
+        self.drop_rate = drop_rate
+        self.late_rate = late_rate
+        self.poison_ids: Set[str] = set()
+        self.invalid_ids: Set[str] = set()
+        self._random = random.Random(seed)
+
+    async def write(self, report: dict) -> Optional[dict]:
+        report_id = report["id"]
+        self.attempts[report_id] = self.attempts.get(report_id, 0) + 1
+        await asyncio.sleep(0)
+
+        if report_id in self.invalid_ids:
+            raise APIError({"code": "23502", "message": "null value in column violates not-null constraint"})
+        if report_id in self.poison_ids or self._random.random() < self.drop_rate:
+            raise httpx.ConnectError("connection dropped")
+
+        if report_id in self.rows:
+            return None
+        self.rows[report_id] = dict(report)
+        if self._random.random() < self.late_rate:
+            raise httpx.ReadTimeout("response lost")
+        return self.rows[report_id]
+
+def make_report(report_id: str, **fields) -> dict:
+    return {
+        "id": report_id,
+        "device_id": "device-1",
+        "type": "manual",
+        "status": "pending",
+        "location_latitude": 35.1,
+        "location_longitude": 129.0,
+        "reported_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+        **fields
+    }
+
+class FakeQuery:
+    def __init__(self, table: str, op: str, data=None, **options):
+        self.table = table
+        self.op = op
+        self.data = data
+        self.options = options
+        self.filters = {}
+
+    def eq(self, column: str, value):
+        self.filters[column] = value
+        return self
+
+    def order(self, column: str, **options):
+        return self
+
+    def limit(self, count: int):
+        return self
+
+class FakeTable:
+    def __init__(self, name: str):
+        self.name = name
+
+    def insert(self, data):
+        return FakeQuery(self.name, "insert", data)
+
+    def upsert(self, data, **options):
+        return FakeQuery(self.name, "upsert", data, **options)
+
+    def select(self, *columns):
+        return FakeQuery(self.name, "select", columns)
+
+    def update(self, data):
+        return FakeQuery(self.name, "update", data)
+
+class FakeSupabase:
+    """supabase.table(...) 쿼리 빌더 흉내 - 실행은 테스트가 바꿔 끼운 execute가 담당"""
+
+    def table(self, name: str) -> FakeTable:
+        return FakeTable(name)
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+from app import auth
+from app.config import settings
+from app.routers import auth as auth_router
+from fakes import FakeResponse, FakeSupabase
+
+USER = {
+    "id": "user-1",
+    "name": "홍길동",
+    "phone": "010-0000-0000",
+    "boat_name": "바다호",
+    "boat_number": "BN-1",
+    "created_at": "2026-01-01T00:00:00+00:00"
+}
+
+@pytest.fixture
+def users(monkeypatch):
+    """users 테이블 흉내 - DB 조회 횟수도 기록"""
+    rows = {USER["id"]: dict(USER)}
+    lookups = []
+
+    async def execute(query):
+        lookups.append(query.filters)
+        return FakeResponse([row for row in rows.values() if all(row.get(k) == v for k, v in query.filters.items())])
+
+    monkeypatch.setattr(settings, "secret_key", "test-secret-key-with-enough-length")
+    monkeypatch.setattr(settings, "jwt_stateless", False)
+    monkeypatch.setattr(auth, "supabase", FakeSupabase())
+    monkeypatch.setattr(auth, "execute", execute)
+    auth._verified_tokens.clear()
+    return rows, lookups
+
+def current_user(token: str) -> dict:
+    return asyncio.run(auth.get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)))
+
+def test_verified_token_is_cached(users):
+    _, lookups = users
+    token = auth.create_access_token(auth.user_claims(USER))
+
+    assert current_user(token)["id"] == "user-1"
+    assert current_user(token)["id"] == "user-1"
+    assert len(lookups) == 1
+
+def test_stateless_mode_uses_claims_without_database(users, monkeypatch):
+    _, lookups = users
+    monkeypatch.setattr(settings, "jwt_stateless", True)
+    token = auth.create_access_token(auth.user_claims(USER))
+
+    assert current_user(token)["boat_name"] == "바다호"
+    assert lookups == []
+
+def test_logout_revocation_survives_many_other_revocations(users):
+    token = auth.create_access_token(auth.user_claims(USER))
+    current_user(token)
+    auth.revoke_token(token)
+
+    # 캐시 크기 제한보다 많은 토큰을 폐기해도 먼저 폐기한 토큰이 다시 유효해지지 않아야 함
+    for _ in range(settings.token_cache_max_entries + 10):
+        auth.revoke_token(auth.create_access_token(auth.user_claims(USER)))
+
+    with pytest.raises(HTTPException) as error:
+        current_user(token)
+    assert error.value.status_code == 401
+
+@pytest.fixture
+def client(users, monkeypatch):
+    monkeypatch.setattr(auth_router, "get_user_by_id", auth.get_user_by_id)
+    monkeypatch.setattr(settings, "jwt_stateless", True)
+    app = FastAPI()
+    app.include_router(auth_router.router)
+    return TestClient(app)
+
+def test_stateless_refresh_rechecks_user_and_revokes_old_token(client, users):
+    rows, lookups = users
+    token = auth.create_access_token(auth.user_claims(USER))
+
+    response = client.post("/auth/refresh", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert lookups == [{"id": "user-1"}]
+    refreshed = response.json()["access_token"]
+
+    # 이전 토큰은 폐기되어 다시 갱신할 수 없음
+    assert client.post("/auth/refresh", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+    # 삭제된 사용자는 클레임이 남아 있어도 갱신할 수 없음
+    del rows["user-1"]
+    assert client.post("/auth/refresh", headers={"Authorization": f"Bearer {refreshed}"}).status_code == 401
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.database import LazySupabaseClient, execute
+from fakes import FakeResponse
+
+class ExecutableQuery:
+    def __init__(self, table: str, columns: tuple):
+        self.path = f"/{table}"
+        self.columns = columns
+        self.filters = []
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def execute(self):
+        return FakeResponse([{"table": self.path, "columns": self.columns, "filters": self.filters}])
+
+class ExecutableTable:
+    def __init__(self, name: str):
+        self.name = name
+
+    def select(self, *columns):
+        return ExecutableQuery(self.name, columns)
+
+class ExecutableClient:
+    def table(self, name: str) -> ExecutableTable:
+        return ExecutableTable(name)
+
+class SlowLazyClient(LazySupabaseClient):
+    """SDK import와 create_client처럼 오래 걸리는 client 생성을 흉내 냄"""
+
+    def __init__(self, delay: float):
+        super().__init__("http://localhost", "key")
+        self.delay = delay
+        self.connect_threads = []
+
+    def connect(self):
+        if self._client is None:
+            self.connect_threads.append(threading.get_ident())
+            time.sleep(self.delay)
+            self._client = ExecutableClient()
+        return self._client
+
+def test_query_before_connect_does_not_block_loop():
+    client = SlowLazyClient(delay=0.3)
+
+    async def main():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        query = client.table("users").select("id").eq("device_id", "device-1")
+        built = time.perf_counter() - started
+        response = await execute(query)
+        ticking.cancel()
+        return built, ticks, response
+
+    built, ticks, response = asyncio.run(main())
+
+    assert built < 0.05
+    assert client.connect_threads and client.connect_threads[0] != threading.get_ident()
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.2
+    assert response.data == [{"table": "/users", "columns": ("id",), "filters": [("device_id", "device-1")]}]
+
+def test_query_after_connect_uses_client_directly():
+    client = SlowLazyClient(delay=0)
+    client.connect()
+
+    assert isinstance(client.table("users"), ExecutableTable)
+
+def test_failed_client_raises():
+    client = LazySupabaseClient("http://localhost", "key")
+    client._failed = True
+
+    with pytest.raises(RuntimeError):
+        client.table("users")
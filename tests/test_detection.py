@@ -0,0 +1,70 @@
+import asyncio
+import math
+from datetime import datetime
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from app.detection import decode_sensor_blob, encode_sensor_blob, score_windows, to_bytea
+from app.models import AutoDetectionReport, DetectionRescoreJob, JobStatus
+from app.routers import reports
+from fakes import FakeResponse, FakeSupabase
+
+def window(**overrides) -> dict:
+    samples = [[0.0, 0.0, 9.8]] * 50
+    return {"sample_rate_hz": 50.0, "accelerometer": samples, "gyroscope": None, **overrides}
+
+def test_scores_are_probabilities():
+    result = score_windows([window()])[0]
+    assert 0.0 <= result["accident_probability"] <= 1.0
+    assert all(math.isfinite(value) for value in result.values() if isinstance(value, float))
+
+@pytest.mark.parametrize("sample_rate", [0.0, -50.0, math.nan, math.inf])
+def test_rejects_invalid_sample_rates(sample_rate):
+    with pytest.raises(ValueError):
+        score_windows([window(sample_rate_hz=sample_rate)])
+
+@pytest.mark.parametrize("bad_value", [math.nan, math.inf, -math.inf])
+def test_rejects_non_finite_samples(bad_value):
+    samples = [[0.0, 0.0, 9.8]] * 49 + [[bad_value, 0.0, 9.8]]
+    with pytest.raises(ValueError):
+        score_windows([window(accelerometer=samples)])
+    with pytest.raises(ValueError):
+        score_windows([window(gyroscope=samples)])
+
+def test_rejects_values_that_overflow():
+    samples = [[1e308, 1e308, 1e308], [-1e308, -1e308, -1e308]] * 25
+    with pytest.raises(ValueError):
+        score_windows([window(accelerometer=samples)])
+
+def test_rejects_non_finite_binary_windows():
+    blob = bytearray(encode_sensor_blob(window()))
+    # 헤더의 sample_rate_hz(f32, offset 8)를 NaN으로 변경
+    blob[8:12] = np.float32(np.nan).tobytes()
+    with pytest.raises(ValueError):
+        score_windows([decode_sensor_blob(bytes(blob))])
+
+def test_rejects_non_finite_client_probability():
+    with pytest.raises(ValidationError):
+        AutoDetectionReport(device_id="device-1", location_latitude=35.1, location_longitude=129.0, accident_probability=math.nan)
+
+def test_rescore_handles_reports_without_sensor_data(monkeypatch):
+    blob = to_bytea(encode_sensor_blob(window()))
+    rows = [
+        {"id": "r1", "reported_at": "2026-01-01T00:00:00+00:00", "sensor_data": None, "sensor_blob": blob},
+        {"id": "r2", "reported_at": "2026-01-01T00:01:00+00:00", "sensor_data": {"detection": None}, "sensor_blob": blob}
+    ]
+    updates = {}
+
+    async def fake_execute(query):
+        if query.op == "update":
+            updates[query.filters["id"]] = query.data
+            return FakeResponse([])
+        return FakeResponse(rows)
+
+    monkeypatch.setattr(reports, "supabase", FakeSupabase())
+    monkeypatch.setattr(reports, "execute", fake_execute)
+    job = DetectionRescoreJob(job_id="job-1", status=JobStatus.RUNNING, model_version="test", started_at=datetime.utcnow())
+    asyncio.run(reports._rescore_reports(job))
+    assert job.rescored == 2
+    assert set(updates) == {"r1", "r2"}
+    assert all(set(update["sensor_data"]) == {"detection"} for update in updates.values())
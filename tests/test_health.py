@@ -0,0 +1,45 @@
+import asyncio
+import httpx
+import pytest
+from app import health
+from app.report_wal import ReportWriteAheadLog
+from fakes import FakeSupabase
+
+@pytest.fixture
+def probe(tmp_path, monkeypatch):
+    wal = ReportWriteAheadLog(
+        directory=str(tmp_path),
+        segment_max_bytes=64 * 1024,
+        fsync_interval=0.001,
+        replay_grace=60.0,
+        initial_backoff=0.01,
+        max_backoff=0.05
+    )
+    monkeypatch.setattr(health, "report_wal", wal)
+    monkeypatch.setattr(health, "supabase", FakeSupabase())
+
+    async def execute(query):
+        raise httpx.ConnectError("database unreachable")
+    monkeypatch.setattr(health, "execute", execute)
+    yield health.ReadinessProbe(cache_seconds=0, db_timeout=0.5), wal
+    asyncio.run(wal.close())
+
+def test_unreachable_database_is_degraded_while_wal_is_writable(probe):
+    readiness, wal = probe
+    wal.open()
+
+    result = asyncio.run(readiness.check())
+
+    assert result["status"] == health.STATUS_DEGRADED
+    assert result["checks"]["database"]["status"] == health.STATUS_DEGRADED
+    assert result["checks"]["report_wal"]["writable"] is True
+
+def test_unreachable_database_is_unavailable_without_wal(probe):
+    readiness, wal = probe
+    wal.open()
+    wal.last_sync_error = "OSError(28, 'No space left on device')"
+
+    result = asyncio.run(readiness.check())
+
+    assert result["status"] == health.STATUS_UNAVAILABLE
+    assert result["checks"]["report_wal"]["last_sync_error"]
@@ -0,0 +1,51 @@
+import asyncio
+from app.idempotency import ReportIdempotencyStore
+from app.routers.reports import _to_report_response
+from fakes import make_report
+
+def make_store():
+    return ReportIdempotencyStore(ttl_seconds=60, max_entries=100, window_seconds=60, position_decimals=4)
+
+def create_in_order(store, keys_list):
+    created = []
+
+    async def main():
+        results = []
+        for keys in keys_list:
+            async def create():
+                report = _to_report_response(make_report(f"r{len(created) + 1}"))
+                created.append(report.id)
+                return report
+            results.append((await store.run(keys, create)).id)
+        return results
+
+    return asyncio.run(main()), created
+
+def test_explicit_keys_do_not_fall_back_to_position():
+    store = make_store()
+    first = store.keys_for("device-1", "emergency", 37.5665, 126.978, "key-a")
+    second = store.keys_for("device-1", "emergency", 37.5665, 126.978, "key-b")
+
+    results, created = create_in_order(store, [first, second])
+
+    assert results == ["r1", "r2"]
+    assert created == ["r1", "r2"]
+
+def test_same_explicit_key_returns_first_report():
+    store = make_store()
+    keys = store.keys_for("device-1", "emergency", 37.5665, 126.978, "key-a")
+
+    results, created = create_in_order(store, [keys, keys])
+
+    assert results == ["r1", "r1"]
+    assert created == ["r1"]
+
+def test_position_dedup_without_key():
+    store = make_store()
+    first = store.keys_for("device-1", "emergency", 37.5665, 126.978)
+    second = store.keys_for("device-1", "emergency", 37.56651, 126.97801)
+
+    results, created = create_in_order(store, [first, second])
+
+    assert results == ["r1", "r1"]
+    assert created == ["r1"]
@@ -0,0 +1,68 @@
+import asyncio
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+from app import location_buffer as location_buffer_module
+from app.location_buffer import LocationWriteBuffer
+from app.models import LocationUpdate
+from app.routers import locations
+from fakes import FakeResponse, FakeSupabase
+
+@pytest.fixture
+def inserts(monkeypatch):
+    """locations insert 호출 기록 - 위도가 범위를 벗어난 행이 있으면 DB처럼 배치 전체를 거부"""
+    calls = []
+
+    async def execute(query):
+        calls.append(query.data)
+        if any(abs(row["latitude"]) > 90 for row in query.data):
+            raise APIError({"code": "23514", "message": "new row violates check constraint"})
+        # RETURNING 순서는 보장되지 않으므로 뒤집어서 반환
+        return FakeResponse([dict(row) for row in reversed(query.data)])
+
+    monkeypatch.setattr(location_buffer_module, "supabase", FakeSupabase())
+    monkeypatch.setattr(location_buffer_module, "execute", execute)
+    return calls
+
+def build(device_id: str, latitude: float = 35.1, timestamp=None) -> dict:
+    return locations._build_location_insert_data(
+        LocationUpdate(device_id=device_id, latitude=latitude, longitude=129.0, timestamp=timestamp)
+    )
+
+async def add_all(buffer: LocationWriteBuffer, rows):
+    return await asyncio.gather(*[buffer.add(row) for row in rows], return_exceptions=True)
+
+def test_saved_rows_are_matched_to_requests_by_id(inserts):
+    buffer = LocationWriteBuffer(max_batch_size=10, flush_interval=0.01)
+    rows = [build(f"device-{i}") for i in range(5)]
+    results = asyncio.run(add_all(buffer, rows))
+    assert len(inserts) == 1
+    assert [result["device_id"] for result in results] == [f"device-{i}" for i in range(5)]
+
+def test_bad_row_fails_only_its_own_request(inserts):
+    buffer = LocationWriteBuffer(max_batch_size=10, flush_interval=0.01)
+    rows = [build("device-1"), build("device-2", latitude=123.0), build("device-3")]
+    results = asyncio.run(add_all(buffer, rows))
+    assert results[0]["device_id"] == "device-1"
+    assert isinstance(results[1], APIError)
+    assert results[2]["device_id"] == "device-3"
+    assert buffer.stats()["split_retry_count"] == 1
+
+def test_connection_errors_are_not_retried_row_by_row(monkeypatch):
+    calls = []
+
+    async def execute(query):
+        calls.append(query)
+        raise httpx.ConnectError("connection dropped")
+
+    monkeypatch.setattr(location_buffer_module, "supabase", FakeSupabase())
+    monkeypatch.setattr(location_buffer_module, "execute", execute)
+    buffer = LocationWriteBuffer(max_batch_size=10, flush_interval=0.01)
+    results = asyncio.run(add_all(buffer, [build("device-1"), build("device-2")]))
+    assert all(isinstance(result, httpx.ConnectError) for result in results)
+    assert len(calls) == 1
+
+def test_invalid_timestamp_is_rejected_before_buffering():
+    with pytest.raises(ValueError):
+        build("device-1", timestamp="yesterday")
+    assert build("device-1", timestamp="2026-01-01T09:00:00+09:00")["timestamp"] == "2026-01-01T09:00:00+09:00"
@@ -0,0 +1,106 @@
+import asyncio
+import time
+import pytest
+from app import notifications
+from app.models import EmergencyContact, UserProfile
+from app.notifications import LogNotificationSender, NotificationDispatcher, NotificationSender, RateLimiter
+from app.routers.reports import _to_report_response
+from fakes import make_report
+
+CONTACTS = [EmergencyContact(name="가족", phone="010-1111-1111"), EmergencyContact(name="선주", phone="010-2222-2222")]
+
+class FailingSender(NotificationSender):
+    """항상 실패하는 전송기 - 받는 사람별 시도 시각을 기록"""
+
+    def __init__(self, channel: str = "sms"):
+        self.channel = channel
+        self.attempts = {}
+
+    async def send(self, to: str, message: str):
+        self.attempts.setdefault(to, []).append(time.monotonic())
+        raise ConnectionError("sender unavailable")
+
+@pytest.fixture(autouse=True)
+def profile(monkeypatch):
+    async def get_device_profile(device_id):
+        return UserProfile(device_id=device_id, name="홍길동", phone="010-0000-0000", emergency_contacts=CONTACTS, created_at="2026-01-01T00:00:00+00:00")
+
+    monkeypatch.setattr(notifications, "get_device_profile", get_device_profile)
+
+def dispatcher(**options) -> NotificationDispatcher:
+    return NotificationDispatcher(**{"workers": 2, "queue_size": 100, "max_attempts": 3, "initial_backoff": 0.01, **options})
+
+async def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.005)
+
+def test_report_fans_out_to_every_contact_on_every_channel():
+    sms, push = LogNotificationSender("sms"), LogNotificationSender("push")
+
+    async def run():
+        notifier = dispatcher()
+        notifier.register(sms, rate=100, burst=10)
+        notifier.register(push, rate=100, burst=10)
+        notifier.start()
+        notifier.notify_report(_to_report_response(make_report("r1")))
+        await wait_until(lambda: notifier.sent_count == 4)
+        await notifier.close()
+        return notifier
+
+    notifier = asyncio.run(run())
+    for sender in (sms, push):
+        assert sorted(sent["to"] for sent in sender.sent) == ["010-1111-1111", "010-2222-2222"]
+        assert all("홍길동" in sent["message"] for sent in sender.sent)
+    assert notifier.stats()["failed_count"] == 0
+
+def test_rate_limiter_allows_burst_then_waits_for_tokens():
+    async def run():
+        limiter = RateLimiter(rate=50, burst=2)
+        started = time.monotonic()
+        await limiter.acquire()
+        await limiter.acquire()
+        burst_elapsed = time.monotonic() - started
+        for _ in range(5):
+            await limiter.acquire()
+        return burst_elapsed, time.monotonic() - started
+
+    burst_elapsed, elapsed = asyncio.run(run())
+    # burst 2개는 바로, 나머지 5개는 초당 50개 속도로 (약 100ms)
+    assert burst_elapsed < 0.01
+    assert elapsed >= 0.09
+
+def test_failed_notifications_back_off_and_give_up():
+    sender = FailingSender()
+
+    async def run():
+        notifier = dispatcher(workers=1, max_attempts=3)
+        notifier.register(sender, rate=100, burst=10)
+        notifier.start()
+        notifier.notify_report(_to_report_response(make_report("r1")))
+        await wait_until(lambda: notifier.failed_count == len(CONTACTS))
+        await notifier.close()
+        return notifier
+
+    notifier = asyncio.run(run())
+    assert notifier.sent_count == 0
+    assert notifier.retry_count == len(CONTACTS) * 2
+    # 연락처마다 3번 시도하고, 시도 간격은 initial_backoff * 2^(attempt-1) * [0.5, 1.0] 이상
+    for contact in CONTACTS:
+        first, second, third = sender.attempts[contact.phone]
+        assert second - first >= 0.005
+        assert third - second >= 0.01
+
+def test_jobs_are_dropped_when_queue_is_full():
+    async def run():
+        notifier = dispatcher(queue_size=2)
+        notifier.register(LogNotificationSender(), rate=100, burst=10)
+        # 워커를 시작하지 않아 큐가 비워지지 않음
+        for report_id in ("r1", "r2", "r3"):
+            notifier.notify_report(_to_report_response(make_report(report_id)))
+        return notifier.stats()
+
+    stats = asyncio.run(run())
+    assert stats["queue_depth"] == 2
+    assert stats["dropped_count"] == 1
@@ -0,0 +1,42 @@
+import pytest
+from fastapi import HTTPException
+from postgrest import SyncPostgrestClient
+from app.pagination import apply_keyset, encode_cursor, next_cursor
+
+def build(cursor, desc=True):
+    client = SyncPostgrestClient("http://localhost/rest/v1")
+    query = apply_keyset(client.from_("locations").select("*").eq("device_id", "device-1"), "timestamp", cursor, desc=desc)
+    return query.request.params
+
+def test_first_page_has_no_cursor_filter():
+    params = build(None)
+
+    assert params["order"] == "timestamp.desc,id.desc"
+    assert "timestamp" not in params and "or" not in params
+
+def test_cursor_adds_index_bound_and_tie_break():
+    params = build(encode_cursor("2026-01-01T00:00:00+00:00", "abc"))
+
+    # 범위 조건이 있어야 DB가 커서 위치부터 인덱스를 탐색함
+    assert params["timestamp"] == "lte.2026-01-01T00:00:00+00:00"
+    assert params["or"] == (
+        '(timestamp.lt."2026-01-01T00:00:00+00:00",'
+        'and(timestamp.eq."2026-01-01T00:00:00+00:00",id.lt."abc"))'
+    )
+
+def test_ascending_cursor_uses_lower_bound():
+    params = build(encode_cursor("2026-01-01T00:00:00", "abc"), desc=False)
+
+    assert params["timestamp"] == "gte.2026-01-01T00:00:00"
+    assert params["or"].startswith('(timestamp.gt.')
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        build("not-a-cursor")
+    assert error.value.status_code == 400
+
+def test_next_cursor_only_for_full_pages():
+    rows = [{"id": "a", "timestamp": "t1"}, {"id": "b", "timestamp": "t2"}]
+
+    assert next_cursor(rows, "timestamp", 3) is None
+    assert next_cursor(rows, "timestamp", 2) == encode_cursor("t2", "b")
@@ -0,0 +1,74 @@
+import asyncio
+from app import profiles
+from fakes import FakeResponse, FakeSupabase
+
+def user_row(device_id: str, name: str) -> dict:
+    return {
+        "device_id": device_id,
+        "name": name,
+        "phone": "010-0000-0000",
+        "boat_name": "바다호",
+        "boat_number": "BN-1",
+        "emergency_contacts": [{"name": "가족", "phone": "010-1111-1111"}],
+        "created_at": "2026-01-01T00:00:00+00:00"
+    }
+
+def use_database(monkeypatch, rows: dict, gate: asyncio.Event = None) -> list:
+    """profiles의 DB 조회를 rows(device_id → users 행)로 대체하고 조회한 device_id 목록을 반환"""
+    calls = []
+
+    async def fake_execute(query):
+        device_id = query.filters["device_id"]
+        calls.append(device_id)
+        row = rows.get(device_id)
+        if gate is not None:
+            await gate.wait()
+        return FakeResponse([row] if row else [])
+
+    monkeypatch.setattr(profiles, "supabase", FakeSupabase())
+    monkeypatch.setattr(profiles, "execute", fake_execute)
+    return calls
+
+def test_profile_is_served_from_cache(monkeypatch):
+    calls = use_database(monkeypatch, {"device-hit": user_row("device-hit", "홍길동")})
+
+    async def run():
+        return [await profiles.get_device_profile("device-hit") for _ in range(3)]
+
+    results = asyncio.run(run())
+    assert [profile.name for profile in results] == ["홍길동"] * 3
+    assert calls == ["device-hit"]
+    profiles.forget_profile("device-hit")
+
+def test_forget_profile_reads_again(monkeypatch):
+    rows = {"device-forget": user_row("device-forget", "홍길동")}
+    calls = use_database(monkeypatch, rows)
+
+    async def run():
+        await profiles.get_device_profile("device-forget")
+        rows["device-forget"] = user_row("device-forget", "김철수")
+        profiles.forget_profile("device-forget")
+        return await profiles.get_device_profile("device-forget")
+
+    assert asyncio.run(run()).name == "김철수"
+    assert calls == ["device-forget", "device-forget"]
+    profiles.forget_profile("device-forget")
+
+def test_read_started_before_update_does_not_overwrite_cache(monkeypatch):
+    async def run():
+        gate = asyncio.Event()
+        use_database(monkeypatch, {"device-race": user_row("device-race", "홍길동")}, gate)
+        # 수정 전 프로필을 읽는 조회가 DB 응답을 기다리는 동안
+        reading = asyncio.create_task(profiles.get_device_profile("device-race"))
+        await asyncio.sleep(0)
+        # update_profile이 저장하고 캐시에 반영
+        profiles.forget_profile("device-race")
+        profiles.remember_profile(profiles.to_user_profile(user_row("device-race", "김철수")))
+        gate.set()
+        stale = await reading
+        return stale, await profiles.get_device_profile("device-race")
+
+    stale, cached = asyncio.run(run())
+    assert stale.name == "홍길동"
+    assert cached.name == "김철수"
+    profiles.forget_profile("device-race")
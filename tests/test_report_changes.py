@@ -0,0 +1,76 @@
+import asyncio
+from app.events import ReportEventBus
+from app.report_changes import ReportChangeFeed
+from app.routers.reports import _to_report_response
+from fakes import make_report
+
+def change(record, event_type="UPDATE") -> dict:
+    return {"data": {"schema": "public", "table": "reports", "type": event_type, "record": record}, "ids": [1]}
+
+def test_database_changes_reach_subscribers_once():
+    bus = ReportEventBus()
+    feed = ReportChangeFeed(url="", key="", initial_backoff=0.01, max_backoff=0.05)
+    feed._on_change = lambda row: bus.publish(_to_report_response(row))
+
+    async def run():
+        queue = bus.subscribe("device:device-1")
+        created = make_report("r1", updated_at="2026-01-01T00:00:00+00:00")
+        bus.publish(_to_report_response(created))   # 이 프로세스에서 접수
+        feed._handle_change(change(created, "INSERT"))  # 같은 변경이 Realtime으로 다시 도착
+        feed._handle_change(change(make_report("r1", status="dispatched", updated_at="2026-01-01T00:03:00+00:00")))
+        feed._handle_change(change(None, "DELETE"))
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    events = asyncio.run(run())
+    assert [event.status for event in events] == ["pending", "dispatched"]
+
+def test_feed_keeps_retrying_when_realtime_is_unreachable():
+    # 연결을 거부하는 주소 - 예외로 태스크가 죽지 않고 백오프하며 재연결
+    feed = ReportChangeFeed(url="http://127.0.0.1:9", key="anon", initial_backoff=0.01, max_backoff=0.02)
+
+    async def run():
+        feed.start(lambda row: None)
+        for _ in range(200):
+            if feed.reconnect_count >= 2:
+                break
+            await asyncio.sleep(0.05)
+        running = not feed._task.done()
+        await feed.close()
+        return running
+
+    assert asyncio.run(run())
+    assert feed.reconnect_count >= 2
+    assert not feed.connected
+
+def test_local_and_realtime_timestamps_are_compared_in_utc():
+    bus = ReportEventBus()
+
+    async def run():
+        queue = bus.subscribe("report:r1")
+        # 이 프로세스는 datetime.utcnow().isoformat(), Realtime은 timestamptz(+09:00 세션일 수도 있음)로 보냄
+        bus.publish(_to_report_response(make_report("r1", updated_at="2026-01-01T00:00:00.123456")))
+        bus.publish(_to_report_response(make_report("r1", updated_at="2026-01-01T00:00:00.123456+00:00")))
+        bus.publish(_to_report_response(make_report("r1", updated_at="2026-01-01T09:00:00.123456+09:00")))
+        bus.publish(_to_report_response(make_report("r1", status="dispatched", updated_at="2026-01-01T00:01:00+00:00")))
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    events = asyncio.run(run())
+    assert [event.status for event in events] == ["pending", "dispatched"]
+
+def test_device_stream_requires_registered_device(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app import devices
+    from app.routers import reports
+    from fakes import FakeResponse, FakeSupabase
+
+    async def execute(query):
+        return FakeResponse([])
+    monkeypatch.setattr(devices, "supabase", FakeSupabase())
+    monkeypatch.setattr(devices, "execute", execute)
+
+    app = FastAPI()
+    app.include_router(reports.router)
+    with TestClient(app) as client:
+        assert client.get("/reports/events", params={"device_id": "unknown-device"}).status_code == 404
+    devices.forget_device("unknown-device")
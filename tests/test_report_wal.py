@@ -0,0 +1,205 @@
+import asyncio
+import json
+import time
+import httpx
+from postgrest.exceptions import APIError
+from app.database import is_permanent_error
+from app.report_wal import ReportWriteAheadLog
+from fakes import FlakyReportStore, make_report
+
+def new_wal(directory) -> ReportWriteAheadLog:
+    return ReportWriteAheadLog(
+        directory=str(directory),
+        segment_max_bytes=64 * 1024,
+        fsync_interval=0.001,
+        replay_grace=0.0,
+        initial_backoff=0.01,
+        max_backoff=0.05
+    )
+
+async def wait_until(condition, timeout: float):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+def test_replay_drains_backlog_through_dropped_connections(tmp_path):
+    store = FlakyReportStore(drop_rate=0.3, late_rate=0.1, seed=1)
+
+    async def run():
+        wal = new_wal(tmp_path)
+        await asyncio.gather(*[wal.append(make_report(f"r{i}")) for i in range(300)])
+        started = time.monotonic()
+        wal.start_replayer(store.write, is_permanent=is_permanent_error)
+        drained = await wait_until(lambda: wal.pending_count == 0, timeout=10)
+        elapsed = time.monotonic() - started
+        await wal.close()
+        return wal, drained, elapsed
+
+    wal, drained, elapsed = asyncio.run(run())
+    assert drained, f"{wal.pending_count}건이 재전송되지 않음"
+    assert len(store.rows) == 300
+    assert wal.replayed_count == 300
+    assert wal.replay_failure_count > 0
+    assert elapsed < 5
+
+def test_recovers_uncommitted_reports_after_restart(tmp_path):
+    store = FlakyReportStore()
+
+    async def crash_before_commit():
+        wal = new_wal(tmp_path)
+        for i in range(20):
+            await wal.append(make_report(f"r{i}"))
+        for i in range(5):
+            wal.commit(f"r{i}")
+        # 프로세스 종료 흉내 - 재전송 태스크 없이 파일만 닫음
+        await wal.close()
+
+    async def restart():
+        wal = new_wal(tmp_path)
+        wal.start_replayer(store.write, is_permanent=is_permanent_error)
+        recovered = wal.pending_count
+        drained = await wait_until(lambda: wal.pending_count == 0, timeout=5)
+        await wal.close()
+        return recovered, drained
+
+    asyncio.run(crash_before_commit())
+    recovered, drained = asyncio.run(restart())
+    assert recovered == 15
+    assert drained
+    assert sorted(store.rows) == sorted(f"r{i}" for i in range(5, 20))
+    assert list(tmp_path.glob("report-*.log")) and not list(tmp_path.glob("dead-letter.log"))
+
+def test_replay_does_not_overwrite_reports_already_saved(tmp_path):
+    # timeout 뒤에 늦게 저장되었거나 crash 직전에 저장되어 commit 기록이 없는 신고
+    store = FlakyReportStore()
+    store.rows["r1"] = make_report("r1", status="dispatched", updated_at="2026-01-01T00:05:00")
+    written = []
+
+    async def run():
+        wal = new_wal(tmp_path)
+        await wal.append(make_report("r1"))
+        await wal.append(make_report("r2"))
+        wal.start_replayer(store.write, on_written=written.append, is_permanent=is_permanent_error)
+        drained = await wait_until(lambda: wal.pending_count == 0, timeout=5)
+        await wal.close()
+        return drained
+
+    assert asyncio.run(run())
+    assert store.rows["r1"]["status"] == "dispatched"
+    assert store.rows["r1"]["updated_at"] == "2026-01-01T00:05:00"
+    assert [row["id"] for row in written] == ["r2"]
+
+def test_failing_report_does_not_block_other_reports(tmp_path):
+    store = FlakyReportStore()
+    store.poison_ids.add("poison")
+
+    async def run():
+        wal = new_wal(tmp_path)
+        await wal.append(make_report("poison"))
+        await wal.append(make_report("good"))
+        wal.start_replayer(store.write, is_permanent=is_permanent_error)
+        saved = await wait_until(lambda: "good" in store.rows, timeout=1)
+        await asyncio.sleep(0.3)
+        await wal.close()
+        return wal, saved
+
+    wal, saved = asyncio.run(run())
+    assert saved
+    assert wal.pending_count == 1
+    # 실패한 신고는 자기 백오프(최대 0.05초)를 지키며 재시도
+    assert store.attempts["poison"] < 20
+
+def test_permanent_error_moves_report_to_dead_letters(tmp_path):
+    store = FlakyReportStore()
+    store.invalid_ids.add("bad")
+
+    async def run():
+        wal = new_wal(tmp_path)
+        await wal.append(make_report("bad"))
+        await wal.append(make_report("good"))
+        wal.start_replayer(store.write, is_permanent=is_permanent_error)
+        drained = await wait_until(lambda: wal.pending_count == 0, timeout=2)
+        await wal.close()
+        return wal, drained
+
+    wal, drained = asyncio.run(run())
+    assert drained
+    assert store.attempts["bad"] == 1
+    assert "good" in store.rows
+    assert wal.stats()["dead_letter_count"] == 1
+
+    dead_letters = [json.loads(line) for line in (tmp_path / "dead-letter.log").read_text().splitlines()]
+    assert [entry["id"] for entry in dead_letters] == ["bad"]
+    assert dead_letters[0]["data"]["device_id"] == "device-1"
+
+    reopened = new_wal(tmp_path)
+    reopened.open()
+    assert reopened.pending_count == 0
+    assert reopened.dead_letter_count == 1
+    asyncio.run(reopened.close())
+
+def test_is_permanent_error():
+    assert is_permanent_error(ValueError("Out of range float values are not JSON compliant"))
+    assert is_permanent_error(APIError({"code": "23505", "message": "duplicate key"}))
+    assert is_permanent_error(APIError({"code": "22P02", "message": "invalid input syntax"}))
+    assert is_permanent_error(APIError({"code": "PGRST204", "message": "column not found"}))
+    assert is_permanent_error(APIError({"code": 400, "message": "JSON could not be generated"}))
+
+    assert not is_permanent_error(httpx.ConnectError("connection dropped"))
+    assert not is_permanent_error(asyncio.TimeoutError())
+    assert not is_permanent_error(RuntimeError("데이터베이스 연결이 필요합니다"))
+    assert not is_permanent_error(APIError({"code": "08006", "message": "connection failure"}))
+    assert not is_permanent_error(APIError({"code": "PGRST001", "message": "database connection error"}))
+    assert not is_permanent_error(APIError({"code": 502, "message": "JSON could not be generated"}))
+    assert not is_permanent_error(APIError({"code": 429, "message": "JSON could not be generated"}))
+
+def test_syncs_do_not_overlap_with_rotation(tmp_path, monkeypatch):
+    # 느린 fsync 중에 새 신고가 계속 들어오고 세그먼트도 자주 교체되는 상황
+    import os
+    import threading
+    real_fsync = os.fsync
+    lock = threading.Lock()
+    active = [0, 0]  # 진행 중인 fsync 수, 최대 동시 fsync 수
+
+    def slow_fsync(fd):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        try:
+            time.sleep(0.005)
+            real_fsync(fd)
+        finally:
+            with lock:
+                active[0] -= 1
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+
+    async def run():
+        wal = ReportWriteAheadLog(
+            directory=str(tmp_path),
+            segment_max_bytes=512,
+            fsync_interval=0.001,
+            replay_grace=60.0,
+            initial_backoff=0.01,
+            max_backoff=0.05
+        )
+
+        async def wave(start):
+            await asyncio.gather(*[wal.append(make_report(f"r{start + i}")) for i in range(5)])
+
+        waves = []
+        for start in range(0, 100, 5):
+            waves.append(asyncio.create_task(wave(start)))
+            await asyncio.sleep(0.002)
+        await asyncio.gather(*waves)
+        await wal.close()
+
+    asyncio.run(run())
+    assert active[1] == 1
+
+    recovered = new_wal(tmp_path)
+    recovered.open()
+    assert recovered.pending_count == 100
+    asyncio.run(recovered.close())
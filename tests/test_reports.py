@@ -0,0 +1,152 @@
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+from app import devices
+from app.config import settings
+from app.detection import SENSOR_BLOB_CONTENT_TYPE
+from app.models import EmergencyReportCreate
+from app.report_wal import ReportWriteAheadLog
+from app.routers import reports
+from fakes import FakeResponse, FakeSupabase, make_report
+
+@pytest.fixture
+def wal(tmp_path, monkeypatch):
+    wal = ReportWriteAheadLog(
+        directory=str(tmp_path),
+        segment_max_bytes=64 * 1024,
+        fsync_interval=0.001,
+        replay_grace=60.0,
+        initial_backoff=0.01,
+        max_backoff=0.05
+    )
+    monkeypatch.setattr(reports, "report_wal", wal)
+    monkeypatch.setattr(reports, "supabase", FakeSupabase())
+    monkeypatch.setattr(reports.notification_dispatcher, "notify_report", lambda report: None)
+    yield wal
+    asyncio.run(wal.close())
+
+def use_execute(monkeypatch, execute):
+    # 신고 경로에서 쓰일 수 있는 모든 DB 호출을 같은 가짜로 교체
+    for module in (reports, devices):
+        monkeypatch.setattr(module, "supabase", FakeSupabase())
+        monkeypatch.setattr(module, "execute", execute)
+
+def test_save_report_defers_transient_errors(wal, monkeypatch):
+    async def execute(query):
+        raise httpx.ConnectError("connection dropped")
+    use_execute(monkeypatch, execute)
+
+    report = asyncio.run(reports._save_report(make_report("r1")))
+    assert report.id == "r1"
+    assert wal.pending_count == 1
+
+def test_save_report_rejects_permanent_errors(wal, monkeypatch):
+    async def execute(query):
+        raise APIError({"code": "23514", "message": "new row violates check constraint"})
+    use_execute(monkeypatch, execute)
+
+    with pytest.raises(APIError):
+        asyncio.run(reports._save_report(make_report("r1")))
+    assert wal.pending_count == 0
+
+def test_emergency_report_is_acknowledged_while_database_hangs(wal, monkeypatch):
+    async def execute(query):
+        await asyncio.sleep(30)
+    use_execute(monkeypatch, execute)
+    monkeypatch.setattr(settings, "report_insert_timeout_seconds", 0.2)
+
+    report_data = EmergencyReportCreate(device_id="device-1", location_latitude=35.1, location_longitude=129.0)
+    started = time.monotonic()
+    report = asyncio.run(reports._create_emergency_report(report_data))
+    assert time.monotonic() - started < 1
+    assert report.status == "pending"
+    assert wal.pending_count == 1
+
+def test_replay_report_ignores_duplicates(wal, monkeypatch):
+    queries = []
+
+    async def execute(query):
+        queries.append(query)
+        return FakeResponse([])
+    use_execute(monkeypatch, execute)
+
+    assert asyncio.run(reports._replay_report(make_report("r1"))) is None
+    assert queries[0].op == "upsert"
+    assert queries[0].options == {"ignore_duplicates": True}
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(settings, "admin_api_key", "admin-secret")
+    monkeypatch.setattr(reports, "supabase", FakeSupabase())
+    app = FastAPI()
+    app.include_router(reports.router)
+    with TestClient(app) as client:
+        yield client
+
+def test_rescore_requires_admin_key(admin_client, monkeypatch):
+    assert admin_client.post("/reports/auto-detection/rescore").status_code == 401
+    assert admin_client.post("/reports/auto-detection/rescore", headers={"X-Admin-Key": "wrong"}).status_code == 401
+
+    monkeypatch.setattr(settings, "admin_api_key", "")
+    response = admin_client.post("/reports/auto-detection/rescore", headers={"X-Admin-Key": "admin-secret"})
+    assert response.status_code == 503
+
+def test_rescore_runs_as_background_job(admin_client, monkeypatch):
+    headers = {"X-Admin-Key": "admin-secret"}
+    release = asyncio.Event()
+    calls = []
+
+    async def rescore(job):
+        calls.append(job.job_id)
+        job.scanned = 3
+        await release.wait()
+        job.rescored = 2
+    monkeypatch.setattr(reports, "_rescore_reports", rescore)
+
+    response = admin_client.post("/reports/auto-detection/rescore", headers=headers)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "running"
+
+    # 실행 중에는 같은 작업을 반환
+    assert admin_client.post("/reports/auto-detection/rescore", headers=headers).json()["job_id"] == job["job_id"]
+    assert admin_client.get(f"/reports/auto-detection/rescore/{job['job_id']}", headers=headers).json()["scanned"] == 3
+
+    admin_client.portal.call(release.set)
+    deadline = time.monotonic() + 5
+    while True:
+        status = admin_client.get(f"/reports/auto-detection/rescore/{job['job_id']}", headers=headers).json()
+        if status["status"] != "running" or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+
+    assert status["status"] == "completed"
+    assert (status["scanned"], status["rescored"]) == (3, 2)
+    assert status["finished_at"] is not None
+    assert calls == [job["job_id"]]
+    assert admin_client.get("/reports/auto-detection/rescore/unknown", headers=headers).status_code == 404
+
+def test_chunked_sensor_blob_over_limit_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "detection_max_samples", 10)
+
+    def chunks():
+        # Content-Length 없이 chunked로 보내는 한도(16 + 240바이트) 초과 본문
+        for _ in range(100):
+            yield b"\0" * 256
+
+    app = FastAPI()
+    app.include_router(reports.router)
+    response = TestClient(app).post(
+        "/reports/auto-detection/binary",
+        params={"device_id": "device-1", "location_latitude": 35.1, "location_longitude": 129.0},
+        headers={"Content-Type": SENSOR_BLOB_CONTENT_TYPE},
+        content=chunks()
+    )
+    assert response.status_code == 413
@@ -0,0 +1,13 @@
+from app.track_export import content_disposition
+
+def test_content_disposition_keeps_header_safe():
+    value = content_disposition('bad"; x=1\r\nSet-Cookie: a-track.csv')
+    assert value.startswith('attachment; filename="bad___x_1__Set-Cookie__a-track.csv"; ')
+    assert "\r" not in value and "\n" not in value
+    assert value.endswith("filename*=UTF-8''bad%22%3B%20x%3D1%0D%0ASet-Cookie%3A%20a-track.csv")
+
+def test_content_disposition_encodes_non_ascii_names():
+    value = content_disposition("바다호-track.gpx")
+    value.encode("latin-1")  # 헤더로 보낼 수 있어야 함
+    assert 'filename="___-track.gpx"' in value
+    assert "filename*=UTF-8''%EB%B0%94%EB%8B%A4%ED%98%B8-track.gpx" in value